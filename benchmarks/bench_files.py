@@ -0,0 +1,188 @@
+"""Benchmarks of :py:class:`googledrive.Files` against a local fake server.
+
+The real googleapiclient and httplib2 stack talks to :py:class:`FakeDrive`
+over a local socket, so the results are reproducible offline.
+
+Examples:
+    $ python -m benchmarks.bench_files
+    $ python -m benchmarks.bench_files --latency 0.02 --rate-429 0.05 --json
+"""
+
+from typing import Any, Callable, List, NamedTuple
+from time import perf_counter
+import argparse
+import json
+import os
+
+from googledrive import Files, RetryPolicy
+
+from .fakedrive import FakeDrive, ROOT_ID
+
+
+class BenchResult(NamedTuple):
+    """Timings of a benchmark."""
+
+    name: str
+    iterations: int
+    ops_per_sec: float
+    p50: float
+    p99: float
+
+
+def percentile(timings: List[float], q: float) -> float:
+    """Return a percentile of sorted timings by the nearest rank.
+
+    Args:
+        timings: The sorted timings.
+        q: The quantile between 0 and 1.
+    """
+    return timings[min(len(timings) - 1, int(round(q * (len(timings) - 1))))]
+
+
+def measure(name: str, function: Callable[[], Any],
+            iterations: int, warmup: int = 1) -> BenchResult:
+    """Measure a function.
+
+    Args:
+        name: The benchmark name.
+        function: The function to be measured.
+        iterations: The number of measured calls.
+        warmup: The number of calls before the measurement.
+    Returns:
+        The timings of the calls.
+    """
+    for _ in range(warmup):
+        function()
+    timings = []
+    for _ in range(iterations):
+        started = perf_counter()
+        function()
+        timings.append(perf_counter() - started)
+    total = sum(timings)
+    timings.sort()
+    return BenchResult(name, iterations,
+                       iterations / total if total else float('inf'),
+                       percentile(timings, 0.5), percentile(timings, 0.99))
+
+
+def bench_list(drive: FakeDrive, files: Files, folder_sizes: List[int],
+               iterations: int) -> List[BenchResult]:
+    """Benchmark ``list`` of folders with various numbers of files."""
+    results = []
+    for size in folder_sizes:
+        folder_id = drive.add_folder(ROOT_ID, f'list-{size}')
+        for i in range(size):
+            drive.add_file(folder_id, f'file{i:06d}', b'')
+        results.append(measure(f'list files={size}',
+                               lambda: files.list(folder_id), iterations))
+    return results
+
+
+def bench_read(drive: FakeDrive, files: Files, file_sizes: List[int],
+               iterations: int) -> List[BenchResult]:
+    """Benchmark ``read`` of files with various sizes."""
+    folder_id = drive.add_folder(ROOT_ID, 'read')
+    results = []
+    for size in file_sizes:
+        name = f'file-{size}'
+        drive.add_file(folder_id, name, os.urandom(size))
+        results.append(measure(f'read bytes={size}',
+                               lambda: files.read(folder_id, name),
+                               iterations))
+    return results
+
+
+def bench_write(drive: FakeDrive, files: Files, file_sizes: List[int],
+                iterations: int) -> List[BenchResult]:
+    """Benchmark ``write`` overwriting files with various sizes."""
+    folder_id = drive.add_folder(ROOT_ID, 'write')
+    results = []
+    for size in file_sizes:
+        name = f'file-{size}'
+        content = os.urandom(size)
+        results.append(measure(
+            f'write bytes={size}',
+            lambda: files.write(folder_id, name, content,
+                                'application/octet-stream'),
+            iterations))
+    return results
+
+
+def bench_get_path_id(drive: FakeDrive, files: Files, depths: List[int],
+                      iterations: int) -> List[BenchResult]:
+    """Benchmark ``get_path_id`` of nested folders with various depths."""
+    results = []
+    for depth in depths:
+        path = [f'depth{depth}-{i}' for i in range(depth)]
+        drive.add_path(path)
+        results.append(measure(f'get_path_id depth={depth}',
+                               lambda: files.get_path_id(path), iterations))
+    return results
+
+
+def run(latency: float = 0.0, error_rate: float = 0.0, rate_429: float = 0.0,
+        iterations: int = 20, folder_sizes: List[int] = (10, 100, 1000),
+        file_sizes: List[int] = (1024, 1024 * 1024, 8 * 1024 * 1024),
+        depths: List[int] = (1, 4, 16), seed: int = 0) -> List[BenchResult]:
+    """Run all benchmarks against a new fake server.
+
+    Args:
+        latency: The seconds added to each request.
+        error_rate: The probability of a 503 response.
+        rate_429: The probability of a 429 response.
+        iterations: The number of measured calls per benchmark.
+        folder_sizes: The numbers of files in the listed folders.
+        file_sizes: The sizes of the read and written files in bytes.
+        depths: The depths of the resolved paths.
+        seed: The seed of the injected faults.
+    Returns:
+        The results of the benchmarks.
+    """
+    with FakeDrive(latency, error_rate, rate_429, seed=seed) as drive:
+        policy = RetryPolicy(max_retry=10, interval=0.01, max_interval=0.1)
+        with drive.files(retry_policy=policy) as files:
+            return (bench_list(drive, files, folder_sizes, iterations)
+                    + bench_read(drive, files, file_sizes, iterations)
+                    + bench_write(drive, files, file_sizes, iterations)
+                    + bench_get_path_id(drive, files, depths, iterations))
+
+
+def format_results(results: List[BenchResult]) -> str:
+    """Return the results as a text table."""
+    lines = [f'{"benchmark":<28}{"ops/sec":>12}{"p50 ms":>12}{"p99 ms":>12}']
+    for r in results:
+        lines.append(f'{r.name:<28}{r.ops_per_sec:>12.1f}'
+                     f'{r.p50 * 1000:>12.2f}{r.p99 * 1000:>12.2f}')
+    return '\n'.join(lines)
+
+
+def main(argv: List[str] = None) -> None:
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='seconds added to each request')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='probability of a 503 response')
+    parser.add_argument('--rate-429', type=float, default=0.0,
+                        help='probability of a 429 response')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--folder-sizes', type=int, nargs='+',
+                        default=[10, 100, 1000])
+    parser.add_argument('--file-sizes', type=int, nargs='+',
+                        default=[1024, 1024 * 1024, 8 * 1024 * 1024])
+    parser.add_argument('--depths', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true',
+                        help='print the results as JSON')
+    args = parser.parse_args(argv)
+    results = run(args.latency, args.error_rate, args.rate_429,
+                  args.iterations, args.folder_sizes, args.file_sizes,
+                  args.depths, args.seed)
+    if args.json:
+        print(json.dumps([r._asdict() for r in results], indent=2))
+    else:
+        print(format_results(results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Cold-start benchmark of :py:class:`googledrive.Service`.
+
+Each sample runs in a new interpreter and measures the import of the
+package, the construction of :py:class:`Service`, and the first
+``list`` call against a local :py:class:`FakeDrive` server.
+The package of the working tree is compared with the package of
+a git revision, by default the initial commit before the lazy loading.
+
+Examples:
+    $ python -m benchmarks.bench_startup --samples 10
+    $ python -m benchmarks.bench_startup --ref HEAD~1
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from .fakedrive import FakeDrive
+
+_CHILD = '''
+import json, sys
+from time import perf_counter
+from google.auth.credentials import AnonymousCredentials
+credentials = AnonymousCredentials()
+url, path = sys.argv[1], sys.argv[2]
+sys.path.insert(0, path)
+started = perf_counter()
+from googledrive import Service
+imported = perf_counter()
+try:
+    service = Service(credentials,
+                      client_options={'api_endpoint': url + 'drive/v3/'})
+except TypeError:
+    # A revision building the client eagerly without build arguments.
+    service = Service(credentials)
+    service._drive._baseUrl = url + 'drive/v3/'
+constructed = perf_counter()
+service.files().list('root')
+called = perf_counter()
+print(json.dumps({'import': imported - started,
+                  'construct': constructed - imported,
+                  'first_call': called - constructed,
+                  'total': called - started}))
+'''
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sample(url: str, path: str) -> Dict[str, float]:
+    """Measure a cold start in a new interpreter.
+
+    Args:
+        url: The root URL of the fake server.
+        path: The directory containing the ``googledrive`` package.
+    Returns:
+        The seconds of the phases.
+    """
+    output = subprocess.run([sys.executable, '-c', _CHILD, url, path],
+                            check=True, capture_output=True, text=True)
+    return json.loads(output.stdout)
+
+
+def initial_commit() -> str:
+    """Return the hash of the initial commit of the repository."""
+    return subprocess.run(
+        ['git', 'rev-list', '--max-parents=0', 'HEAD'], cwd=ROOT,
+        check=True, capture_output=True, text=True).stdout.split()[0]
+
+
+def export(ref: str, directory: str) -> str:
+    """Extract the package of a git revision.
+
+    Args:
+        ref: The git revision.
+        directory: The directory the package is extracted into.
+    Returns:
+        The directory.
+    """
+    archive = subprocess.run(['git', 'archive', ref, 'googledrive'],
+                             cwd=ROOT, check=True, capture_output=True)
+    subprocess.run(['tar', '-x', '-C', directory], input=archive.stdout,
+                   check=True)
+    return directory
+
+
+def run(samples: int = 5,
+        ref: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """Run the benchmark for a revision and the working tree.
+
+    Args:
+        samples: The number of interpreters per package.
+        ref: The git revision compared,
+            or None for the initial commit.
+    Returns:
+        The median seconds of the phases keyed by the revision and
+        ``working``.
+    """
+    ref = ref or initial_commit()
+    results = {}
+    with FakeDrive() as drive, tempfile.TemporaryDirectory() as tmp:
+        paths = {ref[:10]: export(ref, tmp), 'working': ROOT}
+        for name, path in paths.items():
+            runs = [sample(drive.url, path) for _ in range(samples)]
+            results[name] = {key: statistics.median(r[key] for r in runs)
+                             for key in runs[0]}
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--samples', type=int, default=5)
+    parser.add_argument('--ref', default=None,
+                        help='git revision compared (default: initial)')
+    args = parser.parse_args(argv)
+    results = run(args.samples, args.ref)
+    print(f'{"package":<12}' + ''.join(f'{key + " ms":>16}'
+                                       for key in results['working']))
+    for name, phases in results.items():
+        print(f'{name:<12}' + ''.join(f'{value * 1000:>16.1f}'
+                                      for value in phases.values()))
+
+
+if __name__ == '__main__':
+    main()
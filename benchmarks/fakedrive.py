@@ -0,0 +1,572 @@
+"""Local stand-in server of Google Drive API v3 for benchmarks.
+
+The server keeps files in memory and implements the endpoints used by
+:py:class:`googledrive.Files`: files.list with pagination and queries,
+files.get with media download and ranges, files.create, files.update,
+files.copy and files.delete with multipart, media and resumable uploads,
+and changes.list, changes.watch and channels.stop with a change log.
+Each change is notified to the watching channels by a synthetic
+webhook request, as Google Drive does.
+Latency, server errors and rate limiting are injected per request.
+
+Examples:
+    >>> with FakeDrive(latency=0.02, rate_429=0.01) as drive:
+    ...   folder_id = drive.add_folder('root', 'folderA')
+    ...   drive.add_file(folder_id, 'filename', b'content')
+    ...   gdrive = drive.files()
+    ...   gdrive.read(('folderA',), 'filename')
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from email import message_from_bytes
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from threading import RLock, Thread
+from urllib.parse import urlparse, parse_qs
+from urllib.request import Request, urlopen
+import hashlib
+import json
+import random
+import re
+import time
+
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import build_http
+
+from googledrive import Files
+
+ROOT_ID = 'root'
+"""The ID string of the root folder."""
+
+FOLDER_MIMETYPE = 'application/vnd.google-apps.folder'
+
+DEFAULT_FIELDS = ('kind', 'id', 'name', 'mimeType')
+
+_TOKEN = re.compile(r"\s*(\(|\)|'(?:[^'\\]|\\.)*'|!=|=|[A-Za-z]+)")
+
+
+class FakeDrive:
+    """In-memory Google Drive API server on a local port."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0,
+                 rate_429: float = 0.0, page_size: int = 100,
+                 seed: int = 0):
+        """Init FakeDrive.
+
+        Args:
+            latency: The seconds added to each request.
+            error_rate: The probability of a 503 response.
+            rate_429: The probability of a 429 response.
+            page_size: The default number of files per page of a listing.
+            seed: The seed of the injected faults.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.page_size = page_size
+        self.requests = 0
+        self.metadata: Dict[str, Dict[str, Any]] = {}
+        self.contents: Dict[str, bytes] = {}
+        self.changes: List[Dict[str, Any]] = []
+        self.channels: Dict[str, Dict[str, Any]] = {}
+        self._messages = count(1)
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._ids = count(1)
+        self._random = random.Random(seed)
+        self._lock = RLock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[Thread] = None
+        self.metadata[ROOT_ID] = {'kind': 'drive#file', 'id': ROOT_ID,
+                                  'name': 'My Drive',
+                                  'mimeType': FOLDER_MIMETYPE,
+                                  'parents': [], 'trashed': False,
+                                  'version': '1'}
+
+    def __enter__(self):
+        """Start the server."""
+        return self.start()
+
+    def __exit__(self, *_):
+        """Stop the server."""
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """The root URL of the server."""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def start(self) -> 'FakeDrive':
+        """Start the server in a daemon thread."""
+        drive = self
+
+        class Handler(_Handler):
+            pass
+        Handler.drive = drive
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def build(self):
+        """Return a Drive API resource connected to the server."""
+        document = json.loads(get_static_doc('drive', 'v3'))
+        document['rootUrl'] = self.url
+        document['baseUrl'] = self.url + document['servicePath']
+        return build_from_document(document, http=build_http())
+
+    def files(self, **kwargs) -> Files:
+        """Return a :py:class:`googledrive.Files` object for the server.
+
+        Args:
+            **kwargs: Keyword arguments to :py:class:`googledrive.Files`.
+        """
+        kwargs.setdefault('http_factory', build_http)
+        return Files(self.build(), **kwargs)
+
+    def add_folder(self, parent_id: str, name: str) -> str:
+        """Add a folder and return its ID string."""
+        return self._create({'name': name, 'parents': [parent_id],
+                             'mimeType': FOLDER_MIMETYPE}, None)['id']
+
+    def add_file(self, parent_id: str, name: str, content: bytes,
+                 mimetype: str = 'application/octet-stream') -> str:
+        """Add a file and return its ID string."""
+        return self._create({'name': name, 'parents': [parent_id],
+                             'mimeType': mimetype}, content)['id']
+
+    def add_path(self, names: List[str], parent_id: str = ROOT_ID) -> str:
+        """Add nested folders and return the ID string of the deepest."""
+        for name in names:
+            parent_id = self.add_folder(parent_id, name)
+        return parent_id
+
+    def notify(self, channel_id: str = None, state: str = 'change') -> None:
+        """Post a notification to the webhook of channels.
+
+        Args:
+            channel_id: The ID string of the channel, or None for all.
+            state: The resource state, ``sync`` or ``change``.
+        """
+        with self._lock:
+            channels = [c for c in self.channels.values()
+                        if channel_id in (None, c['id'])]
+        for channel in channels:
+            headers = {
+                'X-Goog-Channel-ID': channel['id'],
+                'X-Goog-Channel-Token': channel.get('token', ''),
+                'X-Goog-Channel-Expiration': channel['expiration'],
+                'X-Goog-Resource-ID': channel['resourceId'],
+                'X-Goog-Resource-URI': channel['resourceUri'],
+                'X-Goog-Resource-State': state,
+                'X-Goog-Message-Number': str(next(self._messages))}
+            try:
+                urlopen(Request(channel['address'], b'', headers), timeout=5)
+            except OSError:
+                pass
+
+    def _record(self, file_id: str, removed: bool = False) -> None:
+        change = {'kind': 'drive#change', 'changeType': 'file',
+                  'fileId': file_id, 'removed': removed,
+                  'time': time.strftime('%Y-%m-%dT%H:%M:%S.000Z',
+                                        time.gmtime())}
+        if not removed:
+            change['file'] = dict(self.metadata[file_id])
+        self.changes.append(change)
+        if self.channels:
+            Thread(target=self.notify, daemon=True).start()
+
+    def _create(self, metadata: Dict[str, Any],
+                content: Optional[bytes]) -> Dict[str, Any]:
+        with self._lock:
+            file_id = f'id{next(self._ids):08d}'
+            file = {'kind': 'drive#file', 'id': file_id, 'trashed': False,
+                    'parents': [ROOT_ID], 'version': '0',
+                    'mimeType': 'application/octet-stream'}
+            file.update(metadata)
+            self.metadata[file_id] = file
+            self._update(file_id, {}, content)
+            return dict(file)
+
+    def _update(self, file_id: str, metadata: Dict[str, Any],
+                content: Optional[bytes], add_parents: str = None,
+                remove_parents: str = None) -> Dict[str, Any]:
+        file = self.metadata[file_id]
+        for key, value in metadata.items():
+            if key == 'appProperties':
+                properties = file.setdefault(key, {})
+                properties.update(value)
+                for name in [k for k, v in properties.items() if v is None]:
+                    del properties[name]
+            elif key != 'id':
+                file[key] = value
+        if remove_parents:
+            removed = remove_parents.split(',')
+            file['parents'] = [p for p in file['parents'] if p not in removed]
+        if add_parents:
+            file['parents'] = file['parents'] + [
+                p for p in add_parents.split(',') if p not in file['parents']]
+        if content is not None:
+            self.contents[file_id] = content
+            file['size'] = str(len(content))
+            file['md5Checksum'] = hashlib.md5(content).hexdigest()
+        file['version'] = str(int(file['version']) + 1)
+        file['modifiedTime'] = time.strftime('%Y-%m-%dT%H:%M:%S.000Z',
+                                             time.gmtime())
+        self._record(file_id)
+        return dict(file)
+
+    def _fault(self) -> Optional[int]:
+        with self._lock:
+            self.requests += 1
+            value = self._random.random()
+        if self.latency:
+            time.sleep(self.latency)
+        if value < self.rate_429:
+            return 429
+        if value < self.rate_429 + self.error_rate:
+            return 503
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    drive: FakeDrive = None
+
+    def log_message(self, *_):
+        pass
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method: str) -> None:
+        length = int(self.headers.get('content-length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status = self.drive._fault()
+        if status is not None:
+            reason = 'rateLimitExceeded' if status == 429 else 'backendError'
+            return self._error(status, reason, {'retry-after': '0'})
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        parts = url.path.strip('/').split('/')
+        try:
+            with self.drive._lock:
+                response = self._route(method, parts, params, body)
+        except KeyError:
+            return self._error(404, 'notFound')
+        except ValueError as e:
+            return self._error(400, 'invalid', message=str(e))
+        self._send(*response)
+
+    def _route(self, method: str, parts: List[str], params: Dict[str, str],
+               body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        drive = self.drive
+        if parts[:2] == ['upload', 'session']:
+            return self._upload_chunk(parts[2], body)
+        upload = parts[0] == 'upload'
+        if upload:
+            parts = parts[1:]
+        if parts[:2] != ['drive', 'v3']:
+            raise KeyError(self.path)
+        resource, rest = parts[2], parts[3:]
+        fields = params.get('fields', None)
+        if resource == 'changes':
+            return self._json(self._changes(method, rest, params, body))
+        if resource == 'channels' and rest == ['stop']:
+            channel = json.loads(body)
+            drive.channels.pop(channel['id'])
+            return 204, {}, b''
+        if resource != 'files':
+            raise KeyError(self.path)
+        if upload and params.get('uploadType') == 'resumable':
+            return self._upload_start(method, rest, body, params)
+        if upload:
+            metadata, content = self._parse_upload(body, params)
+        else:
+            metadata = json.loads(body) if body else {}
+            content = None
+        if method == 'GET' and not rest:
+            return self._json(self._list(params), fields)
+        file_id = rest[0] if rest else None
+        if file_id is not None and file_id not in drive.metadata:
+            raise KeyError(file_id)
+        if method == 'GET' and params.get('alt') == 'media':
+            return self._media(file_id)
+        if method == 'GET':
+            return self._json(drive.metadata[file_id], fields)
+        if method == 'POST' and rest[1:] == ['copy']:
+            source = drive.metadata[file_id]
+            copied = {k: v for k, v in source.items()
+                      if k in ('name', 'mimeType', 'parents',
+                               'appProperties')}
+            copied.update(metadata)
+            return self._json(drive._create(
+                copied, drive.contents.get(file_id, None)), fields)
+        if method == 'POST':
+            return self._json(drive._create(metadata, content), fields)
+        if method == 'PATCH':
+            return self._json(drive._update(
+                file_id, metadata, content, params.get('addParents'),
+                params.get('removeParents')), fields)
+        if method == 'DELETE':
+            self._delete(file_id)
+            return 204, {}, b''
+        raise KeyError(self.path)
+
+    def _changes(self, method: str, rest: List[str], params: Dict[str, str],
+                 body: bytes) -> Dict[str, Any]:
+        drive = self.drive
+        token = str(len(drive.changes) + 1)
+        if rest == ['startPageToken']:
+            return {'startPageToken': token}
+        if method == 'POST' and rest == ['watch']:
+            channel = json.loads(body)
+            channel.update(
+                kind='api#channel', resourceId=f'r{next(drive._ids):08d}',
+                resourceUri=f'{drive.url}drive/v3/changes',
+                expiration=str(channel.get('expiration') or
+                               int((time.time() + 3600) * 1000)))
+            drive.channels[channel['id']] = channel
+            Thread(target=drive.notify, args=(channel['id'], 'sync'),
+                   daemon=True).start()
+            return {k: v for k, v in channel.items()
+                    if k not in ('address', 'type')}
+        start = int(params['pageToken']) - 1
+        page_size = int(params.get('pageSize', 100))
+        response = {'kind': 'drive#changeList',
+                    'changes': drive.changes[start:start + page_size]}
+        if start + page_size < len(drive.changes):
+            response['nextPageToken'] = str(start + page_size + 1)
+        else:
+            response['newStartPageToken'] = token
+        return response
+
+    def _list(self, params: Dict[str, str]) -> Dict[str, Any]:
+        drive = self.drive
+        predicate = _parse_query(params.get('q', ''))
+        files = sorted((f for f in drive.metadata.values()
+                        if f['id'] != ROOT_ID and predicate(f)),
+                       key=lambda f: (f['name'], f['id']))
+        page_size = min(int(params.get('pageSize', drive.page_size)), 1000)
+        start = int(params.get('pageToken', 0))
+        response = {'kind': 'drive#fileList',
+                    'files': files[start:start + page_size]}
+        if start + page_size < len(files):
+            response['nextPageToken'] = str(start + page_size)
+        return response
+
+    def _media(self, file_id: str) -> Tuple[int, Dict[str, str], bytes]:
+        content = self.drive.contents.get(file_id, b'')
+        match = re.match(r'bytes=(\d*)-(\d*)', self.headers.get('range', ''))
+        if match is None or not any(match.groups()):
+            return 200, {'content-type': 'application/octet-stream'}, content
+        if not match.group(1):
+            start = max(0, len(content) - int(match.group(2)))
+            end = len(content) - 1
+        else:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) \
+                else len(content) - 1
+        end = min(end, len(content) - 1)
+        if start >= len(content) and content:
+            return 416, {'content-range': f'bytes */{len(content)}'}, b''
+        chunk = content[start:end + 1]
+        return 206, {
+            'content-type': 'application/octet-stream',
+            'content-range':
+                f'bytes {start}-{start + len(chunk) - 1}/{len(content)}'
+        }, chunk
+
+    def _delete(self, file_id: str) -> None:
+        drive = self.drive
+        pending = [file_id]
+        while pending:
+            current = pending.pop()
+            drive.metadata.pop(current, None)
+            drive.contents.pop(current, None)
+            drive._record(current, removed=True)
+            pending.extend(f['id'] for f in drive.metadata.values()
+                           if current in f['parents']
+                           and len(f['parents']) == 1)
+
+    def _parse_upload(self, body: bytes, params: Dict[str, str]
+                      ) -> Tuple[Dict[str, Any], bytes]:
+        content_type = self.headers.get('content-type', '')
+        if params.get('uploadType') != 'multipart':
+            return {}, body
+        message = message_from_bytes(
+            b'Content-Type: ' + content_type.encode() + b'\r\n\r\n' + body)
+        metadata_part, media_part = message.get_payload()
+        metadata = json.loads(metadata_part.get_payload())
+        metadata.setdefault('mimeType', media_part.get_content_type())
+        return metadata, media_part.get_payload(decode=True)
+
+    def _upload_start(self, method: str, rest: List[str], body: bytes,
+                      params: Dict[str, str]
+                      ) -> Tuple[int, Dict[str, str], bytes]:
+        drive = self.drive
+        metadata = json.loads(body) if body else {}
+        mimetype = self.headers.get('x-upload-content-type', None)
+        if mimetype and method == 'POST':
+            metadata.setdefault('mimeType', mimetype)
+        session_id = f's{next(drive._ids):08d}'
+        drive._sessions[session_id] = {
+            'file_id': rest[0] if rest else None, 'metadata': metadata,
+            'data': bytearray(), 'fields': params.get('fields', None)}
+        return 200, {'location': f'{drive.url}upload/session/{session_id}'}, \
+            b''
+
+    def _upload_chunk(self, session_id: str, body: bytes
+                      ) -> Tuple[int, Dict[str, str], bytes]:
+        drive = self.drive
+        session = drive._sessions[session_id]
+        data = session['data']
+        match = re.match(r'bytes (\*|(\d+)-(\d+))/(\*|\d+)',
+                         self.headers.get('content-range', ''))
+        if match is None:
+            raise ValueError('invalid content-range')
+        if match.group(1) != '*':
+            start = int(match.group(2))
+            if start != len(data):
+                raise ValueError('unexpected offset')
+            data.extend(body)
+        total = match.group(4)
+        if total == '*' or len(data) < int(total):
+            headers = {'range': f'bytes=0-{len(data) - 1}'} if data else {}
+            return 308, headers, b''
+        del drive._sessions[session_id]
+        if session['file_id'] is None:
+            file = drive._create(session['metadata'], bytes(data))
+        else:
+            file = drive._update(session['file_id'], session['metadata'],
+                                 bytes(data))
+        return self._json(file, session['fields'])
+
+    @staticmethod
+    def _json(value: Dict[str, Any], fields: str = None
+              ) -> Tuple[int, Dict[str, str], bytes]:
+        return 200, {'content-type': 'application/json'}, \
+            json.dumps(_project(value, fields)).encode()
+
+    def _error(self, status: int, reason: str,
+               headers: Dict[str, str] = None, message: str = '') -> None:
+        body = json.dumps({'error': {
+            'code': status, 'message': message or reason,
+            'errors': [{'reason': reason, 'message': message or reason}]
+        }}).encode()
+        self._send(status, dict(headers or {},
+                                **{'content-type': 'application/json'}), body)
+
+    def _send(self, status: int, headers: Dict[str, str],
+              body: bytes) -> None:
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _project(value: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+    if value.get('kind') == 'drive#fileList':
+        match = re.search(r'files\(([^)]*)\)', fields or '')
+        names = match.group(1).split(',') if match else DEFAULT_FIELDS
+        result = {'files': [{k: f[k] for k in names if k in f}
+                            for f in value['files']]}
+        if 'nextPageToken' in value:
+            result['nextPageToken'] = value['nextPageToken']
+        return result
+    if 'kind' not in value or value['kind'] != 'drive#file':
+        return value
+    names = fields.split(',') if fields else DEFAULT_FIELDS
+    return {k: value[k] for k in names if k in value}
+
+
+def _unquote(token: str) -> str:
+    return re.sub(r'\\(.)', r'\1', token[1:-1])
+
+
+def _parse_query(query: str) -> Callable[[Dict[str, Any]], bool]:
+    """Parse a subset of the query language of Google Drive API.
+
+    The supported terms are ``'id' in parents``, ``trashed = <bool>``,
+    and ``=`` or ``!=`` comparisons of ``name`` and ``mimeType``,
+    combined with ``and``, ``or``, ``not`` and parentheses.
+    """
+    tokens = _TOKEN.findall(query)
+    position = [0]
+
+    def peek():
+        return tokens[position[0]] if position[0] < len(tokens) else None
+
+    def take():
+        position[0] += 1
+        return tokens[position[0] - 1]
+
+    def expression():
+        left = conjunction()
+        while peek() == 'or':
+            take()
+            left = (lambda a, b: lambda f: a(f) or b(f))(left, conjunction())
+        return left
+
+    def conjunction():
+        left = term()
+        while peek() == 'and':
+            take()
+            left = (lambda a, b: lambda f: a(f) and b(f))(left, term())
+        return left
+
+    def term():
+        token = take()
+        if token == 'not':
+            inner = term()
+            return lambda f: not inner(f)
+        if token == '(':
+            inner = expression()
+            take()
+            return inner
+        if token.startswith("'"):
+            value = _unquote(token)
+            if take() != 'in' or take() != 'parents':
+                raise ValueError(f'unsupported query: {query}')
+            return lambda f: value in f['parents']
+        operator, operand = take(), take()
+        if token == 'trashed':
+            value = operand == 'true'
+        elif operand.startswith("'"):
+            value = _unquote(operand)
+        else:
+            raise ValueError(f'unsupported query: {query}')
+        if operator == '=':
+            return lambda f: f.get(token) == value
+        return lambda f: f.get(token) != value
+
+    if not tokens:
+        return lambda f: True
+    predicate = expression()
+    if peek() is not None:
+        raise ValueError(f'unsupported query: {query}')
+    return predicate
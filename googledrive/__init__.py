@@ -8,10 +8,45 @@ Examples:
     ...                file_content, 'text/plain')
 """
 
-from ._service import Service
-from ._files import Files
+from importlib import import_module
 
 __version__ = '0.1.1'
 __author__ = 'skitschy'
 
-__all__ = ['Service', 'Files']
+__all__ = ['Service', 'Files', 'AsyncFiles', 'IdCache', 'ContentCache',
+           'CacheInfo', 'Batch', 'TransferResult', 'UploadSession',
+           'RetryPolicy', 'RetryInfo', 'MetadataIndex', 'WalkEntry',
+           'Metrics', 'WriteQueue', 'HttpPool', 'PoolInfo', 'RangeReader',
+           'ChangeWatcher', 'FileTable']
+
+_MODULES = {
+    'Service': '._service', 'Files': '._files', 'AsyncFiles': '._async',
+    'IdCache': '._cache', 'ContentCache': '._cache', 'CacheInfo': '._cache',
+    'Batch': '._batch', 'TransferResult': '._transfer',
+    'UploadSession': '._upload', 'RetryPolicy': '._retry',
+    'RetryInfo': '._retry', 'MetadataIndex': '._index',
+    'WalkEntry': '._walk', 'Metrics': '._metrics',
+    'WriteQueue': '._writeback', 'HttpPool': '._pool', 'PoolInfo': '._pool',
+    'RangeReader': '._reader', 'ChangeWatcher': '._watch',
+    'FileTable': '._table',
+}
+
+
+def __getattr__(name: str):
+    """Import a public class on first access.
+
+    The submodules and googleapiclient are imported lazily,
+    so a program importing the package without calling the API
+    does not pay for them.
+    """
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Return the module attributes including the lazy ones."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,312 @@
+from typing import List, Dict, Any, Union, AsyncIterator, Callable
+from threading import local, Lock
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+import asyncio
+
+from ._cache import IdCache
+from ._retry import RetryPolicy
+from ._query import list_query, name_query
+from ._media import Content, open_media
+from ._codec import CODEC_PROPERTY, file_codec
+from ._pool import HttpPool
+
+
+class AsyncFiles:
+    """Asyncio wrapper class for the files Resource of Google Drive API.
+
+    The blocking HTTP requests run on worker threads,
+    each of which has its own HTTP transport,
+    and the retries wait without blocking the event loop.
+
+    Examples:
+        >>> async with Service(credentials).async_files() as gdrive:
+        ...   contents = await asyncio.gather(
+        ...     *[gdrive.read(('folderA',), name) for name in names])
+    """
+
+    def __init__(self, service,
+                 max_retry: int = 3, retry_interval: float = 1,
+                 id_cache: IdCache = None,
+                 http_factory: Callable[[], Any] = None,
+                 max_concurrency: int = 10,
+                 retry_policy: RetryPolicy = None,
+                 http_pool: HttpPool = None):
+        """Init AsyncFiles.
+
+        Args:
+            service: Resource for Google Drive API.
+            max_retry: The maximum number of retries for API calls.
+            retry_interval: The base retry interval in seconds.
+            id_cache: The cache of file IDs, or None to disable caching.
+            http_factory: A function returning a new authorized
+                ``httplib2.Http`` object for each worker thread,
+                or None to execute the requests one by one.
+            max_concurrency: The maximum number of concurrent API calls.
+            retry_policy: The retry policy overriding ``max_retry`` and
+                ``retry_interval``.
+            http_pool: The pool of ``httplib2.Http`` objects taken by
+                the worker threads instead of ``http_factory``, or None.
+        """
+        if retry_policy is None:
+            retry_policy = RetryPolicy(max_retry, retry_interval)
+        self.retry_policy = retry_policy
+        self.id_cache = id_cache
+        self.http_factory = http_factory
+        self.http_pool = http_pool
+        self.max_concurrency = max_concurrency \
+            if http_factory or http_pool else 1
+        self.drivefiles = service.files()
+        self._local = local()
+        self._https = []
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(
+            self.max_concurrency, initializer=self._init_worker)
+        self._semaphore = None
+
+    async def __aenter__(self):
+        """Enter."""
+        return self
+
+    async def __aexit__(self, *_):
+        """Exit."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close API connections and worker threads."""
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._executor.shutdown)
+        for http in self._https:
+            if self.http_pool is not None:
+                self.http_pool.release(http)
+            else:
+                http.close()
+        self.drivefiles.close()
+
+    async def list(self, path: Union[str, List[str]] = None,
+                   query: str = None,
+                   fields: str = None) -> List[Dict[str, Any]]:
+        """List or searches the files in a path.
+
+        Args:
+            path: The path ID string, the list of path names, or None.
+            query: A query string for filtering the file results.
+            fields: The comma-separated list of the field paths to be included.
+        Returns:
+            A list of files.
+        """
+        if isinstance(path, str):
+            parent_id = path
+        elif path:
+            parent_id = await self.get_path_id(path)
+        else:
+            parent_id = None
+        return [file async for file
+                in self.each_files(parent_id, query, fields)]
+
+    async def read(self, path: Union[str, List[str]], name: str) -> str:
+        """Read the content of a file.
+
+        Args:
+            path: The path ID string, or the list of path names.
+            name: The file name.
+        Returns:
+            The file content as a string.
+        """
+        if isinstance(path, str):
+            parent_id = path
+        else:
+            parent_id = await self.get_path_id(path)
+        fileid = await self.get_id(parent_id, name)
+        return await self.read_file_id(fileid) if fileid else None
+
+    async def write(self, path: Union[str, List[str]], name: str,
+                    content: Content, mimetype: str) -> str:
+        """Write the content of a file.
+
+        The file is overwrote if it exists, or created otherwise.
+
+        Args:
+            path: The path ID string, or the array of path names.
+            name: The file name.
+            content: The file content as a string, a bytes-like object,
+                a readable binary file object, or the path-like object
+                of a local file.
+            mimetype: The mime-type of the file.
+        Returns:
+            The file ID string.
+        """
+        if isinstance(path, str):
+            parent_id = path
+        else:
+            parent_id = await self.get_path_id(path)
+        fileid = await self.get_id(parent_id, name)
+        if fileid:
+            await self.update_file_id(fileid, content, mimetype)
+            return fileid
+        else:
+            return await self.create_file(parent_id, name, content, mimetype)
+
+    async def each_files(self, parent_id: str = None, query: str = None,
+                         fields: str = None) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate the files in a path.
+
+        Args:
+            parent_id: The path ID string, or None.
+            query: A query string for filtering the file results.
+            fields: The comma-separated list of the field paths to be included.
+        Yields:
+            Files.
+        """
+        q = list_query(parent_id, query)
+        if fields and 'nextPageToken' not in fields:
+            fields = 'nextPageToken,' + fields
+        page_token = None
+        while True:
+            request = self.drivefiles.list(
+                q=q, spaces='drive', fields=fields, pageToken=page_token)
+            response = await self._execute(request)
+            for file in response.get('files', []):
+                yield file
+            page_token = response.get('nextPageToken', None)
+            if page_token is None:
+                break
+
+    async def get_path_id(self, path: List[str],
+                          root_id: str = 'root') -> str:
+        """Get the file ID of the path.
+
+        Args:
+            path: The array of path names.
+            root_id: The ID string of the root folder.
+        Returns:
+            The ID string of the path.
+        """
+        parent_id = root_id
+        for name in path:
+            parent_id = await self.get_id(parent_id, name)
+        return parent_id
+
+    async def get_id(self, parent_id: str, name: str) -> str:
+        """Get the file ID.
+
+        Args:
+            parent_id: The path ID string.
+            name: The file name.
+        Returns:
+            The ID string of the file, or None unless the file exists.
+        """
+        if parent_id and name:
+            if self.id_cache is not None:
+                file_id = self.id_cache.get(parent_id, name)
+                if file_id:
+                    return file_id
+            request = self.drivefiles.list(
+                q=name_query(parent_id, name),
+                spaces='drive', fields="files(id)")
+            files = (await self._execute(request)).get('files', [])
+            file_id = next(iter(files), {}).get('id', None)
+            if self.id_cache is not None:
+                self.id_cache.put(parent_id, name, file_id)
+            return file_id
+        else:
+            return None
+
+    async def create_file(self, parent_id: str, name: str,
+                          content: Content, mimetype: str) -> str:
+        """Create a file.
+
+        Args:
+            parent_id: The path ID string.
+            name: The file name.
+            content: The file content as a string, a bytes-like object,
+                a readable binary file object, or the path-like object
+                of a local file.
+            mimetype: The mime-type of the file.
+        Returns:
+            The ID string of the created file, or None if it fails.
+        """
+        metadata = {'name': name, 'parents': [parent_id]}
+        with open_media(content, mimetype) as media:
+            request = self.drivefiles.create(body=metadata, media_body=media)
+            file_id = (await self._execute(request)).get('id', None)
+        if self.id_cache is not None:
+            self.id_cache.put(parent_id, name, file_id)
+        return file_id
+
+    async def read_file_id(self, file_id: str) -> str:
+        """Read the file content.
+
+        Args:
+            file_id: The file ID string.
+        Returns:
+            The file content as a string.
+        """
+        return await self._execute(self.drivefiles.get_media(fileId=file_id))
+
+    async def update_file_id(self, file_id: str,
+                             content: Content, mimetype: str) -> None:
+        """Update the file content.
+
+        Args:
+            file_id: The file ID string.
+            content: The file content as a string, a bytes-like object,
+                a readable binary file object, or the path-like object
+                of a local file.
+            mimetype: The mime-type of the file.
+        """
+        # A codec recorded by Files.update_file_id no longer applies.
+        request = self.drivefiles.get(fileId=file_id, fields='appProperties')
+        body = None
+        if file_codec(await self._execute(request)) is not None:
+            body = {'appProperties': {CODEC_PROPERTY: None}}
+        with open_media(content, mimetype) as media:
+            request = self.drivefiles.update(fileId=file_id, media_body=media,
+                                             body=body)
+            await self._execute(request)
+
+    async def delete_file_id(self, file_id: str) -> None:
+        """Delete a file.
+
+        Args:
+            file_id: The file ID string.
+        """
+        await self._execute(self.drivefiles.delete(fileId=file_id))
+        if self.id_cache is not None:
+            self.id_cache.invalidate_id(file_id)
+
+    def _init_worker(self):
+        if self.http_pool is not None:
+            self._local.http = self.http_pool.acquire()
+        elif self.http_factory is not None:
+            self._local.http = self.http_factory()
+        if self.http_factory is not None or self.http_pool is not None:
+            with self._lock:
+                self._https.append(self._local.http)
+
+    def _execute_in_worker(self, request):
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            return request.execute()
+        else:
+            return request.execute(http=http)
+
+    async def _execute(self, request):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        idempotent = getattr(request, 'method', None) != 'POST'
+        started = monotonic()
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                try:
+                    return await loop.run_in_executor(
+                        self._executor, self._execute_in_worker, request)
+                except Exception as e:
+                    delay = self.retry_policy.backoff(
+                        attempt, e, started, idempotent)
+                    if delay is None:
+                        raise
+                    attempt += 1
+            await asyncio.sleep(delay)
@@ -0,0 +1,211 @@
+from typing import List, Dict, Any, Callable
+from concurrent.futures import Future
+from time import sleep, monotonic
+
+from ._query import name_query
+
+
+class Batch:
+    """Batch of API calls sent in HTTP round trips of up to 100 calls.
+
+    The calls are queued and executed when the batch exits
+    or :py:func:`execute` is called.
+    Each call results in a ``concurrent.futures.Future``.
+
+    Examples:
+        >>> with gdrive.batch() as batch:
+        ...   futures = [batch.get_metadata(file_id) for file_id in file_ids]
+        >>> metadata = [future.result() for future in futures]
+    """
+
+    MAX_BATCH_SIZE = 100
+    """The maximum number of calls in an HTTP round trip."""
+
+    def __init__(self, files, max_batch_size: int = MAX_BATCH_SIZE):
+        """Init Batch.
+
+        Args:
+            files: The :py:class:`Files` object issuing the calls.
+            max_batch_size: The maximum number of calls in a round trip.
+        """
+        self.files = files
+        self.max_batch_size = min(max_batch_size, self.MAX_BATCH_SIZE)
+        self._pending = []
+
+    def __enter__(self):
+        """Enter."""
+        return self
+
+    def __exit__(self, exc_type, *_):
+        """Exit, and execute the queued calls unless an error occurred."""
+        if exc_type is None:
+            self.execute()
+
+    def __len__(self) -> int:
+        """Return the number of queued calls."""
+        return len(self._pending)
+
+    def add(self, request,
+            callback: Callable[[Any], Any] = None) -> Future:
+        """Queue an API request.
+
+        Args:
+            request: The ``googleapiclient.http.HttpRequest`` object.
+            callback: A function converting the response to the result.
+        Returns:
+            The future of the result.
+        """
+        future = Future()
+        self._pending.append([request, future, callback, 0])
+        return future
+
+    def get_id(self, parent_id: str, name: str) -> Future:
+        """Queue :py:func:`Files.get_id`.
+
+        Args:
+            parent_id: The path ID string.
+            name: The file name.
+        Returns:
+            The future of the ID string of the file, or None.
+        """
+        id_cache = self.files.id_cache
+        if parent_id and name and id_cache is not None:
+            file_id = id_cache.get(parent_id, name)
+            if file_id:
+                future = Future()
+                future.set_result(file_id)
+                return future
+        if not (parent_id and name):
+            future = Future()
+            future.set_result(None)
+            return future
+
+        def callback(response):
+            files = response.get('files', [])
+            file_id = next(iter(files), {}).get('id', None)
+            if id_cache is not None:
+                id_cache.put(parent_id, name, file_id)
+            return file_id
+        request = self.files.drivefiles.list(
+            q=name_query(parent_id, name),
+            spaces='drive', fields="files(id)")
+        return self.add(request, callback)
+
+    def get_metadata(self, file_id: str, fields: str = None) -> Future:
+        """Queue a metadata request.
+
+        Args:
+            file_id: The file ID string.
+            fields: The comma-separated list of the field paths to be included.
+        Returns:
+            The future of the file metadata.
+        """
+        return self.add(self.files.drivefiles.get(
+            fileId=file_id, fields=fields))
+
+    def update_metadata(self, file_id: str,
+                        metadata: Dict[str, Any]) -> Future:
+        """Queue a metadata update.
+
+        Args:
+            file_id: The file ID string.
+            metadata: The file metadata to be updated.
+        Returns:
+            The future of the updated file metadata.
+        """
+        return self.add(self.files.drivefiles.update(
+            fileId=file_id, body=metadata))
+
+    def delete_file_id(self, file_id: str) -> Future:
+        """Queue :py:func:`Files.delete_file_id`.
+
+        Args:
+            file_id: The file ID string.
+        Returns:
+            The future of None.
+        """
+        return self.add(self.files.drivefiles.delete(fileId=file_id),
+                        lambda _: self.files._forget(file_id))
+
+    def trash_file_id(self, file_id: str) -> Future:
+        """Queue moving a file to the trash.
+
+        Args:
+            file_id: The file ID string.
+        Returns:
+            The future of None.
+        """
+        return self.add(self.files.drivefiles.update(
+            fileId=file_id, body={'trashed': True}, fields='id'),
+            lambda _: self.files._forget(file_id))
+
+    def execute(self) -> None:
+        """Execute the queued calls.
+
+        Failed calls are retried in later round trips
+        according to the retry policy of the files object.
+        """
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.max_batch_size):
+            self._execute_chunk(pending[start:start + self.max_batch_size])
+
+    def _execute_chunk(self, chunk: List[list]) -> None:
+        policy = self.files.retry_policy
+        metrics = self.files.metrics
+        started = monotonic()
+        while chunk:
+            failed = []
+
+            def retry_or_fail(entry, exception):
+                idempotent = getattr(entry[0], 'method', None) != 'POST'
+                delay = policy.backoff(entry[3], exception, started,
+                                       idempotent)
+                if delay is None:
+                    entry[1].set_exception(exception)
+                else:
+                    entry[3] += 1
+                    failed.append((entry, delay))
+                    if metrics is not None:
+                        metrics.record_retry(delay)
+
+            def callback(request_id, response, exception):
+                entry = chunk[int(request_id)]
+                if exception is None:
+                    self._resolve(entry, response)
+                else:
+                    retry_or_fail(entry, exception)
+
+            batch = self.files._service.new_batch_http_request(
+                callback=callback)
+            for idx, entry in enumerate(chunk):
+                batch.add(entry[0], request_id=str(idx))
+
+            def send():
+                with self.files._connection() as http:
+                    if http is None:
+                        batch.execute()
+                    else:
+                        batch.execute(http=http)
+            try:
+                if metrics is None:
+                    send()
+                else:
+                    metrics.call('batch', send, batch)
+            except Exception as e:
+                for entry in chunk:
+                    if not entry[1].done() \
+                            and not any(entry is f[0] for f in failed):
+                        retry_or_fail(entry, e)
+            chunk = [entry for entry, _ in failed]
+            if chunk:
+                sleep(max(delay for _, delay in failed))
+
+    @staticmethod
+    def _resolve(entry: list, response) -> None:
+        callback, future = entry[2], entry[1]
+        try:
+            result = callback(response) if callback else response
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
@@ -0,0 +1,288 @@
+from typing import Dict, Tuple, Optional, Callable, NamedTuple
+from collections import OrderedDict
+from threading import RLock
+from time import monotonic
+import os
+import re
+
+_SAFE_NAME = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class IdCache:
+    """Bounded LRU cache of file IDs keyed by ``(parent_id, name)``.
+
+    Examples:
+        >>> cache = IdCache(maxsize=4096, ttl=600)
+        >>> gdrive = Service(credentials).files(id_cache=cache)
+        >>> gdrive.read(('folderA', 'subfolder1'), 'filename')
+        >>> cache.info()
+        CacheInfo(hits=0, misses=3, maxsize=4096, currsize=3)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None,
+                 timer: Callable[[], float] = monotonic):
+        """Init IdCache.
+
+        Args:
+            maxsize: The maximum number of entries.
+            ttl: The lifetime of an entry in seconds, or None for no expiry.
+            timer: The clock function used for the lifetime.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[str, str], Tuple[str, float]]' \
+            = OrderedDict()
+        self._keys_by_id: Dict[str, set] = {}
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def get(self, parent_id: str, name: str) -> Optional[str]:
+        """Get a cached file ID.
+
+        Args:
+            parent_id: The path ID string.
+            name: The file name.
+        Returns:
+            The cached ID string, or None unless it is cached.
+        """
+        key = (parent_id, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None \
+                    and self.timer() - entry[1] >= self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, parent_id: str, name: str, file_id: str) -> None:
+        """Store a file ID.
+
+        Args:
+            parent_id: The path ID string.
+            name: The file name.
+            file_id: The file ID string.
+        """
+        if not (parent_id and name and file_id):
+            return
+        key = (parent_id, name)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (file_id, self.timer())
+            self._keys_by_id.setdefault(file_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, parent_id: str = None, name: str = None) -> None:
+        """Invalidate entries.
+
+        Args:
+            parent_id: The path ID string, or None for any parents.
+            name: The file name, or None for any names.
+        """
+        with self._lock:
+            if parent_id is not None and name is not None:
+                self._remove((parent_id, name))
+                return
+            for key in list(self._entries):
+                if (parent_id is None or key[0] == parent_id) \
+                        and (name is None or key[1] == name):
+                    self._remove(key)
+
+    def invalidate_id(self, file_id: str) -> None:
+        """Invalidate the entries of a file ID and its descendants.
+
+        Args:
+            file_id: The file ID string.
+        """
+        with self._lock:
+            pending = [file_id]
+            while pending:
+                current = pending.pop()
+                for key in list(self._keys_by_id.get(current, ())):
+                    self._remove(key)
+                for key in [k for k in self._entries if k[0] == current]:
+                    pending.append(self._entries[key][0])
+                    self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_id.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Return the statistics of the cache."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses,
+                             self.maxsize, len(self._entries))
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_id.get(entry[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_id[entry[0]]
+
+
+class ContentCache:
+    """On-disk LRU cache of file contents keyed by file ID and version.
+
+    A version tag is the ``md5Checksum`` of a file,
+    or its ``version`` for Google Workspace documents without checksums.
+    An entry is served only while the tag of the file is unchanged.
+
+    Examples:
+        >>> cache = ContentCache('/tmp/gdrive-cache', max_bytes=1 << 30)
+        >>> gdrive = Service(credentials).files(content_cache=cache)
+        >>> gdrive.read(('config',), 'settings.json')
+        >>> cache.info()
+        CacheInfo(hits=0, misses=1, maxsize=1073741824, currsize=512)
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        """Init ContentCache.
+
+        The entries already stored in the directory are reused.
+
+        Args:
+            directory: The directory to store the contents.
+            max_bytes: The maximum total size of the contents in bytes.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[str, Tuple[str, int]]' = OrderedDict()
+        self._size = 0
+        self._lock = RLock()
+        os.makedirs(directory, exist_ok=True)
+        stored = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and '.' in entry.name \
+                    and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                stored.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, filename, size in sorted(stored):
+            file_id, tag = filename.rsplit('.', 1)
+            self._remove(file_id)
+            self._entries[file_id] = (tag, size)
+            self._size += size
+        while self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def get(self, file_id: str, tag: str) -> Optional[bytes]:
+        """Get a cached content.
+
+        Args:
+            file_id: The file ID string.
+            tag: The version tag of the file.
+        Returns:
+            The cached content, or None unless it is cached with the tag.
+        """
+        with self._lock:
+            entry = self._entries.get(file_id)
+            if entry is None or entry[0] != tag:
+                self.misses += 1
+                return None
+            path = self._path(file_id, tag)
+            try:
+                with open(path, 'rb') as f:
+                    content = f.read()
+                # The modification time orders the entries on the next init.
+                os.utime(path)
+            except OSError:
+                self._remove(file_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(file_id)
+            self.hits += 1
+            return content
+
+    def put(self, file_id: str, tag: str, content: bytes) -> None:
+        """Store a content.
+
+        Args:
+            file_id: The file ID string.
+            tag: The version tag of the file.
+            content: The file content.
+        """
+        if not tag or len(content) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(file_id)
+            path = self._path(file_id, tag)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(content)
+            os.replace(path + '.tmp', path)
+            self._entries[file_id] = (tag, len(content))
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, file_id: str) -> None:
+        """Remove the content of a file.
+
+        Args:
+            file_id: The file ID string.
+        """
+        with self._lock:
+            self._remove(file_id)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            for file_id in list(self._entries):
+                self._remove(file_id)
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """Return the statistics of the cache in bytes."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses,
+                             self.max_bytes, self._size)
+
+    def _path(self, file_id: str, tag: str) -> str:
+        if not _SAFE_NAME.match(file_id) or not _SAFE_NAME.match(tag):
+            raise ValueError(f'unsupported cache key: {file_id}.{tag}')
+        return os.path.join(self.directory, f'{file_id}.{tag}')
+
+    def _remove(self, file_id: str) -> None:
+        entry = self._entries.pop(file_id, None)
+        if entry is None:
+            return
+        self._size -= entry[1]
+        try:
+            os.remove(self._path(file_id, entry[0]))
+        except OSError:
+            pass
@@ -0,0 +1,181 @@
+from typing import Any, BinaryIO, Dict, Optional
+from io import RawIOBase
+import zlib
+
+from googleapiclient.http import MediaUpload
+
+CODEC_PROPERTY = 'googledriveCodec'
+"""The key of ``appProperties`` recording the codec of a file content."""
+
+CODECS = ('gzip', 'zstd')
+"""The supported codecs."""
+
+READ_SIZE = 1024 * 1024
+"""The size in bytes of a read from an uncompressed stream."""
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            'zstd compression requires the zstandard package') from e
+    return zstandard
+
+
+def compressor(codec: str) -> Any:
+    """Return a streaming compressor with ``compress`` and ``flush``.
+
+    Args:
+        codec: ``gzip`` or ``zstd``.
+    Raises:
+        ValueError: The codec is not supported.
+        ImportError: The zstandard package is not installed for ``zstd``.
+    """
+    if codec == 'gzip':
+        return zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if codec == 'zstd':
+        return _zstandard().ZstdCompressor().compressobj()
+    raise ValueError(f'unknown codec: {codec}')
+
+
+def decompressor(codec: str) -> Any:
+    """Return a streaming decompressor with ``decompress`` and ``flush``.
+
+    Args:
+        codec: ``gzip`` or ``zstd``.
+    Raises:
+        ValueError: The codec is not supported.
+        ImportError: The zstandard package is not installed for ``zstd``.
+    """
+    if codec == 'gzip':
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if codec == 'zstd':
+        return _zstandard().ZstdDecompressor().decompressobj()
+    raise ValueError(f'unknown codec: {codec}')
+
+
+def compress_bytes(data, codec: str) -> bytes:
+    """Compress a bytes-like object."""
+    c = compressor(codec)
+    return c.compress(data) + c.flush()
+
+
+def decompress_bytes(data, codec: Optional[str]) -> bytes:
+    """Decompress a bytes-like object, or return it if codec is None."""
+    if codec is None:
+        return data
+    d = decompressor(codec)
+    return d.decompress(data) + d.flush()
+
+
+def file_codec(metadata: Dict[str, Any]) -> Optional[str]:
+    """Return the codec recorded in file metadata, or None."""
+    return (metadata.get('appProperties', None) or {}).get(CODEC_PROPERTY,
+                                                          None)
+
+
+class CompressedMedia(MediaUpload):
+    """Resumable upload media compressing a stream as it is sent.
+
+    Only the compressed bytes of the chunk being sent are kept in memory,
+    and the total size is sent with the last chunk.
+    The compressed bytes before an offset requested again are rebuilt
+    from the start of the stream, so the stream must be seekable then,
+    and a resumed upload must read the same content.
+    """
+
+    def __init__(self, stream: BinaryIO, mimetype: str, codec: str,
+                 chunksize: int):
+        """Init CompressedMedia.
+
+        Args:
+            stream: The readable file object of the uncompressed content.
+            mimetype: The mime-type of the file.
+            codec: ``gzip`` or ``zstd``.
+            chunksize: The chunk size in bytes.
+        """
+        super().__init__()
+        self._stream = stream
+        self._mimetype = mimetype
+        self._codec = codec
+        self._chunksize = chunksize
+        self._compressor = compressor(codec)
+        self._buffer = bytearray()
+        self._offset = 0
+        self._eof = False
+
+    def chunksize(self) -> int:
+        """Return the chunk size in bytes."""
+        return self._chunksize
+
+    def mimetype(self) -> str:
+        """Return the mime-type of the file."""
+        return self._mimetype
+
+    def size(self) -> None:
+        """Return None since the compressed size is unknown."""
+        return None
+
+    def resumable(self) -> bool:
+        """Return True."""
+        return True
+
+    def getbytes(self, begin: int, length: int) -> bytes:
+        """Return compressed bytes, shorter than length only at the end.
+
+        Args:
+            begin: The offset in the compressed content.
+            length: The number of bytes.
+        """
+        if begin < self._offset:
+            self._stream.seek(0)
+            self._compressor = compressor(self._codec)
+            self._buffer = bytearray()
+            self._offset = 0
+            self._eof = False
+        while True:
+            skip = min(begin - self._offset, len(self._buffer))
+            del self._buffer[:skip]
+            self._offset += skip
+            if self._eof or (self._offset == begin
+                             and len(self._buffer) >= length):
+                break
+            data = self._stream.read(READ_SIZE)
+            if isinstance(data, str):
+                data = data.encode('utf-8')
+            if data:
+                self._buffer += self._compressor.compress(data)
+            else:
+                self._buffer += self._compressor.flush()
+                self._eof = True
+        return bytes(self._buffer[:length])
+
+
+class DecompressingWriter(RawIOBase):
+    """Binary writer decompressing into another writable file object."""
+
+    def __init__(self, fileobj: BinaryIO, codec: str):
+        """Init DecompressingWriter.
+
+        Args:
+            fileobj: The writable file object of the uncompressed content.
+            codec: ``gzip`` or ``zstd``.
+        """
+        self._fileobj = fileobj
+        self._decompressor = decompressor(codec)
+
+    def writable(self) -> bool:
+        """Return True."""
+        return True
+
+    def write(self, b) -> int:
+        """Decompress bytes and write the result."""
+        self._fileobj.write(self._decompressor.decompress(bytes(b)))
+        return len(b)
+
+    def close(self) -> None:
+        """Write the rest of the decompressed content."""
+        if not self.closed:
+            self._fileobj.write(self._decompressor.flush())
+        super().close()
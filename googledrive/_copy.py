@@ -0,0 +1,49 @@
+from typing import Dict, Iterator, Tuple
+
+from ._transfer import TransferResult
+
+
+def copy_tree(files, src_id: str, dst_id: str,
+              max_workers: int) -> Iterator[TransferResult]:
+    """Copy a folder tree on the server.
+
+    Google Drive cannot copy a folder, so the folders are created
+    as the source tree is walked, and the files are copied in parallel
+    with ``files.copy`` without transferring their contents.
+    The destination folders are not walked even inside the source tree.
+
+    Args:
+        files: The :py:class:`Files` object.
+        src_id: The ID string of the source folder.
+        dst_id: The ID string of the destination folder.
+        max_workers: The number of worker threads.
+    Yields:
+        Results of the copies in completion order.
+        The item is the relative POSIX path
+        and the result is the ID string of the copy.
+    """
+    folders: Dict[str, Tuple[str, Tuple[str, ...]]] = {src_id: (dst_id, ())}
+    created = {dst_id}
+
+    def tasks():
+        for entry in files.walk(src_id, max_workers=max_workers):
+            if entry.id not in folders:
+                continue
+            parent_id, names = folders[entry.id]
+            for folder in entry.folders:
+                if folder['id'] in created:
+                    continue
+                folder_id = files.create_folder(parent_id, folder['name'])
+                created.add(folder_id)
+                folders[folder['id']] = \
+                    (folder_id, names + (folder['name'],))
+            for file in entry.files:
+                yield ('/'.join(names + (file['name'],)), file['id'],
+                       parent_id)
+
+    def copy(task):
+        _, file_id, parent_id = task
+        return files.copy_file_id(file_id, parent_id)
+
+    for result in files._run_parallel(copy, tasks(), max_workers):
+        yield TransferResult(result.item[0], result.result, result.error)
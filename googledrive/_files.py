@@ -1,26 +1,95 @@
-from typing import List, Dict, Any, Union, Iterator
-from io import StringIO
-from time import sleep
+from typing import List, Dict, Any, Union, Iterator, Iterable, Callable, Tuple
+from typing import BinaryIO
+from io import BytesIO
+from os import PathLike
 from functools import reduce
+from threading import local, Lock
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 
-from googleapiclient.http import MediaIoBaseUpload
 from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseDownload
+
+from ._cache import IdCache, ContentCache
+from ._retry import RetryPolicy
+from ._metrics import Metrics, method_name
+from ._index import MetadataIndex
+from ._query import list_query, name_query, path_query
+from ._batch import Batch
+from ._transfer import TransferResult, run_parallel, run_serial
+from ._transfer import chunked
+from ._upload import UploadSession
+from ._media import Content, BufferWriter, open_media
+from ._walk import WalkEntry, walk, FOLDER_MIMETYPE
+from ._sync import sync_up, sync_down
+from ._copy import copy_tree
+from ._reader import RangeReader
+from ._codec import CODEC_PROPERTY, DecompressingWriter, file_codec
+from ._watch import ChangeWatcher
+from ._table import FileTable
+from ._writeback import WriteQueue
+from ._pool import HttpPool
 
 
 class Files:
     """Simple wrapper class for the files Resource of Google Drive API."""
 
+    CHUNK_SIZE = 10 * 1024 * 1024
+    """The default chunk size in bytes for streaming transfers."""
+
+    MAX_PAGE_SIZE = 1000
+    """The maximum number of files per page of a listing."""
+
+    MINIMAL_FIELDS = 'nextPageToken,files(id,name,mimeType)'
+    """A narrow field projection for listings."""
+
+    CHANGES_FIELDS = ('nextPageToken,newStartPageToken,'
+                      'changes(fileId,removed,file(id,name,parents,'
+                      'mimeType,md5Checksum,modifiedTime,trashed))')
+    """The fields of the changes feed applied to the metadata index."""
+
     def __init__(self, service,
-                 max_retry: int = 3, retry_interval: float = 1):
+                 max_retry: int = 3, retry_interval: float = 1,
+                 id_cache: IdCache = None,
+                 http_factory: Callable[[], Any] = None,
+                 retry_policy: RetryPolicy = None,
+                 metadata_index: MetadataIndex = None,
+                 content_cache: ContentCache = None,
+                 metrics: Metrics = None,
+                 http_pool: HttpPool = None):
         """Init Files.
 
         Args:
             service: Resource for Google Drive API.
             max_retry: The maximum number of retries for API calls.
-            retry_interval: The retry interval in seconds.
+            retry_interval: The base retry interval in seconds.
+            id_cache: The cache of file IDs, or None to disable caching.
+            http_factory: A function returning a new authorized
+                ``httplib2.Http`` object for each worker thread,
+                or None to run them serially in the calling thread.
+            retry_policy: The retry policy overriding ``max_retry`` and
+                ``retry_interval``.
+            metadata_index: The local index answering metadata queries,
+                or None to always call the API.
+            content_cache: The on-disk cache of file contents,
+                or None to always download them.
+            metrics: The metrics recording API calls, or None.
+            http_pool: The pool of ``httplib2.Http`` objects used by
+                all requests instead of ``http_factory``, or None.
         """
-        self.max_retry = max_retry
-        self.retry_interval = retry_interval
+        if retry_policy is None:
+            retry_policy = RetryPolicy(max_retry, retry_interval)
+        self.retry_policy = retry_policy
+        self.id_cache = id_cache
+        self.metadata_index = metadata_index
+        self.content_cache = content_cache
+        self.metrics = metrics
+        self.write_queue: WriteQueue = None
+        self.http_factory = http_factory
+        self.http_pool = http_pool
+        self._service = service
+        self._local = local()
+        self._root = None
         self.drivefiles = self.__retry(lambda: service.files())
 
     def __enter__(self):
@@ -32,17 +101,57 @@ class Files:
         self.close()
 
     def close(self) -> None:
-        """Close API connection."""
-        self.drivefiles.close()
+        """Close API connection.
+
+        The contents staged by the write-behind mode are uploaded first.
+        """
+        try:
+            if self.write_queue is not None:
+                self.write_queue.close()
+        finally:
+            self.drivefiles.close()
+
+    def write_behind(self, delay: float = 1.0, spill_dir: str = None,
+                     max_workers: int = 4) -> WriteQueue:
+        """Enable the write-behind mode of :py:func:`write`.
+
+        Args:
+            delay: The maximum seconds a content stays staged.
+            spill_dir: The directory to stage the contents,
+                or None to stage them in memory.
+            max_workers: The number of worker threads of an upload.
+        Returns:
+            The :py:class:`WriteQueue` staging the contents.
+        Raises:
+            ValueError: Neither ``http_factory`` nor ``http_pool``
+                is specified, so the uploads in the background
+                have no transport of their own.
+        """
+        if not self._concurrent:
+            raise ValueError('write_behind requires http_factory or '
+                             'http_pool')
+        if self.write_queue is None:
+            self.write_queue = WriteQueue(self, delay, spill_dir,
+                                          max_workers)
+        return self.write_queue
+
+    def flush(self) -> None:
+        """Upload the contents staged by the write-behind mode."""
+        if self.write_queue is not None:
+            self.write_queue.flush()
 
     def list(self, path: Union[str, List[str]] = None,
-             query: str = None, fields: str = None) -> List[Dict[str, Any]]:
+             query: str = None, fields: str = None, page_size: int = None,
+             prefetch: bool = False) -> List[Dict[str, Any]]:
         """List or searches the files in a path.
 
         Args:
             path: The path ID string, the list of path names, or None.
             query: A query string for filtering the file results.
             fields: The comma-separated list of the field paths to be included.
+            page_size: The number of files per page up to
+                :py:attr:`MAX_PAGE_SIZE`, or None for the server default.
+            prefetch: Whether to fetch the next page in the background.
         Returns:
             A list of files.
         """
@@ -52,26 +161,81 @@ class Files:
             parent_id = self.get_path_id(path)
         else:
             parent_id = None
-        return list(self.each_files(parent_id, query, fields))
+        index = self._fresh_index()
+        if index is not None and parent_id and query is None:
+            projection = index.projection(fields)
+            if projection is not None:
+                return index.list(parent_id, projection)
+        return list(self.each_files(parent_id, query, fields,
+                                    page_size, prefetch))
+
+    def list_table(self, path: Union[str, List[str]] = None,
+                   query: str = None, fields: str = 'id,name,mimeType',
+                   page_size: int = MAX_PAGE_SIZE,
+                   prefetch: bool = False) -> FileTable:
+        """List or search the files in a path into a compact table.
+
+        Only the requested fields are listed and stored,
+        and the pages are appended to the table as they arrive,
+        so no dictionary is kept per file.
 
-    def read(self, path: Union[str, List[str]], name: str) -> str:
+        Args:
+            path: The path ID string, the list of path names, or None.
+            query: A query string for filtering the file results.
+            fields: The comma-separated list of the file fields.
+            page_size: The number of files per page up to
+                :py:attr:`MAX_PAGE_SIZE`.
+            prefetch: Whether to fetch the next page in the background.
+        Returns:
+            The :py:class:`FileTable` of the files.
+        """
+        table = FileTable(fields)
+        if isinstance(path, str):
+            parent_id = path
+        elif path:
+            parent_id = self.get_path_id(path)
+        else:
+            parent_id = None
+        index = self._fresh_index()
+        if index is not None and parent_id and query is None:
+            projection = index.projection(f"files({','.join(table.fields)})")
+            if projection is not None:
+                table.extend(index.list(parent_id, projection))
+                return table
+        table.extend(self.each_files(parent_id, query, f'files({fields})',
+                                     page_size, prefetch))
+        return table
+
+    def read(self, path: Union[str, List[str]], name: str,
+             use_cache: bool = True, decompress: bool = True) -> str:
         """Read the content of a file.
 
         Args:
             path: The path ID string, or the list of path names.
             name: The file name.
+            use_cache: Whether to use the content cache.
+            decompress: Whether to decompress the content written
+                with a codec. See :py:func:`read_file_id`.
         Returns:
             The file content as a string.
+            The latest content staged by the write-behind mode is returned
+            as bytes if any.
         """
+        if self.write_queue is not None:
+            content = self.write_queue.get(path, name)
+            if content is not None:
+                return content
         if isinstance(path, str):
             parent_id = path
         else:
             parent_id = self.get_path_id(path)
         fileid = self.get_id(parent_id, name)
-        return self.read_file_id(fileid) if fileid else None
+        return self.read_file_id(fileid, use_cache, decompress) \
+            if fileid else None
 
     def write(self, path: Union[str, List[str]], name: str,
-              content: str, mimetype: str) -> str:
+              content: Content, mimetype: str, chunk_size: int = None,
+              compression: str = None) -> str:
         """Write the content of a file.
 
         The file is overwrote if it exists, or created otherwise.
@@ -79,67 +243,246 @@ class Files:
         Args:
             path: The path ID string, or the array of path names.
             name: The file name.
-            content: The file content as a string.
+            content: The file content as a string, a bytes-like object,
+                a readable binary file object, or the path-like object
+                of a local file.
             mimetype: The mime-type of the file.
+            chunk_size: The chunk size in bytes for a resumable upload,
+                or None for :py:attr:`CHUNK_SIZE`. A string or
+                a bytes-like object within a chunk is uploaded in a single
+                request, and the other contents in a resumable upload.
+            compression: The codec compressing the content,
+                ``gzip`` or ``zstd``, or None.
         Returns:
-            The file ID string.
+            The file ID string, or None in the write-behind mode.
         """
+        if self.write_queue is not None:
+            self.write_queue.put(path, name, content, mimetype, chunk_size,
+                                 compression)
+            return None
+        return self._write(path, name, content, mimetype, chunk_size,
+                           compression)
+
+    def _write(self, path: Union[str, List[str]], name: str,
+               content: Content, mimetype: str, chunk_size: int = None,
+               compression: str = None) -> str:
         if isinstance(path, str):
             parent_id = path
         else:
             parent_id = self.get_path_id(path)
         fileid = self.get_id(parent_id, name)
         if fileid:
-            self.update_file_id(fileid, content, mimetype)
+            self.update_file_id(fileid, content, mimetype, chunk_size,
+                                compression=compression)
             return fileid
         else:
-            return self.create_file(parent_id, name, content, mimetype)
+            return self.create_file(parent_id, name, content, mimetype,
+                                    chunk_size, compression=compression)
+
+    def read_many(self, items: Iterable[Tuple[Union[str, List[str]], str]],
+                  max_workers: int = 8) -> Iterator[TransferResult]:
+        """Read the contents of files in parallel.
+
+        Each worker thread uses its own HTTP transport.
+
+        Args:
+            items: The pairs of the path and the name
+                passed to :py:func:`read`.
+            max_workers: The number of worker threads.
+        Yields:
+            Results in completion order. The result is the file content.
+        """
+        return self._run_parallel(lambda item: self.read(*item),
+                                  items, max_workers)
+
+    def write_many(self, items: Iterable[Tuple[Union[str, List[str]],
+                                               str, str, str]],
+                   max_workers: int = 8) -> Iterator[TransferResult]:
+        """Write the contents of files in parallel.
+
+        Each worker thread uses its own HTTP transport.
+
+        Args:
+            items: The tuples of the path, the name, the content,
+                and the mime-type passed to :py:func:`write`.
+            max_workers: The number of worker threads.
+        Yields:
+            Results in completion order. The result is the file ID string.
+        """
+        return self._run_parallel(lambda item: self.write(*item),
+                                  items, max_workers)
+
+    def sync_up(self, local_dir: str, path: Union[str, List[str]],
+                max_workers: int = 8) -> Iterator[TransferResult]:
+        """Upload a local directory tree to a folder incrementally.
+
+        The remote tree is listed once with ``md5Checksum`` and ``size``,
+        and only the local files differing in the size or the MD5 checksum
+        are uploaded in parallel. Missing folders are created.
+
+        Args:
+            local_dir: The local directory.
+            path: The path ID string, or the list of path names.
+            max_workers: The number of worker threads.
+        Yields:
+            Results of the uploads in completion order.
+            The item is the relative POSIX path
+            and the result is the file ID string.
+        """
+        top_id = path if isinstance(path, str) else self.get_path_id(path)
+        if not top_id:
+            raise FileNotFoundError(f'folder not found: {path}')
+        return sync_up(self, local_dir, top_id, max_workers)
+
+    def sync_down(self, path: Union[str, List[str]], local_dir: str,
+                  max_workers: int = 8) -> Iterator[TransferResult]:
+        """Download a folder tree to a local directory incrementally.
+
+        The remote tree is listed once with ``md5Checksum`` and ``size``,
+        and only the files differing from the local files are downloaded
+        in parallel. Google Workspace documents are skipped.
+
+        Args:
+            path: The path ID string, or the list of path names.
+            local_dir: The local directory.
+            max_workers: The number of worker threads.
+        Yields:
+            Results of the downloads in completion order.
+            The item is the relative POSIX path
+            and the result is the local path.
+        """
+        top_id = path if isinstance(path, str) else self.get_path_id(path)
+        if not top_id:
+            raise FileNotFoundError(f'folder not found: {path}')
+        return sync_down(self, top_id, local_dir, max_workers)
 
     def each_files(self, parent_id: str = None, query: str = None,
-                   fields: str = None) -> Iterator[Dict[str, Any]]:
+                   fields: str = None, page_size: int = None,
+                   prefetch: bool = False) -> Iterator[Dict[str, Any]]:
         """Iterate the files in a path.
 
+        Use ``page_size=Files.MAX_PAGE_SIZE`` and a narrow ``fields``
+        such as :py:attr:`MINIMAL_FIELDS` to list large folders
+        in fewer and smaller responses.
+
         Args:
             parent_id: The path ID string, or None.
             query: A query string for filtering the file results.
             fields: The comma-separated list of the field paths to be included.
+            page_size: The number of files per page up to
+                :py:attr:`MAX_PAGE_SIZE`, or None for the server default.
+            prefetch: Whether to fetch the next page in the background
+                while the current page is consumed.
+                It requires a files object created by :py:class:`Service`.
         Yields:
             Files.
         """
-        if parent_id:
-            if query:
-                q = f"'{parent_id}' in parents and {query}"
-            else:
-                q = f"'{parent_id}' in parents"
-        else:
-            if query:
-                q = query
-            else:
-                q = ''
+        q = list_query(parent_id, query)
         if fields and 'nextPageToken' not in fields:
             fields = 'nextPageToken,' + fields
-        page_token = None
-        while True:
+        if page_size is not None:
+            page_size = min(page_size, self.MAX_PAGE_SIZE)
+
+        def fetch(page_token):
             request = self.drivefiles.list(
-                q=q, spaces='drive', fields=fields, pageToken=page_token)
-            response = self.__execute(request)
+                q=q, spaces='drive', fields=fields, pageToken=page_token,
+                pageSize=page_size)
+            return self.__execute(request)
+        if prefetch and self._concurrent:
+            pages = self._prefetch_pages(fetch)
+        else:
+            pages = self._fetch_pages(fetch)
+        for response in pages:
             for file in response.get('files', []):
                 yield file
-            page_token = response.get('nextPageToken', None)
-            if page_token is None:
-                break
+
+    def walk(self, path: Union[str, List[str]] = None,
+             max_depth: int = None, max_workers: int = 4,
+             group_size: int = 20, fields: str = None) -> Iterator[WalkEntry]:
+        """Walk a folder tree breadth-first like ``os.walk``.
+
+        The children of sibling folders are listed together in a query
+        and the queries run in parallel.
+        The trashed files are excluded.
+
+        Args:
+            path: The path ID string, the list of path names,
+                or None for the root folder.
+            max_depth: The maximum depth of the folders to be listed
+                below the top folder, or None for no limit.
+            max_workers: The number of worker threads.
+            group_size: The maximum number of folders listed in a query.
+            fields: The comma-separated list of the file fields to be
+                included in addition to ``id,name,mimeType,parents``.
+        Yields:
+            Folders. A folder is yielded after its parent.
+        """
+        if isinstance(path, str):
+            top_id = path
+        elif path:
+            top_id = self.get_path_id(path)
+        else:
+            top_id = 'root'
+        if top_id == 'root':
+            top_id = self._root_id()
+        if not top_id:
+            return
+        yield from walk(self, top_id, max_depth, max_workers, group_size,
+                        fields)
 
     def get_path_id(self, path: List[str], root_id: str = 'root') -> str:
         """Get the file ID of the path.
 
+        The names missing in the ID cache are resolved together
+        by a query of the folders and files with the names,
+        and the parent chain is rebuilt locally.
+        The names are resolved one by one with a fresh metadata index,
+        or if the candidates exceed a page.
+
         Args:
             path: The array of path names.
             root_id: The ID string of the root folder.
         Returns:
-            The ID string of the path.
+            The ID string of the path, or None unless the path exists.
         """
-        return reduce(lambda parent, name: self.get_id(parent, name),
-                      path, root_id)
+        names = list(path)
+        if self._fresh_index() is not None:
+            return reduce(lambda parent, name: self.get_id(parent, name),
+                          names, root_id)
+        parent_key = parent_id = root_id
+        while names and parent_id and self.id_cache is not None:
+            file_id = self.id_cache.get(parent_id, names[0])
+            if not file_id:
+                break
+            parent_key = parent_id = file_id
+            names.pop(0)
+        if not (names and parent_id):
+            return parent_id
+        if len(names) == 1:
+            return self.get_id(parent_id, names[0])
+        if parent_id == 'root':
+            parent_id = self._root_id()
+        request = self.drivefiles.list(
+            q=path_query(names, FOLDER_MIMETYPE), spaces='drive',
+            fields='nextPageToken,files(id,name,parents)',
+            pageSize=self.MAX_PAGE_SIZE)
+        response = self.__execute(request)
+        candidates = {}
+        for file in response.get('files', []):
+            for candidate_parent in file.get('parents', []):
+                candidates.setdefault((candidate_parent, file['name']),
+                                      file['id'])
+        for i, name in enumerate(names):
+            file_id = candidates.get((parent_id, name), None)
+            if file_id is None:
+                if 'nextPageToken' not in response:
+                    return None
+                return reduce(lambda parent, n: self.get_id(parent, n),
+                              names[i:], parent_key)
+            if self.id_cache is not None:
+                self.id_cache.put(parent_key, name, file_id)
+            parent_key = parent_id = file_id
+        return parent_id
 
     def get_id(self, parent_id: str, name: str) -> str:
         """Get the file ID.
@@ -151,53 +494,370 @@ class Files:
             The ID string of the file, or None unless the file exists.
         """
         if parent_id and name:
-            request = self.drivefiles.list(
-                q=f"'{parent_id}' in parents and name='{name}'",
-                spaces='drive', fields="files(id)")
-            files = self.__execute(request).get('files', [])
-            return next(iter(files), {}).get('id', None)
+            if self.id_cache is not None:
+                file_id = self.id_cache.get(parent_id, name)
+                if file_id:
+                    return file_id
+            index = self._fresh_index()
+            file_id = index.get_id(parent_id, name) if index else None
+            if not file_id and (index is None or index.fallback):
+                request = self.drivefiles.list(
+                    q=name_query(parent_id, name),
+                    spaces='drive', fields="files(id)")
+                files = self.__execute(request).get('files', [])
+                file_id = next(iter(files), {}).get('id', None)
+            if self.id_cache is not None:
+                self.id_cache.put(parent_id, name, file_id)
+            return file_id
         else:
             return None
 
     def create_file(self, parent_id: str, name: str,
-                    content: str, mimetype: str) -> str:
+                    content: Content, mimetype: str, chunk_size: int = None,
+                    session: UploadSession = None,
+                    compression: str = None) -> str:
         """Create a file.
 
         Args:
             parent_id: The path ID string.
             name: The file name.
-            content: The file content as a string.
+            content: The file content as a string, a bytes-like object,
+                a readable binary file object, or the path-like object
+                of a local file.
             mimetype: The mime-type of the file.
+            chunk_size: The chunk size in bytes for a resumable upload,
+                or None for :py:attr:`CHUNK_SIZE`. A string or
+                a bytes-like object within a chunk is uploaded in a single
+                request, and the other contents in a resumable upload.
+            session: The :py:class:`UploadSession` to be started or resumed.
+                The upload is resumable if it is specified.
+            compression: The codec compressing the content,
+                ``gzip`` or ``zstd``, or None.
+                It is recorded in ``appProperties``.
+                Compressed contents are sent in a resumable upload.
         Returns:
             The ID string of the created file, or None if it fails.
         """
         metadata = {'name': name, 'parents': [parent_id]}
-        media = MediaIoBaseUpload(StringIO(content), mimetype=mimetype)
-        request = self.drivefiles.create(body=metadata, media_body=media)
-        return self.__execute(request).get('id', None)
+        if compression is not None:
+            metadata['appProperties'] = {CODEC_PROPERTY: compression}
+        resumable = chunk_size is not None or session is not None
+        with open_media(content, mimetype, chunk_size or self.CHUNK_SIZE,
+                        resumable, compression) as media:
+            request = self.drivefiles.create(body=metadata, media_body=media)
+            if media.resumable():
+                response = self.__upload(request, session)
+            else:
+                response = self.__execute(request)
+        file_id = response.get('id', None)
+        if self.id_cache is not None:
+            self.id_cache.put(parent_id, name, file_id)
+        if self.metadata_index is not None and file_id:
+            self.metadata_index.put({'id': file_id, 'name': name,
+                                     'parents': [parent_id],
+                                     'mimeType': mimetype})
+        return file_id
+
+    def create_folder(self, parent_id: str, name: str) -> str:
+        """Create a folder.
+
+        Args:
+            parent_id: The path ID string.
+            name: The folder name.
+        Returns:
+            The ID string of the created folder.
+        """
+        metadata = {'name': name, 'parents': [parent_id],
+                    'mimeType': FOLDER_MIMETYPE}
+        request = self.drivefiles.create(body=metadata, fields='id')
+        file_id = self.__execute(request).get('id', None)
+        if self.id_cache is not None:
+            self.id_cache.put(parent_id, name, file_id)
+        if self.metadata_index is not None and file_id:
+            self.metadata_index.put(dict(metadata, id=file_id))
+        return file_id
 
-    def read_file_id(self, file_id: str) -> str:
+    def read_file_id(self, file_id: str, use_cache: bool = True,
+                     decompress: bool = True) -> str:
         """Read the file content.
 
+        The codec of a compressed content is recorded in
+        ``appProperties``, so they are read first, together with
+        the ``md5Checksum`` and ``version`` checked by the content cache.
+        An unchanged content is read from the disk.
+
+        A compressed content is decompressed chunk by chunk as it is
+        downloaded, and the content cache keeps it decompressed.
+
         Args:
             file_id: The file ID string.
+            use_cache: Whether to use the content cache.
+            decompress: Whether to decompress the content written
+                with a codec. Without the content cache, False saves
+                the metadata request and returns the content as stored.
         Returns:
             The file content as a string.
         """
-        return self.__execute(self.drivefiles.get_media(fileId=file_id))
+        cache = self.content_cache if use_cache else None
+        codec = None
+        if cache is not None or decompress:
+            fields = ['md5Checksum', 'version'] if cache is not None else []
+            if decompress:
+                fields.append('appProperties')
+            request = self.drivefiles.get(fileId=file_id,
+                                          fields=','.join(fields))
+            metadata = self.__execute(request)
+            codec = file_codec(metadata) if decompress else None
+        if cache is not None:
+            tag = metadata.get('md5Checksum', None)
+            if not tag and metadata.get('version', None):
+                tag = 'v' + str(metadata['version'])
+            if tag and codec is not None:
+                # The decompressed content is kept apart from the stored one.
+                tag += '-' + codec
+            content = cache.get(file_id, tag)
+            if content is not None:
+                return content
+        request = self.drivefiles.get_media(fileId=file_id)
+        if codec is None:
+            content = self.__execute(request)
+        else:
+            buffer = BytesIO()
+            writer = DecompressingWriter(buffer, codec)
+            for _ in self.__download(request, writer, self.CHUNK_SIZE):
+                pass
+            writer.close()
+            content = buffer.getvalue()
+        if cache is not None and isinstance(content, bytes):
+            cache.put(file_id, tag, content)
+        return content
+
+    def download_file_id(self, file_id: str,
+                         fileobj: Union[BinaryIO, str, PathLike],
+                         chunk_size: int = CHUNK_SIZE,
+                         decompress: bool = False) -> None:
+        """Download the file content into a writable file object in chunks.
+
+        A failed chunk is retried without downloading the preceding chunks
+        again.
+
+        Args:
+            file_id: The file ID string.
+            fileobj: The writable binary file object, or the path string
+                or path-like object of a local file to be overwritten.
+            chunk_size: The chunk size in bytes.
+            decompress: Whether to decompress the content written
+                with a codec as it is downloaded. The codec takes
+                a metadata request, so it is not detected by default.
+        """
+        if isinstance(fileobj, (str, PathLike)):
+            with open(fileobj, 'wb') as f:
+                return self.download_file_id(file_id, f, chunk_size,
+                                             decompress)
+        codec = self._codec(file_id) if decompress else None
+        writer = fileobj if codec is None \
+            else DecompressingWriter(fileobj, codec)
+        request = self.drivefiles.get_media(fileId=file_id)
+        for _ in self.__download(request, writer, chunk_size):
+            pass
+        if codec is not None:
+            writer.close()
+
+    def readinto_file_id(self, file_id: str, buffer,
+                         chunk_size: int = CHUNK_SIZE,
+                         decompress: bool = False) -> int:
+        """Download the file content into a pre-allocated buffer.
+
+        Args:
+            file_id: The file ID string.
+            buffer: The writable bytes-like object, such as ``bytearray``.
+            chunk_size: The chunk size in bytes.
+            decompress: Whether to decompress the content written
+                with a codec. The codec takes a metadata request,
+                so it is not detected by default.
+        Returns:
+            The number of bytes written into the buffer.
+        Raises:
+            ValueError: The buffer is smaller than the file content.
+        """
+        writer = BufferWriter(buffer)
+        self.download_file_id(file_id, writer, chunk_size, decompress)
+        return writer.tell()
+
+    def iter_file_id(self, file_id: str, chunk_size: int = CHUNK_SIZE,
+                     decompress: bool = False) -> Iterator[bytes]:
+        """Iterate the file content in chunks.
+
+        Args:
+            file_id: The file ID string.
+            chunk_size: The chunk size in bytes.
+            decompress: Whether to decompress the content written
+                with a codec as it is downloaded. The codec takes
+                a metadata request, so it is not detected by default.
+        Yields:
+            Byte chunks of the file content.
+        """
+        codec = self._codec(file_id) if decompress else None
+        buffer = BytesIO()
+        writer = buffer if codec is None \
+            else DecompressingWriter(buffer, codec)
+        request = self.drivefiles.get_media(fileId=file_id)
+        for _ in self.__download(request, writer, chunk_size):
+            if buffer.tell():
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if codec is not None:
+            writer.close()
+            if buffer.tell():
+                yield buffer.getvalue()
+
+    def read_range(self, file_id: str, start: int, end: int = None) -> bytes:
+        """Read a byte range of the file content by a Range request.
+
+        Args:
+            file_id: The file ID string.
+            start: The first byte offset, or a negative number
+                to read the last ``-start`` bytes.
+            end: The byte offset after the range,
+                or None to read until the end.
+        Returns:
+            The bytes in the range.
+            It is shorter than the range at the end of the file.
+        Raises:
+            ValueError: ``end`` is given with a negative ``start``.
+        """
+        if start < 0:
+            if end is not None:
+                raise ValueError('end with a negative start')
+            byte_range = f'bytes={start}'
+        elif end is None:
+            byte_range = f'bytes={start}-'
+        elif end <= start:
+            return b''
+        else:
+            byte_range = f'bytes={start}-{end - 1}'
+        request = self.drivefiles.get_media(fileId=file_id)
+        request.headers['range'] = byte_range
+        try:
+            return self.__execute(request)
+        except HttpError as e:
+            if e.resp.status == 416:
+                return b''
+            raise
+
+    def open_file_id(self, file_id: str, block_size: int = 1024 * 1024,
+                     max_blocks: int = 16,
+                     readahead: int = 4) -> RangeReader:
+        """Open the file content as a seekable binary file object.
+
+        The content is fetched by :py:func:`read_range` in blocks
+        as it is read, so only the read parts are downloaded.
+
+        Args:
+            file_id: The file ID string.
+            block_size: The size of a fetched block in bytes.
+            max_blocks: The maximum number of cached blocks.
+            readahead: The number of blocks fetched ahead
+                by a sequential read.
+        Returns:
+            The :py:class:`RangeReader` object.
+        Raises:
+            ValueError: The file has no binary content,
+                such as a Google Workspace document.
+        """
+        request = self.drivefiles.get(fileId=file_id, fields='size')
+        size = self.__execute(request).get('size', None)
+        if size is None:
+            raise ValueError(f'file has no binary content: {file_id}')
+        return RangeReader(self, file_id, int(size), block_size, max_blocks,
+                           readahead)
 
     def update_file_id(self, file_id: str,
-                       content: str, mimetype: str) -> None:
+                       content: Content, mimetype: str,
+                       chunk_size: int = None,
+                       session: UploadSession = None,
+                       compression: str = None) -> None:
         """Update the file content.
 
         Args:
             file_id: The file ID string.
-            content: The file content as a string.
+            content: The file content as a string, a bytes-like object,
+                a readable binary file object, or the path-like object
+                of a local file.
             mimetype: The mime-type of the file.
+            chunk_size: The chunk size in bytes for a resumable upload,
+                or None for :py:attr:`CHUNK_SIZE`. A string or
+                a bytes-like object within a chunk is uploaded in a single
+                request, and the other contents in a resumable upload.
+            session: The :py:class:`UploadSession` to be started or resumed.
+                The upload is resumable if it is specified.
+            compression: The codec compressing the content,
+                ``gzip`` or ``zstd``, or None.
+                It replaces the codec recorded in ``appProperties``.
+                Compressed contents are sent in a resumable upload.
+                An update in a single request reads the recorded codec
+                first, and sends the metadata only to clear it.
         """
-        media = MediaIoBaseUpload(StringIO(content), mimetype=mimetype)
-        request = self.drivefiles.update(fileId=file_id, media_body=media)
-        self.__execute(request)
+        resumable = chunk_size is not None or session is not None
+        with open_media(content, mimetype, chunk_size or self.CHUNK_SIZE,
+                        resumable, compression) as media:
+            body = None
+            # The metadata of a resumable upload is sent with the session.
+            if media.resumable() or self._codec(file_id) is not None:
+                body = {'appProperties': {CODEC_PROPERTY: compression}}
+            request = self.drivefiles.update(fileId=file_id, media_body=media,
+                                             body=body)
+            if media.resumable():
+                self.__upload(request, session)
+            else:
+                self.__execute(request)
+        if self.content_cache is not None:
+            self.content_cache.invalidate(file_id)
+
+    def copy_file_id(self, file_id: str, parent_id: str = None,
+                     name: str = None) -> str:
+        """Copy a file on the server without transferring its content.
+
+        Args:
+            file_id: The file ID string.
+            parent_id: The ID string of the destination folder,
+                or None for the folder of the file.
+            name: The name of the copy, or None for the name of the file.
+        Returns:
+            The ID string of the copy.
+        """
+        body = {}
+        if parent_id:
+            body['parents'] = [parent_id]
+        if name:
+            body['name'] = name
+        request = self.drivefiles.copy(fileId=file_id, body=body,
+                                       fields='id,name,mimeType,parents')
+        file = self.__execute(request)
+        self._remember(file)
+        return file.get('id', None)
+
+    def move_file_id(self, file_id: str, parent_id: str,
+                     name: str = None) -> None:
+        """Move a file to another folder on the server.
+
+        Args:
+            file_id: The file ID string.
+            parent_id: The ID string of the destination folder.
+            name: The new name of the file, or None to keep the name.
+        """
+        request = self.drivefiles.get(fileId=file_id, fields='parents')
+        parents = self.__execute(request).get('parents', [])
+        request = self.drivefiles.update(
+            fileId=file_id, body={'name': name} if name else {},
+            addParents=parent_id,
+            removeParents=','.join(p for p in parents if p != parent_id),
+            fields='id,name,mimeType,parents')
+        file = self.__execute(request)
+        if self.id_cache is not None:
+            self.id_cache.invalidate_id(file_id)
+        self._remember(file)
 
     def delete_file_id(self, file_id: str) -> None:
         """Delete a file.
@@ -206,18 +866,459 @@ class Files:
             file_id: The file ID string.
         """
         self.__execute(self.drivefiles.delete(fileId=file_id))
+        self._forget(file_id)
 
-    def __execute(self, request):
-        return self.__retry(lambda: request.execute())
+    def delete_many(self, file_ids: Iterable[str], trash: bool = False,
+                    max_workers: int = 4,
+                    max_batch_size: int = Batch.MAX_BATCH_SIZE
+                    ) -> Iterator[TransferResult]:
+        """Delete or trash files in concurrent batches.
+
+        Rate-limited calls are retried in later round trips
+        according to the retry policy.
+
+        Args:
+            file_ids: The file ID strings.
+            trash: Whether to move the files to the trash
+                instead of deleting them permanently.
+            max_workers: The number of batches sent concurrently.
+            max_batch_size: The maximum number of calls in a batch.
+        Yields:
+            Results of the files in completion order of the batches.
+            The item is the file ID string.
+        """
+        def delete(chunk):
+            with self.batch(max_batch_size) as batch:
+                futures = [batch.trash_file_id(file_id) if trash
+                           else batch.delete_file_id(file_id)
+                           for file_id in chunk]
+            return [TransferResult(file_id, None, future.exception())
+                    for file_id, future in zip(chunk, futures)]
+        for result in self._run_parallel(
+                delete, chunked(file_ids, max_batch_size), max_workers):
+            if result.error is None:
+                yield from result.result
+            else:
+                for file_id in result.item:
+                    yield TransferResult(file_id, None, result.error)
+
+    def delete_tree(self, path: Union[str, List[str]], trash: bool = True,
+                    keep_root: bool = False, max_workers: int = 4,
+                    max_batch_size: int = Batch.MAX_BATCH_SIZE
+                    ) -> Iterator[TransferResult]:
+        """Delete or trash a folder tree.
+
+        The children of the folder are listed once and deleted by
+        :py:func:`delete_many`. Google Drive deletes the descendants
+        of a deleted folder with it. A trashed folder takes its
+        descendants to the trash, so only the folder itself is trashed
+        unless ``keep_root`` is set, and restoring it restores the tree.
+
+        Args:
+            path: The path ID string, or the list of path names.
+            trash: Whether to move the files to the trash
+                instead of deleting them permanently.
+            keep_root: Whether to keep the folder and delete only its
+                children.
+            max_workers: The number of batches sent concurrently.
+            max_batch_size: The maximum number of calls in a batch.
+        Yields:
+            Results of the children, and then of the folder itself.
+            Trashing the whole tree yields only the folder's result.
+            The item is the file ID string.
+        Raises:
+            FileNotFoundError: The folder does not exist.
+        """
+        top_id = path if isinstance(path, str) else self.get_path_id(path)
+        if not top_id:
+            raise FileNotFoundError(f'folder not found: {path}')
+        if trash and not keep_root:
+            yield from self.delete_many([top_id], True, 1)
+            return
+        child_ids = [file['id'] for file in self.each_files(
+            top_id, 'trashed = false', 'files(id)', self.MAX_PAGE_SIZE)]
+        yield from self.delete_many(child_ids, trash, max_workers,
+                                    max_batch_size)
+        if not keep_root:
+            yield from self.delete_many([top_id], trash, 1)
+
+    def copy_tree(self, src_path: Union[str, List[str]],
+                  dst_path: Union[str, List[str]],
+                  max_workers: int = 8) -> Iterator[TransferResult]:
+        """Copy a folder tree on the server.
+
+        The folders are created and the files are copied in parallel
+        by :py:func:`copy_file_id`, so no content is transferred.
+
+        Args:
+            src_path: The path ID string, or the list of path names
+                of the source folder.
+            dst_path: The path ID string of an existing folder receiving
+                the children of the source folder, or the list of
+                path names of the folder created for them.
+            max_workers: The number of worker threads.
+        Yields:
+            Results of the copies in completion order.
+            The item is the relative POSIX path
+            and the result is the ID string of the copy.
+        Raises:
+            FileNotFoundError: The source folder or the parent folder
+                of the destination does not exist.
+        """
+        src_id = src_path if isinstance(src_path, str) \
+            else self.get_path_id(src_path)
+        if not src_id:
+            raise FileNotFoundError(f'folder not found: {src_path}')
+        if isinstance(dst_path, str):
+            dst_id = dst_path
+        else:
+            parent_id = self.get_path_id(dst_path[:-1])
+            if not parent_id:
+                raise FileNotFoundError(f'folder not found: {dst_path[:-1]}')
+            dst_id = self.get_id(parent_id, dst_path[-1]) \
+                or self.create_folder(parent_id, dst_path[-1])
+        return copy_tree(self, src_id, dst_id, max_workers)
+
+    def build_index(self) -> None:
+        """Fill the metadata index with a full listing."""
+        index = self._require_index()
+        page_token = self.start_page_token()
+        request = self.drivefiles.get(fileId='root', fields='id')
+        root_id = self.__execute(request)['id']
+        fields = 'files(' + ','.join(index.FIELDS) + ')'
+        index.reset(root_id,
+                    self.each_files(None, 'trashed = false', fields,
+                                    self.MAX_PAGE_SIZE, prefetch=True),
+                    page_token)
+
+    def update_index(self) -> None:
+        """Apply the changes since the last update to the metadata index."""
+        index = self._require_index()
+        for changes, page_token in self.each_changes(index.page_token):
+            index.apply_changes(changes, page_token)
+
+    def start_page_token(self) -> str:
+        """Return the page token of the changes after now."""
+        request = self._service.changes().getStartPageToken()
+        return self.__execute(request)['startPageToken']
+
+    def each_changes(self, page_token: str, fields: str = None
+                     ) -> Iterator[Tuple[List[Dict[str, Any]], str]]:
+        """Iterate the pages of the changes feed.
+
+        Args:
+            page_token: The page token of the first change.
+            fields: The fields of the changes,
+                or None for :py:attr:`CHANGES_FIELDS`.
+        Yields:
+            Pairs of the changes in a page and the page token after them.
+        """
+        drivechanges = self._service.changes()
+        while page_token:
+            request = drivechanges.list(
+                pageToken=page_token, spaces='drive', includeRemoved=True,
+                pageSize=1000, fields=fields or self.CHANGES_FIELDS)
+            response = self.__execute(request)
+            page_token = response.get('nextPageToken', None)
+            yield (response.get('changes', []),
+                   page_token or response.get('newStartPageToken', None))
+
+    def apply_changes(self, changes: List[Dict[str, Any]]) -> None:
+        """Invalidate the cached IDs, contents and metadata of changes.
+
+        Args:
+            changes: The change resources with ``fileId``,
+                ``removed`` and ``file``.
+        """
+        for change in changes:
+            file_id = change.get('fileId', None)
+            if self.id_cache is not None:
+                self.id_cache.invalidate_id(file_id)
+            if self.content_cache is not None:
+                self.content_cache.invalidate(file_id)
+        index = self.metadata_index
+        if index is not None and index.page_token:
+            index.apply_changes(changes, index.page_token)
+
+    def watch_changes(self, page_token: str, address: str,
+                      channel_id: str, token: str = None,
+                      expiration: float = None) -> Dict[str, Any]:
+        """Open a notification channel of the changes feed.
+
+        Args:
+            page_token: The page token of the watched changes.
+            address: The HTTPS URL receiving the notifications.
+            channel_id: The unique ID string of the new channel.
+            token: The string sent with each notification, or None.
+            expiration: The UNIX time the channel expires at,
+                or None for the server default.
+        Returns:
+            The channel resource with ``id``, ``resourceId``
+            and ``expiration`` in milliseconds.
+        """
+        body = {'id': channel_id, 'type': 'web_hook', 'address': address}
+        if token is not None:
+            body['token'] = token
+        if expiration is not None:
+            body['expiration'] = int(expiration * 1000)
+        request = self._service.changes().watch(
+            pageToken=page_token, spaces='drive', includeRemoved=True,
+            body=body)
+        return self.__execute(request)
+
+    def stop_channel(self, channel: Dict[str, Any]) -> None:
+        """Stop a notification channel.
+
+        Args:
+            channel: The channel resource returned by
+                :py:func:`watch_changes`.
+        """
+        request = self._service.channels().stop(
+            body={'id': channel['id'], 'resourceId': channel['resourceId']})
+        self.__execute(request)
+
+    def watch(self, address: str = None, host: str = '127.0.0.1',
+              port: int = 0, ttl: float = 3600,
+              renew_before: float = 300) -> ChangeWatcher:
+        """Return a :py:class:`ChangeWatcher` of the changes feed.
+
+        The caches of the files object are invalidated by the
+        notified changes. It is started by :py:func:`ChangeWatcher.start`
+        or a with statement.
+
+        Args:
+            address: The public HTTPS URL forwarded to the receiver,
+                or None for the URL of the receiver itself.
+            host: The host name the receiver binds.
+            port: The port the receiver binds, or 0 for a free port.
+            ttl: The lifetime of a channel in seconds.
+            renew_before: The seconds before the expiration
+                a channel is renewed at.
+        """
+        watcher = ChangeWatcher(self, address, host, port, ttl=ttl,
+                                renew_before=renew_before)
+        watcher.add_callback(self.apply_changes)
+        return watcher
+
+    def batch(self, max_batch_size: int = Batch.MAX_BATCH_SIZE) -> Batch:
+        """Return a :py:class:`Batch` object queuing API calls.
+
+        Args:
+            max_batch_size: The maximum number of calls in a round trip.
+        """
+        return Batch(self, max_batch_size)
+
+    def get_ids(self, parent_id: str, names: List[str]) -> List[str]:
+        """Get the file IDs in a batch.
+
+        Args:
+            parent_id: The path ID string.
+            names: The list of file names.
+        Returns:
+            The list of the ID strings of the files, or None for each file
+            which does not exist.
+        """
+        with self.batch() as batch:
+            futures = [batch.get_id(parent_id, name) for name in names]
+        return [future.result() for future in futures]
+
+    def get_metadata_many(self, file_ids: List[str],
+                          fields: str = None) -> List[Dict[str, Any]]:
+        """Get the metadata of files in a batch.
+
+        Args:
+            file_ids: The list of file ID strings.
+            fields: The comma-separated list of the field paths to be included.
+        Returns:
+            The list of file metadata.
+        """
+        with self.batch() as batch:
+            futures = [batch.get_metadata(file_id, fields)
+                       for file_id in file_ids]
+        return [future.result() for future in futures]
+
+    def delete_file_ids(self, file_ids: List[str]) -> None:
+        """Delete files in a batch.
 
-    def __retry(self, function):
-        ctry = 0
+        Args:
+            file_ids: The list of file ID strings.
+        Raises:
+            HttpError: The first error after all deletions are attempted.
+        """
+        with self.batch() as batch:
+            futures = [batch.delete_file_id(file_id) for file_id in file_ids]
+        for future in futures:
+            future.result()
+
+    def _run_parallel(self, function: Callable[[Any], Any],
+                      items: Iterable[Any],
+                      max_workers: int) -> Iterator[TransferResult]:
+        if not self._concurrent:
+            return run_serial(function, items)
+        initializer, finalizer = self._worker_hooks()
+        return run_parallel(function, items, max_workers,
+                            initializer, finalizer)
+
+    def _root_id(self) -> str:
+        if self._root is None:
+            request = self.drivefiles.get(fileId='root', fields='id')
+            self._root = self.__execute(request)['id']
+        return self._root
+
+    def _codec(self, file_id: str) -> str:
+        request = self.drivefiles.get(fileId=file_id, fields='appProperties')
+        return file_codec(self.__execute(request))
+
+    def _remember(self, file: Dict[str, Any]) -> None:
+        file_id = file.get('id', None)
+        if self.id_cache is not None and 'name' in file:
+            for parent_id in file.get('parents', []):
+                self.id_cache.put(parent_id, file['name'], file_id)
+        if self.metadata_index is not None and file_id:
+            self.metadata_index.put(file)
+
+    def _forget(self, file_id: str) -> None:
+        if self.id_cache is not None:
+            self.id_cache.invalidate_id(file_id)
+        if self.metadata_index is not None:
+            self.metadata_index.remove(file_id)
+        if self.content_cache is not None:
+            self.content_cache.invalidate(file_id)
+
+    @property
+    def _concurrent(self) -> bool:
+        return self.http_factory is not None or self.http_pool is not None
+
+    def _worker_hooks(self) -> Tuple[Callable[[], None], Callable[[], None]]:
+        https = []
+        lock = Lock()
+        pool = self.http_pool
+
+        def initializer():
+            if pool is not None:
+                self._local.http = pool.acquire()
+            else:
+                self._local.http = self.http_factory()
+            with lock:
+                https.append(self._local.http)
+
+        def finalizer():
+            for http in https:
+                if pool is not None:
+                    pool.release(http)
+                else:
+                    http.close()
+        return initializer, finalizer
+
+    @staticmethod
+    def _fetch_pages(fetch: Callable[[str], Dict[str, Any]]
+                     ) -> Iterator[Dict[str, Any]]:
+        page_token = None
         while True:
-            try:
-                return function()
-            except (TimeoutError, HttpError):
-                if ctry == self.max_retry:
-                    raise
+            response = fetch(page_token)
+            yield response
+            page_token = response.get('nextPageToken', None)
+            if page_token is None:
+                break
+
+    def _prefetch_pages(self, fetch: Callable[[str], Dict[str, Any]]
+                        ) -> Iterator[Dict[str, Any]]:
+        initializer, finalizer = self._worker_hooks()
+        executor = ThreadPoolExecutor(1, initializer=initializer)
+        try:
+            future = executor.submit(fetch, None)
+            while future is not None:
+                response = future.result()
+                page_token = response.get('nextPageToken', None)
+                if page_token is None:
+                    future = None
                 else:
-                    ctry += 1
-                    sleep(self.retry_interval)
+                    future = executor.submit(fetch, page_token)
+                yield response
+        finally:
+            executor.shutdown(wait=True)
+            finalizer()
+
+    def _fresh_index(self) -> MetadataIndex:
+        index = self.metadata_index
+        return index if index is not None and index.is_fresh() else None
+
+    def _require_index(self) -> MetadataIndex:
+        if self.metadata_index is None:
+            raise ValueError('metadata_index is not specified')
+        return self.metadata_index
+
+    @contextmanager
+    def _connection(self):
+        http = getattr(self._local, 'http', None)
+        if http is None and self.http_pool is not None:
+            with self.http_pool.connection() as http:
+                yield http
+        else:
+            yield http
+
+    def __execute(self, request):
+        idempotent = getattr(request, 'method', None) != 'POST'
+        with self._connection() as http:
+            if http is None:
+                response = self.__retry(lambda: request.execute(),
+                                        idempotent, request)
+            else:
+                response = self.__retry(lambda: request.execute(http=http),
+                                        idempotent, request)
+        if self.metrics is not None:
+            body = getattr(request, 'body', None)
+            self.metrics.record_bytes(
+                sent=len(body) if isinstance(body, (bytes, str)) else 0,
+                received=len(response) if isinstance(response, bytes) else 0)
+        return response
+
+    def __download(self, request, fileobj, chunk_size: int):
+        with self._connection() as http:
+            if http is not None:
+                request.http = http
+            downloader = MediaIoBaseDownload(fileobj, request, chunk_size)
+            progress = 0
+            done = False
+            while not done:
+                status, done = self.__retry(downloader.next_chunk, True,
+                                            request)
+                if self.metrics is not None and status is not None:
+                    self.metrics.record_bytes(
+                        received=status.resumable_progress - progress)
+                    progress = status.resumable_progress
+                yield
+
+    def __upload(self, request, session: UploadSession):
+        if session is None:
+            session = UploadSession()
+        response = None
+        with self._connection() as http:
+            if http is not None:
+                request.http = http
+            if session.uri:
+                response = self.__retry(
+                    lambda: session._resume(request, request.http), True,
+                    request)
+            progress = session.progress
+            while response is None:
+                status, response = self.__retry(request.next_chunk, True,
+                                                request)
+                session._update(request, status)
+                if self.metrics is not None:
+                    self.metrics.record_bytes(
+                        sent=session.progress - progress)
+                    progress = session.progress
+        return response
+
+    def __retry(self, function, idempotent: bool = True, request=None):
+        metrics = self.metrics
+        if metrics is None:
+            return self.retry_policy.call(function, idempotent)
+        if request is None:
+            return self.retry_policy.call(function, idempotent,
+                                          metrics.record_retry)
+        method = method_name(request)
+        return self.retry_policy.call(
+            lambda: metrics.call(method, function, request), idempotent,
+            metrics.record_retry)
@@ -0,0 +1,291 @@
+from typing import List, Dict, Any, Iterable, Optional
+from threading import RLock
+from time import time
+import re
+import sqlite3
+
+
+class MetadataIndex:
+    """Local SQLite index of file metadata.
+
+    The index is filled by :py:func:`Files.build_index` with a full listing
+    and kept current by :py:func:`Files.update_index`
+    with the changes feed of Google Drive API.
+    :py:class:`Files` answers ``get_id``, ``get_path_id`` and ``list``
+    from the index while it is fresh.
+
+    Examples:
+        >>> index = MetadataIndex('drive.sqlite3', max_age=300)
+        >>> gdrive = Service(credentials).files(metadata_index=index)
+        >>> if index.page_token is None:
+        ...   gdrive.build_index()
+        >>> gdrive.update_index()
+        >>> gdrive.get_path_id(('folderA', 'subfolder1'))
+    """
+
+    FIELDS = ('id', 'name', 'parents', 'mimeType', 'md5Checksum',
+              'modifiedTime')
+    """The indexed metadata fields."""
+
+    BATCH_SIZE = 1000
+    """The number of files written in a transaction by :py:func:`reset`."""
+
+    def __init__(self, path: str = ':memory:', max_age: float = None,
+                 fallback: bool = True):
+        """Init MetadataIndex.
+
+        Args:
+            path: The path of the SQLite database file.
+            max_age: The seconds after the last update while the index is
+                fresh, or None for no expiry.
+            fallback: Whether to call the API for files missing in the index.
+        """
+        self.path = path
+        self.max_age = max_age
+        self.fallback = fallback
+        self._lock = RLock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.executescript('''
+                CREATE TABLE IF NOT EXISTS files (
+                    id TEXT PRIMARY KEY, name TEXT, mimeType TEXT,
+                    md5Checksum TEXT, modifiedTime TEXT);
+                CREATE INDEX IF NOT EXISTS files_name ON files (name);
+                CREATE TABLE IF NOT EXISTS parents (
+                    parent_id TEXT, file_id TEXT,
+                    PRIMARY KEY (parent_id, file_id));
+                CREATE INDEX IF NOT EXISTS parents_file ON parents (file_id);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY, value TEXT);
+            ''')
+
+    def __len__(self) -> int:
+        """Return the number of indexed files."""
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM files').fetchone()[0]
+
+    @property
+    def page_token(self) -> Optional[str]:
+        """The page token of the changes feed, or None unless built."""
+        return self._get_meta('page_token')
+
+    @property
+    def root_id(self) -> Optional[str]:
+        """The ID string of the root folder."""
+        return self._get_meta('root_id')
+
+    @property
+    def updated_at(self) -> Optional[float]:
+        """The UNIX time of the last update, or None unless built."""
+        value = self._get_meta('updated_at')
+        return float(value) if value is not None else None
+
+    def is_fresh(self) -> bool:
+        """Return whether the index is built and not older than max_age."""
+        updated_at = self.updated_at
+        if updated_at is None or self.page_token is None:
+            return False
+        return self.max_age is None or time() - updated_at <= self.max_age
+
+    def reset(self, root_id: str, files: Iterable[Dict[str, Any]],
+              page_token: str) -> None:
+        """Replace the whole index.
+
+        The files are consumed without the lock and staged in batches,
+        so the current index keeps answering queries during a crawl
+        and is replaced at once at the end.
+
+        Args:
+            root_id: The ID string of the root folder.
+            files: The metadata of all files.
+            page_token: The start page token of the changes feed.
+        """
+        with self._lock, self._db:
+            self._db.execute('DROP TABLE IF EXISTS temp.staged_files')
+            self._db.execute('DROP TABLE IF EXISTS temp.staged_parents')
+            self._db.execute('CREATE TEMP TABLE staged_files'
+                             ' AS SELECT * FROM files WHERE 0')
+            self._db.execute('CREATE TEMP TABLE staged_parents'
+                             ' AS SELECT * FROM parents WHERE 0')
+        try:
+            batch = []
+            for file in files:
+                batch.append(file)
+                if len(batch) >= self.BATCH_SIZE:
+                    self._stage(batch)
+                    batch = []
+            self._stage(batch)
+            with self._lock, self._db:
+                self._db.execute('DELETE FROM files')
+                self._db.execute('DELETE FROM parents')
+                self._db.execute('INSERT OR REPLACE INTO files'
+                                 ' SELECT * FROM temp.staged_files')
+                self._db.execute('INSERT OR IGNORE INTO parents'
+                                 ' SELECT * FROM temp.staged_parents')
+                self._set_meta('root_id', root_id)
+                self._set_meta('page_token', page_token)
+                self._set_meta('updated_at', str(time()))
+        finally:
+            with self._lock, self._db:
+                self._db.execute('DROP TABLE IF EXISTS temp.staged_files')
+                self._db.execute('DROP TABLE IF EXISTS temp.staged_parents')
+
+    def apply_changes(self, changes: Iterable[Dict[str, Any]],
+                      page_token: str) -> None:
+        """Apply changes of the changes feed.
+
+        Args:
+            changes: The change resources.
+            page_token: The page token after the changes.
+        """
+        with self._lock, self._db:
+            for change in changes:
+                file = change.get('file')
+                if change.get('removed') or not file or file.get('trashed'):
+                    self._remove(change.get('fileId'))
+                else:
+                    self._put(file)
+            self._set_meta('page_token', page_token)
+            self._set_meta('updated_at', str(time()))
+
+    def put(self, file: Dict[str, Any]) -> None:
+        """Insert or update the metadata of a file.
+
+        Args:
+            file: The file metadata including ``id``.
+        """
+        with self._lock, self._db:
+            self._put(file)
+
+    def remove(self, file_id: str) -> None:
+        """Remove a file.
+
+        Args:
+            file_id: The file ID string.
+        """
+        with self._lock, self._db:
+            self._remove(file_id)
+
+    def get_id(self, parent_id: str, name: str) -> Optional[str]:
+        """Get the file ID.
+
+        Args:
+            parent_id: The path ID string.
+            name: The file name.
+        Returns:
+            The ID string of the file, or None unless it is indexed.
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT files.id FROM parents JOIN files'
+                ' ON parents.file_id = files.id'
+                ' WHERE parents.parent_id = ? AND files.name = ? LIMIT 1',
+                (self._resolve(parent_id), name)).fetchone()
+        return row[0] if row else None
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Get the metadata of a file.
+
+        Args:
+            file_id: The file ID string.
+        Returns:
+            The file metadata, or None unless it is indexed.
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT files.*, GROUP_CONCAT(parents.parent_id)'
+                ' FROM files LEFT JOIN parents'
+                ' ON parents.file_id = files.id'
+                ' WHERE files.id = ? GROUP BY files.id',
+                (self._resolve(file_id),)).fetchone()
+            return self._to_dict(row) if row else None
+
+    def list(self, parent_id: str,
+             fields: List[str] = FIELDS) -> List[Dict[str, Any]]:
+        """List the files in a folder.
+
+        Args:
+            parent_id: The path ID string.
+            fields: The fields to be included.
+        Returns:
+            A list of files.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT files.*, GROUP_CONCAT(others.parent_id)'
+                ' FROM parents JOIN files ON parents.file_id = files.id'
+                ' JOIN parents AS others ON others.file_id = files.id'
+                ' WHERE parents.parent_id = ?'
+                ' GROUP BY files.id ORDER BY files.name',
+                (self._resolve(parent_id),)).fetchall()
+            return [{k: v for k, v in self._to_dict(row).items()
+                     if k in fields} for row in rows]
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    @classmethod
+    def projection(cls, fields: str) -> Optional[List[str]]:
+        """Parse the fields parameter of a listing.
+
+        Args:
+            fields: The comma-separated list of the field paths, or None.
+        Returns:
+            The file fields, or None unless the index has all of them.
+        """
+        if not fields:
+            return list(cls.FIELDS)
+        match = re.search(r'files\(([^)]*)\)', fields)
+        if match is None:
+            return None
+        names = [name.strip() for name in match.group(1).split(',')]
+        return names if all(name in cls.FIELDS for name in names) else None
+
+    def _resolve(self, file_id: str) -> str:
+        if file_id == 'root':
+            return self.root_id or file_id
+        return file_id
+
+    @staticmethod
+    def _to_dict(row) -> Dict[str, Any]:
+        file = {'id': row[0], 'name': row[1], 'mimeType': row[2]}
+        if row[3] is not None:
+            file['md5Checksum'] = row[3]
+        if row[4] is not None:
+            file['modifiedTime'] = row[4]
+        file['parents'] = row[5].split(',') if row[5] else []
+        return file
+
+    def _stage(self, files: List[Dict[str, Any]]) -> None:
+        with self._lock, self._db:
+            for file in files:
+                self._put(file, 'temp.staged_files', 'temp.staged_parents')
+
+    def _put(self, file: Dict[str, Any], files_table: str = 'files',
+             parents_table: str = 'parents') -> None:
+        self._db.execute(
+            f'INSERT OR REPLACE INTO {files_table} VALUES (?, ?, ?, ?, ?)',
+            (file['id'], file.get('name'), file.get('mimeType'),
+             file.get('md5Checksum'), file.get('modifiedTime')))
+        if 'parents' in file:
+            self._db.execute(
+                f'DELETE FROM {parents_table} WHERE file_id = ?',
+                (file['id'],))
+            self._db.executemany(
+                f'INSERT OR IGNORE INTO {parents_table} VALUES (?, ?)',
+                [(parent_id, file['id']) for parent_id in file['parents']])
+
+    def _remove(self, file_id: str) -> None:
+        self._db.execute('DELETE FROM files WHERE id = ?', (file_id,))
+        self._db.execute('DELETE FROM parents WHERE file_id = ?', (file_id,))
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                'SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._db.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                         (key, value))
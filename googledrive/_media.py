@@ -0,0 +1,182 @@
+from typing import Union, BinaryIO, Iterator
+from io import RawIOBase, StringIO, BytesIO, SEEK_SET, SEEK_CUR, SEEK_END
+from os import PathLike, fstat
+from contextlib import contextmanager, ExitStack
+import mmap
+
+from googleapiclient.http import MediaIoBaseUpload, MediaUpload
+
+from ._codec import CompressedMedia
+
+Content = Union[str, bytes, bytearray, memoryview, BinaryIO, PathLike]
+"""File content: a string, a bytes-like object, a readable binary file
+object, or the path-like object of a local file."""
+
+
+class BufferReader(RawIOBase):
+    """Seekable binary reader over a buffer without copying it."""
+
+    def __init__(self, buffer, owner=None):
+        """Init BufferReader.
+
+        Args:
+            buffer: The bytes-like object.
+            owner: The object closed with the reader, such as ``mmap``.
+        """
+        self._view = memoryview(buffer).cast('B')
+        self._owner = owner
+        self._pos = 0
+
+    def readable(self) -> bool:
+        """Return True."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return True."""
+        return True
+
+    def readinto(self, b) -> int:
+        """Read bytes into a pre-allocated writable bytes-like object."""
+        data = self._view[self._pos:self._pos + len(b)]
+        n = len(data)
+        memoryview(b).cast('B')[:n] = data
+        self._pos += n
+        return n
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes."""
+        end = len(self._view) if size is None or size < 0 \
+            else min(self._pos + size, len(self._view))
+        data = self._view[self._pos:end].tobytes()
+        self._pos = max(self._pos, end)
+        return data
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        """Change the stream position."""
+        if whence == SEEK_SET:
+            self._pos = offset
+        elif whence == SEEK_CUR:
+            self._pos += offset
+        elif whence == SEEK_END:
+            self._pos = len(self._view) + offset
+        else:
+            raise ValueError(f'invalid whence ({whence})')
+        return self._pos
+
+    def tell(self) -> int:
+        """Return the stream position."""
+        return self._pos
+
+    def close(self) -> None:
+        """Release the buffer and close the owner."""
+        if not self.closed:
+            self._view.release()
+            if self._owner is not None:
+                self._owner.close()
+        super().close()
+
+
+class BufferWriter(RawIOBase):
+    """Binary writer filling a pre-allocated buffer."""
+
+    def __init__(self, buffer):
+        """Init BufferWriter.
+
+        Args:
+            buffer: The writable bytes-like object.
+        """
+        self._view = memoryview(buffer).cast('B')
+        self._pos = 0
+
+    def writable(self) -> bool:
+        """Return True."""
+        return True
+
+    def write(self, b) -> int:
+        """Write bytes at the current position.
+
+        Raises:
+            ValueError: The buffer is too small.
+        """
+        data = memoryview(b).cast('B')
+        end = self._pos + len(data)
+        if end > len(self._view):
+            raise ValueError('buffer is too small for the file content')
+        self._view[self._pos:end] = data
+        self._pos = end
+        return len(data)
+
+    def tell(self) -> int:
+        """Return the number of written bytes."""
+        return self._pos
+
+
+@contextmanager
+def open_media(content: Content, mimetype: str, chunk_size: int = None,
+               resumable: bool = False,
+               compression: str = None) -> Iterator[MediaUpload]:
+    """Open the media of content to be uploaded.
+
+    Bytes-like objects are read in place and local files are memory-mapped.
+    With a chunk size, file objects, local files and contents larger than
+    a chunk are always sent in a resumable upload, so only a chunk of them
+    is copied into a request at a time.
+    The files opened here are closed on exit.
+
+    With a codec, every content is compressed chunk by chunk
+    in a resumable upload.
+
+    Args:
+        content: The file content.
+        mimetype: The mime-type of the file.
+        chunk_size: The chunk size in bytes for a resumable upload.
+        resumable: Whether the upload is resumable even if the content
+            fits in a chunk.
+        compression: The codec compressing the content, or None.
+    Yields:
+        The media object. Its ``resumable()`` tells how to send it.
+    """
+    if compression is not None:
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        with ExitStack() as stack:
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                content = BufferReader(content)
+            elif isinstance(content, PathLike):
+                content = stack.enter_context(open(content, 'rb'))
+            yield CompressedMedia(content, mimetype, compression,
+                                  chunk_size)
+        return
+    if chunk_size is not None and not resumable:
+        resumable = isinstance(content, PathLike) \
+            or not isinstance(content, (str, bytes, bytearray, memoryview)) \
+            or len(content) > chunk_size
+    owned = None
+    if isinstance(content, str):
+        if resumable:
+            stream = BytesIO(content.encode())
+        else:
+            stream = StringIO(content)
+    elif isinstance(content, (bytes, bytearray, memoryview)):
+        stream = BufferReader(content)
+    elif isinstance(content, PathLike):
+        owned = stream = _map_file(content)
+    else:
+        stream = content
+    try:
+        if resumable:
+            yield MediaIoBaseUpload(stream, mimetype=mimetype,
+                                    chunksize=chunk_size, resumable=True)
+        else:
+            yield MediaIoBaseUpload(stream, mimetype=mimetype)
+    finally:
+        if owned is not None:
+            owned.close()
+
+
+def _map_file(path: PathLike) -> BinaryIO:
+    with open(path, 'rb') as f:
+        if fstat(f.fileno()).st_size == 0:
+            return BytesIO()
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return BufferReader(mapped, owner=mapped)
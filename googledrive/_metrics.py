@@ -0,0 +1,216 @@
+from typing import Any, Callable, Dict, List, Tuple
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+
+from googleapiclient.errors import HttpError
+
+
+class Metrics:
+    """Counters and latency histograms of API calls.
+
+    Each HTTP attempt is recorded, so a retried call counts once per
+    attempt. The hooks are called before and after every attempt.
+
+    Examples:
+        >>> metrics = Metrics()
+        >>> metrics.add_hooks(after=lambda method, request, elapsed, error:
+        ...                   print(method, elapsed, error))
+        >>> gdrive = Service(credentials).files(metrics=metrics)
+        >>> gdrive.read(('folderA',), 'filename')
+        >>> metrics.snapshot()['calls']
+        {'drive.files.list': 2, 'drive.files.get_media': 1}
+        >>> print(metrics.to_prometheus())
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+               1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    """The default upper bounds of the latency buckets in seconds."""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS,
+                 prefix: str = 'googledrive'):
+        """Init Metrics.
+
+        Args:
+            buckets: The upper bounds of the latency buckets in seconds.
+            prefix: The prefix of the Prometheus metric names.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._before: List[Callable[[str, Any], None]] = []
+        self._after: List[Callable[[str, Any, float, Exception], None]] = []
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all counters."""
+        with self._lock:
+            self._calls: Dict[str, int] = {}
+            self._latency: Dict[str, List[float]] = {}
+            self._latency_sum: Dict[str, float] = {}
+            self._errors: Dict[str, int] = {}
+            self._bytes_sent = 0
+            self._bytes_received = 0
+            self._retries = 0
+            self._retry_sleep = 0.0
+
+    def add_hooks(self, before: Callable[[str, Any], None] = None,
+                  after: Callable[[str, Any, float, Exception], None] = None
+                  ) -> None:
+        """Add request hooks for tracing.
+
+        Args:
+            before: A function called with the method name and the request
+                before an attempt.
+            after: A function called with the method name, the request,
+                the elapsed seconds and the raised exception or None
+                after an attempt.
+        """
+        with self._lock:
+            if before is not None:
+                self._before.append(before)
+            if after is not None:
+                self._after.append(after)
+
+    def call(self, method: str, function: Callable[[], Any],
+             request: Any = None) -> Any:
+        """Call a function as an attempt of an API call.
+
+        Args:
+            method: The method name such as ``drive.files.list``.
+            function: The function sending the request.
+            request: The request object passed to the hooks.
+        Returns:
+            The return value of the function.
+        """
+        for hook in self._before:
+            hook(method, request)
+        error = None
+        started = perf_counter()
+        try:
+            result = function()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = perf_counter() - started
+            self.record_call(method, elapsed, error)
+            for hook in self._after:
+                hook(method, request, elapsed, error)
+        return result
+
+    def record_call(self, method: str, elapsed: float,
+                    error: Exception = None) -> None:
+        """Record an attempt of an API call.
+
+        Args:
+            method: The method name.
+            elapsed: The elapsed seconds.
+            error: The raised exception, or None.
+        """
+        idx = bisect_left(self.buckets, elapsed)
+        with self._lock:
+            self._calls[method] = self._calls.get(method, 0) + 1
+            counts = self._latency.setdefault(
+                method, [0] * (len(self.buckets) + 1))
+            counts[idx] += 1
+            self._latency_sum[method] = \
+                self._latency_sum.get(method, 0.0) + elapsed
+            if error is not None:
+                code = error_code(error)
+                self._errors[code] = self._errors.get(code, 0) + 1
+
+    def record_bytes(self, sent: int = 0, received: int = 0) -> None:
+        """Record transferred bytes.
+
+        Args:
+            sent: The number of uploaded bytes.
+            received: The number of downloaded bytes.
+        """
+        with self._lock:
+            self._bytes_sent += sent
+            self._bytes_received += received
+
+    def record_retry(self, delay: float) -> None:
+        """Record a retry.
+
+        Args:
+            delay: The seconds to wait before the retry.
+        """
+        with self._lock:
+            self._retries += 1
+            self._retry_sleep += delay
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current values as a dict."""
+        with self._lock:
+            latency = {}
+            for method, counts in self._latency.items():
+                cumulative, buckets = 0, {}
+                for bound, count in zip(self.buckets + (float('inf'),),
+                                        counts):
+                    cumulative += count
+                    buckets[bound] = cumulative
+                latency[method] = {'buckets': buckets,
+                                   'sum': self._latency_sum[method],
+                                   'count': cumulative}
+            return {
+                'calls': dict(self._calls),
+                'errors': dict(self._errors),
+                'latency': latency,
+                'bytes_sent': self._bytes_sent,
+                'bytes_received': self._bytes_received,
+                'retries': self._retries,
+                'retry_sleep': self._retry_sleep,
+            }
+
+    def to_prometheus(self) -> str:
+        """Return the current values in the Prometheus text format."""
+        snapshot = self.snapshot()
+        p = self.prefix
+        lines = [f'# TYPE {p}_requests_total counter']
+        for method, count in sorted(snapshot['calls'].items()):
+            lines.append(f'{p}_requests_total{{method="{method}"}} {count}')
+        lines.append(f'# TYPE {p}_request_errors_total counter')
+        for code, count in sorted(snapshot['errors'].items()):
+            lines.append(
+                f'{p}_request_errors_total{{code="{code}"}} {count}')
+        lines.append(f'# TYPE {p}_request_duration_seconds histogram')
+        for method, hist in sorted(snapshot['latency'].items()):
+            for bound, count in hist['buckets'].items():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{p}_request_duration_seconds_bucket'
+                             f'{{method="{method}",le="{le}"}} {count}')
+            lines.append(f'{p}_request_duration_seconds_sum'
+                         f'{{method="{method}"}} {hist["sum"]}')
+            lines.append(f'{p}_request_duration_seconds_count'
+                         f'{{method="{method}"}} {hist["count"]}')
+        for name, key, kind in [
+                ('bytes_sent_total', 'bytes_sent', 'counter'),
+                ('bytes_received_total', 'bytes_received', 'counter'),
+                ('retries_total', 'retries', 'counter'),
+                ('retry_sleep_seconds_total', 'retry_sleep', 'counter')]:
+            lines.append(f'# TYPE {p}_{name} {kind}')
+            lines.append(f'{p}_{name} {snapshot[key]}')
+        return '\n'.join(lines) + '\n'
+
+
+def method_name(request: Any) -> str:
+    """Return the method name of a request.
+
+    Args:
+        request: The ``googleapiclient.http.HttpRequest`` object.
+    """
+    method_id = getattr(request, 'methodId', None)
+    return method_id if isinstance(method_id, str) else 'unknown'
+
+
+def error_code(error: Exception) -> str:
+    """Return the HTTP status or the exception class name of an error.
+
+    Args:
+        error: The raised exception.
+    """
+    if isinstance(error, HttpError):
+        return str(error.resp.status)
+    return type(error).__name__
@@ -0,0 +1,116 @@
+from typing import Any, Callable, Iterator, List, NamedTuple, Tuple
+from contextlib import contextmanager
+from threading import Lock
+from time import monotonic
+
+
+class PoolInfo(NamedTuple):
+    """Statistics of a connection pool."""
+
+    created: int
+    reused: int
+    idle: int
+    in_use: int
+
+
+class HttpPool:
+    """Pool of authorized ``httplib2.Http`` objects reused across threads.
+
+    An ``Http`` object keeps its connections alive,
+    so a reused object skips the TCP and TLS handshakes.
+    Each object is used by one thread at a time.
+    :py:func:`acquire` never blocks: it creates a new object
+    when no idle one is left, and at most ``max_size`` idle objects are kept.
+
+    Examples:
+        >>> service = Service(credentials, pool_size=16)
+        >>> with service.files() as gdrive:
+        ...   list(gdrive.read_many(items, max_workers=16))
+        >>> service.http_pool.info()
+        PoolInfo(created=16, reused=0, idle=16, in_use=0)
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_size: int = 10,
+                 max_idle: float = None):
+        """Init HttpPool.
+
+        Args:
+            factory: A function returning a new authorized
+                ``httplib2.Http`` object.
+            max_size: The maximum number of idle objects kept.
+            max_idle: The seconds an idle object is kept alive,
+                or None for no limit.
+        """
+        self.factory = factory
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.created = 0
+        self.reused = 0
+        self._idle: List[Tuple[Any, float]] = []
+        self._in_use = 0
+        self._closed = False
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Return the number of idle objects."""
+        return len(self._idle)
+
+    def acquire(self) -> Any:
+        """Take an idle ``Http`` object, or create a new one."""
+        expired = []
+        http = None
+        with self._lock:
+            if self._closed:
+                raise ValueError('pool is closed')
+            now = monotonic()
+            while self._idle:
+                candidate, released_at = self._idle.pop()
+                if self.max_idle is not None \
+                        and now - released_at > self.max_idle:
+                    expired.append(candidate)
+                else:
+                    http = candidate
+                    self.reused += 1
+                    break
+            else:
+                self.created += 1
+            self._in_use += 1
+        for candidate in expired:
+            candidate.close()
+        return http if http is not None else self.factory()
+
+    def release(self, http: Any) -> None:
+        """Return an ``Http`` object taken by :py:func:`acquire`.
+
+        Args:
+            http: The ``Http`` object.
+        """
+        with self._lock:
+            self._in_use -= 1
+            if not self._closed and len(self._idle) < self.max_size:
+                self._idle.append((http, monotonic()))
+                return
+        http.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Take an ``Http`` object for the duration of a with block."""
+        http = self.acquire()
+        try:
+            yield http
+        finally:
+            self.release(http)
+
+    def close(self) -> None:
+        """Close the idle objects and the objects released later."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for http, _ in idle:
+            http.close()
+
+    def info(self) -> PoolInfo:
+        """Return the statistics of the pool."""
+        with self._lock:
+            return PoolInfo(self.created, self.reused, len(self._idle),
+                            self._in_use)
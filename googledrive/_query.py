@@ -0,0 +1,65 @@
+from typing import List
+
+
+def list_query(parent_id: str, query: str) -> str:
+    """Return the query string for the files in a folder.
+
+    Args:
+        parent_id: The path ID string, or None.
+        query: A query string for filtering the file results, or None.
+    """
+    if parent_id:
+        if query:
+            return f"'{parent_id}' in parents and {query}"
+        else:
+            return f"'{parent_id}' in parents"
+    else:
+        return query or ''
+
+
+def escape(value: str) -> str:
+    """Return a string value escaped for a query string literal.
+
+    Args:
+        value: The string value.
+    """
+    return value.replace('\\', '\\\\').replace("'", "\\'")
+
+
+def name_query(parent_id: str, name: str) -> str:
+    """Return the query string for a named file in a folder.
+
+    Args:
+        parent_id: The path ID string.
+        name: The file name.
+    """
+    return f"'{parent_id}' in parents and name='{escape(name)}'"
+
+
+def path_query(names: List[str], folder_mimetype: str) -> str:
+    """Return the query string for the candidates of path names.
+
+    The files named as the last name and the folders named as
+    the other names are queried.
+
+    Args:
+        names: The list of path names.
+        folder_mimetype: The mime-type of folders.
+    """
+    folders = ' or '.join(f"name='{escape(name)}'"
+                          for name in sorted(set(names[:-1])))
+    return (f"(mimeType='{folder_mimetype}' and ({folders}))"
+            f" or name='{escape(names[-1])}'")
+
+
+def parents_query(parent_ids: List[str], query: str = None) -> str:
+    """Return the query string for the files in any of folders.
+
+    Args:
+        parent_ids: The list of path ID strings.
+        query: A query string for filtering the file results, or None.
+    """
+    q = ' or '.join(f"'{parent_id}' in parents" for parent_id in parent_ids)
+    if len(parent_ids) > 1:
+        q = f'({q})'
+    return f'{q} and {query}' if query else q
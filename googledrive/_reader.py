@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from io import RawIOBase, SEEK_SET, SEEK_CUR, SEEK_END
+
+
+class RangeReader(RawIOBase):
+    """Seekable binary reader of a file fetching byte ranges on demand.
+
+    The content is fetched in blocks by HTTP Range requests
+    and the recently read blocks are kept in an LRU cache.
+    A sequential read fetches the following blocks in the same request,
+    and a seek followed by a small read fetches a single block,
+    so a reader of columnar files such as pandas or pyarrow downloads
+    only the footer and the row groups it reads.
+
+    Examples:
+        >>> with gdrive.open_file_id(file_id) as f:
+        ...   table = pyarrow.parquet.read_table(f, columns=['a'])
+    """
+
+    def __init__(self, files, file_id: str, size: int,
+                 block_size: int = 1024 * 1024, max_blocks: int = 16,
+                 readahead: int = 4):
+        """Init RangeReader.
+
+        Args:
+            files: The :py:class:`Files` object fetching the ranges.
+            file_id: The file ID string.
+            size: The size of the file content in bytes.
+            block_size: The size of a fetched block in bytes.
+            max_blocks: The maximum number of cached blocks.
+            readahead: The number of blocks fetched ahead
+                by a sequential read.
+        """
+        self.files = files
+        self.file_id = file_id
+        self.size = size
+        """The size of the file content in bytes."""
+        self.block_size = block_size
+        self.max_blocks = max(1, max_blocks)
+        self.readahead = readahead
+        self.requests = 0
+        """The number of the range requests sent."""
+        self._blocks: 'OrderedDict[int, bytes]' = OrderedDict()
+        self._pos = 0
+        self._next_block = 0
+
+    def readable(self) -> bool:
+        """Return True."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return True."""
+        return True
+
+    def readinto(self, b) -> int:
+        """Read bytes into a pre-allocated writable bytes-like object."""
+        view = memoryview(b).cast('B')
+        n = min(len(view), self.size - self._pos)
+        if n <= 0:
+            return 0
+        last = (self._pos + n - 1) // self.block_size
+        offset = 0
+        while offset < n:
+            index, skip = divmod(self._pos + offset, self.block_size)
+            block = self._blocks.get(index, None)
+            if block is None:
+                block = self._fetch(index, last)
+            else:
+                self._blocks.move_to_end(index)
+            chunk = block[skip:skip + n - offset]
+            if not chunk:
+                break
+            view[offset:offset + len(chunk)] = chunk
+            offset += len(chunk)
+        self._pos += offset
+        self._next_block = last + 1
+        return offset
+
+    def readall(self) -> bytes:
+        """Read until the end of the file."""
+        buffer = bytearray(max(0, self.size - self._pos))
+        return bytes(buffer[:self.readinto(buffer)])
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        """Change the stream position."""
+        if whence == SEEK_SET:
+            pos = offset
+        elif whence == SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f'invalid whence ({whence})')
+        if pos < 0:
+            raise ValueError(f'negative seek position {pos}')
+        self._pos = pos
+        return self._pos
+
+    def tell(self) -> int:
+        """Return the stream position."""
+        return self._pos
+
+    def close(self) -> None:
+        """Release the cached blocks."""
+        self._blocks.clear()
+        super().close()
+
+    def _fetch(self, first: int, last: int) -> bytes:
+        end = first + 1
+        while end <= last and end not in self._blocks:
+            end += 1
+        if end > last and first in (self._next_block - 1, self._next_block):
+            end += self.readahead
+        end = min(end, first + self.max_blocks,
+                  -(-self.size // self.block_size))
+        data = self.files.read_range(self.file_id, first * self.block_size,
+                                     end * self.block_size)
+        self.requests += 1
+        for index in range(first, end):
+            start = (index - first) * self.block_size
+            self._blocks[index] = data[start:start + self.block_size]
+            self._blocks.move_to_end(index)
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return self._blocks.get(first, data[:self.block_size])
@@ -0,0 +1,190 @@
+from typing import Any, Callable, NamedTuple, Optional
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from threading import Lock
+from time import sleep, monotonic
+import json
+import random
+
+from googleapiclient.errors import HttpError
+
+
+class RetryInfo(NamedTuple):
+    """Statistics of a retry policy."""
+
+    retries: int
+    sleep_time: float
+
+
+class RetryPolicy:
+    """Retry policy with exponential backoff and full jitter.
+
+    Only transient errors are retried: timeouts, connection errors,
+    and HTTP errors with a retryable status or a rate-limit reason.
+    An HTTP error means the request was not applied, so it is retried
+    even for a non-idempotent request such as ``files.create``,
+    while a timeout or connection error may follow an applied request
+    and is retried only for an idempotent one.
+    The ``Retry-After`` header of a response overrides the backoff.
+
+    Examples:
+        >>> policy = RetryPolicy(max_retry=5, interval=0.5, deadline=60)
+        >>> gdrive = Service(credentials).files(retry_policy=policy)
+        >>> policy.info()
+        RetryInfo(retries=0, sleep_time=0.0)
+    """
+
+    RETRYABLE_STATUSES = frozenset([408, 429, 500, 502, 503, 504])
+    """HTTP statuses to be retried."""
+
+    RETRYABLE_REASONS = frozenset([
+        'rateLimitExceeded', 'userRateLimitExceeded',
+        'backendError', 'internalError'])
+    """Error reasons of Google APIs to be retried."""
+
+    def __init__(self, max_retry: int = 3, interval: float = 1,
+                 max_interval: float = 32, multiplier: float = 2,
+                 deadline: float = None, jitter: bool = True):
+        """Init RetryPolicy.
+
+        Args:
+            max_retry: The maximum number of retries for API calls.
+            interval: The base retry interval in seconds.
+            max_interval: The maximum retry interval in seconds.
+            multiplier: The growth factor of the interval per retry.
+            deadline: The maximum seconds spent on a call including retries,
+                or None for no limit.
+            jitter: Whether the interval is randomized between zero and
+                the backoff ("full jitter").
+        """
+        self.max_retry = max_retry
+        self.interval = interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.deadline = deadline
+        self.jitter = jitter
+        self.retries = 0
+        self.sleep_time = 0.0
+        self._lock = Lock()
+
+    def call(self, function: Callable[[], Any], idempotent: bool = True,
+             on_retry: Callable[[float], None] = None) -> Any:
+        """Call a function with retries.
+
+        Args:
+            function: The function to be called.
+            idempotent: Whether the call may be repeated safely.
+            on_retry: A function called with the delay before each retry.
+        Returns:
+            The return value of the function.
+        """
+        started = monotonic()
+        attempt = 0
+        while True:
+            try:
+                return function()
+            except Exception as e:
+                delay = self.backoff(attempt, e, started, idempotent)
+                if delay is None:
+                    raise
+                attempt += 1
+                if on_retry is not None:
+                    on_retry(delay)
+                sleep(delay)
+
+    def backoff(self, attempt: int, error: Exception, started: float,
+                idempotent: bool = True) -> Optional[float]:
+        """Decide whether to retry and how long to wait.
+
+        The retry is counted in the statistics.
+
+        Args:
+            attempt: The number of retries so far.
+            error: The raised exception.
+            started: The ``time.monotonic`` value when the call started.
+            idempotent: Whether the call may be repeated safely.
+        Returns:
+            The seconds to wait before the retry, or None not to retry.
+        """
+        if attempt >= self.max_retry \
+                or not self.is_retryable(error, idempotent):
+            return None
+        delay = self.delay(attempt, error)
+        if self.deadline is not None \
+                and monotonic() - started + delay > self.deadline:
+            return None
+        with self._lock:
+            self.retries += 1
+            self.sleep_time += delay
+        return delay
+
+    def is_retryable(self, error: Exception,
+                     idempotent: bool = True) -> bool:
+        """Return whether an error is transient.
+
+        Args:
+            error: The raised exception.
+            idempotent: Whether the call may be repeated safely.
+                Otherwise, timeouts and connection errors are not retried.
+        """
+        if isinstance(error, HttpError):
+            return error.resp.status in self.RETRYABLE_STATUSES \
+                or bool(_reasons(error) & self.RETRYABLE_REASONS)
+        return idempotent \
+            and isinstance(error, (TimeoutError, ConnectionError))
+
+    def delay(self, attempt: int, error: Exception = None) -> float:
+        """Return the seconds to wait before a retry.
+
+        Args:
+            attempt: The number of retries so far.
+            error: The raised exception.
+        """
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return retry_after
+        backoff = min(self.max_interval,
+                      self.interval * self.multiplier ** attempt)
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+    def info(self) -> RetryInfo:
+        """Return the statistics of the retries."""
+        with self._lock:
+            return RetryInfo(self.retries, self.sleep_time)
+
+    def reset(self) -> None:
+        """Reset the statistics."""
+        with self._lock:
+            self.retries = 0
+            self.sleep_time = 0.0
+
+
+def _reasons(error: HttpError) -> set:
+    try:
+        content = error.content
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+        errors = json.loads(content)['error'].get('errors', [])
+        return {e.get('reason') for e in errors}
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return set()
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    if not isinstance(error, HttpError):
+        return None
+    value = error.resp.get('retry-after') \
+        if hasattr(error.resp, 'get') else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
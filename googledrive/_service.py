@@ -1,6 +1,38 @@
-from ._files import Files
+from typing import Any, Callable, TYPE_CHECKING
+from threading import Lock
 
-from googleapiclient.discovery import build
+if TYPE_CHECKING:
+    from ._files import Files
+    from ._cache import IdCache, ContentCache
+    from ._async import AsyncFiles
+    from ._retry import RetryPolicy
+    from ._index import MetadataIndex
+    from ._metrics import Metrics
+
+from ._pool import HttpPool
+
+
+def build(*args, **kwargs):
+    """Call ``googleapiclient.discovery.build`` importing it on demand."""
+    from googleapiclient import discovery
+    return discovery.build(*args, **kwargs)
+
+
+def authorized_http(credentials, http=None):
+    """Return an authorized ``httplib2.Http`` object.
+
+    Args:
+        credentials: The google-auth or oauth2client credentials.
+        http: The ``httplib2.Http`` object to be authorized,
+            or None for a new one of ``googleapiclient.http.build_http``.
+    """
+    if http is None:
+        from googleapiclient.http import build_http
+        http = build_http()
+    if hasattr(credentials, 'authorize'):
+        return credentials.authorize(http)
+    from google_auth_httplib2 import AuthorizedHttp
+    return AuthorizedHttp(credentials, http=http)
 
 
 class Service:
@@ -9,23 +41,115 @@ class Service:
     SCOPE = 'https://www.googleapis.com/auth/drive'
     """OAuth scope string for Google Drive API."""
 
-    def __init__(self, credentials, *args):
+    def __init__(self, credentials, *args, pool_size: int = None,
+                 pool_max_idle: float = None,
+                 http_factory: Callable[[], Any] = None, **kwargs):
         """Init Service.
 
+        The API client is built on the first call of :py:func:`files` or
+        :py:func:`async_files`, so the import of googleapiclient is
+        deferred to it rather than saved.
+
         Args:
             credentials (oauth2client.Credentials or
                 google.auth.credentials.Credentials):
                 The credentials to be used for authentication.
             *args: Optional arguments to ``googleapiclient.discovery.build``.
+            pool_size: The number of idle HTTP transports kept in
+                :py:attr:`http_pool` and shared by the files objects
+                and their worker threads, or None not to pool them.
+            pool_max_idle: The seconds an idle pooled transport is kept
+                alive, or None for no limit.
+            http_factory: A function returning a new unauthorized
+                ``httplib2.Http`` object with the transport options
+                such as a proxy and a timeout, or None for the defaults.
+                The API client and every worker thread use its objects.
+            **kwargs: Optional keyword arguments to
+                ``googleapiclient.discovery.build``.
         """
-        self._drive = build('drive', 'v3', credentials=credentials, *args)
+        self._credentials = credentials
+        self._http_factory = http_factory
+        self.http_pool = None
+        """The :py:class:`HttpPool` owned by the service, or None."""
+        if pool_size is not None:
+            self.http_pool = HttpPool(self.new_http, pool_size,
+                                      pool_max_idle)
+        self._args = args
+        self._kwargs = kwargs
+        self._resource = None
+        self._lock = Lock()
+
+    @property
+    def _drive(self):
+        if self._resource is None:
+            with self._lock:
+                if self._resource is None:
+                    kwargs = dict(self._kwargs)
+                    if self._http_factory is None:
+                        kwargs['credentials'] = self._credentials
+                    else:
+                        kwargs['http'] = self.new_http()
+                    self._resource = build('drive', 'v3', *self._args,
+                                           **kwargs)
+        return self._resource
+
+    def new_http(self):
+        """Return a new authorized ``httplib2.Http`` object.
 
-    def files(self, max_retry: int = 3, retry_interval: float = 1):
+        The objects are not thread-safe.
+        Use a distinct one for each thread.
+        """
+        if self._http_factory is None:
+            return authorized_http(self._credentials)
+        return authorized_http(self._credentials, self._http_factory())
+
+    def close(self) -> None:
+        """Close the pooled HTTP transports."""
+        if self.http_pool is not None:
+            self.http_pool.close()
+
+    def files(self, max_retry: int = 3, retry_interval: float = 1,
+              id_cache: 'IdCache' = None, retry_policy: 'RetryPolicy' = None,
+              metadata_index: 'MetadataIndex' = None,
+              content_cache: 'ContentCache' = None,
+              metrics: 'Metrics' = None) -> 'Files':
         """Return a :py:class:`Files` object, \
             a simple wrapper for files resource of Google Drive API.
 
         Args:
             max_retry: The maximum number of retries for API calls.
-            retry_interval: The retry interval in seconds.
+            retry_interval: The base retry interval in seconds.
+            id_cache: The :py:class:`IdCache` shared by the files object,
+                or None to disable caching.
+            retry_policy: The :py:class:`RetryPolicy` overriding
+                ``max_retry`` and ``retry_interval``.
+            metadata_index: The :py:class:`MetadataIndex` answering
+                metadata queries, or None to always call the API.
+            content_cache: The :py:class:`ContentCache` of file contents,
+                or None to always download them.
+            metrics: The :py:class:`Metrics` recording API calls, or None.
+        """
+        from ._files import Files
+        return Files(self._drive, max_retry, retry_interval, id_cache,
+                     self.new_http, retry_policy, metadata_index,
+                     content_cache, metrics, self.http_pool)
+
+    def async_files(self, max_retry: int = 3, retry_interval: float = 1,
+                    id_cache: 'IdCache' = None, max_concurrency: int = 10,
+                    retry_policy: 'RetryPolicy' = None) -> 'AsyncFiles':
+        """Return an :py:class:`AsyncFiles` object, \
+            an asyncio wrapper for files resource of Google Drive API.
+
+        Args:
+            max_retry: The maximum number of retries for API calls.
+            retry_interval: The base retry interval in seconds.
+            id_cache: The :py:class:`IdCache` shared by the files object,
+                or None to disable caching.
+            max_concurrency: The maximum number of concurrent API calls.
+            retry_policy: The :py:class:`RetryPolicy` overriding
+                ``max_retry`` and ``retry_interval``.
         """
-        return Files(self._drive, max_retry, retry_interval)
+        from ._async import AsyncFiles
+        return AsyncFiles(self._drive, max_retry, retry_interval, id_cache,
+                          self.new_http, max_concurrency, retry_policy,
+                          self.http_pool)
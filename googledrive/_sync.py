@@ -0,0 +1,143 @@
+from typing import Dict, Any, Iterator, Tuple
+from pathlib import Path
+import hashlib
+import mimetypes
+import os
+
+from ._transfer import TransferResult
+from ._walk import FOLDER_MIMETYPE
+
+SYNC_FIELDS = 'md5Checksum,size,modifiedTime'
+"""The file fields compared in a synchronization."""
+
+
+def file_md5(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Return the MD5 hex digest of a local file in a streaming pass.
+
+    Args:
+        path: The path of the local file.
+        chunk_size: The read size in bytes.
+    """
+    md5 = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def is_same(path: Path, remote: Dict[str, Any]) -> bool:
+    """Return whether a local file has the same content as a remote file.
+
+    The size is compared before the checksum to avoid hashing.
+
+    Args:
+        path: The path of the local file.
+        remote: The remote file metadata with ``size`` and ``md5Checksum``.
+    """
+    if 'size' in remote and int(remote['size']) != path.stat().st_size:
+        return False
+    return remote.get('md5Checksum', None) == file_md5(path)
+
+
+def remote_tree(files, top_id: str, max_workers: int
+                ) -> Tuple[Dict[Tuple[str, ...], str],
+                           Dict[Tuple[str, ...], Dict[str, Any]]]:
+    """List a remote folder tree once.
+
+    Args:
+        files: The :py:class:`Files` object.
+        top_id: The ID string of the top folder.
+        max_workers: The number of worker threads.
+    Returns:
+        The folder IDs and the file metadata keyed by relative name tuples.
+    """
+    folders = {(): top_id}
+    nonfolders = {}
+    for entry in files.walk(top_id, max_workers=max_workers,
+                            fields=SYNC_FIELDS):
+        for folder in entry.folders:
+            folders.setdefault(tuple(entry.path) + (folder['name'],),
+                               folder['id'])
+        for file in entry.files:
+            nonfolders.setdefault(tuple(entry.path) + (file['name'],), file)
+    return folders, nonfolders
+
+
+def sync_up(files, local_dir: str, top_id: str,
+            max_workers: int) -> Iterator[TransferResult]:
+    """Upload the local files differing from a remote folder tree.
+
+    Args:
+        files: The :py:class:`Files` object.
+        local_dir: The local directory.
+        top_id: The ID string of the remote top folder.
+        max_workers: The number of worker threads.
+    Yields:
+        Results of the uploads in completion order.
+        The item is the relative POSIX path and the result is the file ID.
+    """
+    root = Path(local_dir)
+    folders, remote = remote_tree(files, top_id, max_workers)
+    tasks = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        key = Path(dirpath).relative_to(root).parts
+        if key not in folders:
+            folders[key] = files.create_folder(folders[key[:-1]], key[-1])
+        for filename in sorted(filenames):
+            tasks.append((key + (filename,), folders[key]))
+
+    def upload(task):
+        key, parent_id = task
+        path = root.joinpath(*key)
+        existing = remote.get(key, None)
+        if existing is not None and is_same(path, existing):
+            return None
+        mimetype = mimetypes.guess_type(path.name)[0] \
+            or 'application/octet-stream'
+        if existing is not None:
+            files.update_file_id(existing['id'], path, mimetype)
+            return existing['id']
+        return files.create_file(parent_id, key[-1], path, mimetype)
+    for result in files._run_parallel(upload, tasks, max_workers):
+        if result.error is not None or result.result is not None:
+            yield TransferResult('/'.join(result.item[0]),
+                                 result.result, result.error)
+
+
+def sync_down(files, top_id: str, local_dir: str,
+              max_workers: int) -> Iterator[TransferResult]:
+    """Download the remote files differing from a local directory.
+
+    Google Workspace documents without checksums are skipped.
+
+    Args:
+        files: The :py:class:`Files` object.
+        top_id: The ID string of the remote top folder.
+        local_dir: The local directory.
+        max_workers: The number of worker threads.
+    Yields:
+        Results of the downloads in completion order.
+        The item is the relative POSIX path and the result is the local path.
+    """
+    root = Path(local_dir)
+    folders, remote = remote_tree(files, top_id, max_workers)
+    for key in sorted(folders):
+        root.joinpath(*key).mkdir(parents=True, exist_ok=True)
+    tasks = [(key, file) for key, file in sorted(remote.items())
+             if 'md5Checksum' in file
+             and file.get('mimeType') != FOLDER_MIMETYPE]
+
+    def download(task):
+        key, file = task
+        path = root.joinpath(*key)
+        if path.is_file() and is_same(path, file):
+            return None
+        partial = path.with_name(path.name + '.part')
+        files.download_file_id(file['id'], partial)
+        os.replace(partial, path)
+        return path
+    for result in files._run_parallel(download, tasks, max_workers):
+        if result.error is not None or result.result is not None:
+            yield TransferResult('/'.join(result.item[0]),
+                                 result.result, result.error)
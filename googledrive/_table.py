@@ -0,0 +1,247 @@
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, TextIO
+from typing import Tuple, Union
+from array import array
+from collections import namedtuple
+import csv
+import json
+
+
+def field_names(fields: str) -> List[str]:
+    """Return the top-level names of a comma-separated list of fields.
+
+    Args:
+        fields: The fields such as ``id,name,owners(emailAddress)``.
+    """
+    names = []
+    depth = 0
+    start = 0
+    for i, c in enumerate(fields + ','):
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == ',' and depth == 0:
+            name = fields[start:i].split('(')[0].split('/')[0].strip()
+            if name and name not in names:
+                names.append(name)
+            start = i + 1
+    return names
+
+
+class _Column:
+    """Column of values interned in a table shared by its slices."""
+
+    __slots__ = ('indices', 'values', 'lookup')
+
+    def __init__(self, values: List[Any] = None,
+                 lookup: Dict[Any, int] = None):
+        self.indices = array('i')
+        self.values = values if values is not None else [None]
+        self.lookup = lookup if lookup is not None else {None: 0}
+
+    def append(self, value: Any) -> None:
+        if isinstance(value, list):
+            value = tuple(value)
+        try:
+            index = self.lookup.get(value, None)
+        except TypeError:
+            index = None
+            hashable = False
+        else:
+            hashable = True
+        if index is None:
+            index = len(self.values)
+            self.values.append(value)
+            if hashable:
+                self.lookup[value] = index
+        self.indices.append(index)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.values[self.indices[row]]
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def slice(self, rows: slice) -> '_Column':
+        column = _Column(self.values, self.lookup)
+        column.indices = self.indices[rows]
+        return column
+
+
+class _UniqueColumn:
+    """Column of values not worth interning, such as file IDs."""
+
+    __slots__ = ('values',)
+
+    def __init__(self):
+        self.values: List[Any] = []
+
+    def append(self, value: Any) -> None:
+        self.values.append(tuple(value) if isinstance(value, list)
+                           else value)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.values[row]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def slice(self, rows: slice) -> '_UniqueColumn':
+        column = _UniqueColumn()
+        column.values = self.values[rows]
+        return column
+
+
+class FileTable:
+    """Columnar listing of files.
+
+    Each field is a column of indices into a table of its distinct values,
+    so repeated values such as mime-types, parents and owners are stored
+    once, and no dictionary is kept per file.
+    The columns of :py:attr:`UNIQUE_FIELDS` keep the values in a list.
+    The files are read as named tuples of the fields, and lists
+    such as ``parents`` as tuples.
+
+    Examples:
+        >>> table = gdrive.list_table(('dataset',), fields='id,name,size')
+        >>> len(table), table[0].name, table.column('size')[:3]
+        >>> with open('inventory.csv', 'w', newline='') as f:
+        ...   table.to_csv(f)
+    """
+
+    UNIQUE_FIELDS = ('id',)
+    """The fields stored without interning."""
+
+    def __init__(self, fields: Union[str, Sequence[str]],
+                 files: Iterable[Dict[str, Any]] = ()):
+        """Init FileTable.
+
+        Args:
+            fields: The field names, or a comma-separated list of fields.
+            files: The file metadata to be appended.
+        """
+        if isinstance(fields, str):
+            fields = field_names(fields)
+        self.fields: Tuple[str, ...] = tuple(fields)
+        """The field names of the columns."""
+        self.Record = namedtuple('FileRecord', self.fields, rename=True)
+        """The named tuple class of the files."""
+        self._columns = [_UniqueColumn() if name in self.UNIQUE_FIELDS
+                         else _Column() for name in self.fields]
+        self.extend(files)
+
+    def __len__(self) -> int:
+        """Return the number of files."""
+        return len(self._columns[0]) if self._columns else 0
+
+    def __iter__(self) -> Iterator[tuple]:
+        """Iterate the files as named tuples."""
+        for row in range(len(self)):
+            yield self._record(row)
+
+    def __getitem__(self, key: Union[int, slice]):
+        """Return a file as a named tuple, or a slice as a table.
+
+        A sliced table shares the value tables of the columns.
+        """
+        if isinstance(key, slice):
+            table = FileTable.__new__(FileTable)
+            table.fields = self.fields
+            table.Record = self.Record
+            table._columns = [column.slice(key) for column in self._columns]
+            return table
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('file table index out of range')
+        return self._record(key)
+
+    def append(self, file: Dict[str, Any]) -> None:
+        """Append a file.
+
+        Args:
+            file: The file metadata. The other fields are dropped.
+        """
+        for name, column in zip(self.fields, self._columns):
+            column.append(file.get(name, None))
+
+    def extend(self, files: Iterable[Dict[str, Any]]) -> None:
+        """Append files.
+
+        Args:
+            files: The file metadata.
+        """
+        for file in files:
+            self.append(file)
+
+    def column(self, name: str) -> List[Any]:
+        """Return the values of a field.
+
+        Args:
+            name: The field name.
+        """
+        column = self._columns[self.fields.index(name)]
+        if isinstance(column, _UniqueColumn):
+            return list(column.values)
+        values = column.values
+        return [values[i] for i in column.indices]
+
+    def to_csv(self, fileobj: TextIO, header: bool = True) -> None:
+        """Write the files as CSV.
+
+        Lists are joined with commas and objects are written as JSON.
+
+        Args:
+            fileobj: The writable text file object.
+            header: Whether to write the field names first.
+        """
+        writer = csv.writer(fileobj)
+        if header:
+            writer.writerow(self.fields)
+        for row in range(len(self)):
+            writer.writerow([_csv_value(column[row])
+                             for column in self._columns])
+
+    def to_arrow(self):
+        """Return the files as a ``pyarrow.Table``.
+
+        The interned columns of strings become dictionary arrays
+        sharing the value tables.
+
+        Raises:
+            ImportError: pyarrow is not installed.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError('to_arrow requires the pyarrow package') from e
+        arrays = []
+        for column in self._columns:
+            if isinstance(column, _Column) and all(
+                    isinstance(v, str) for v in column.values[1:]):
+                indices = pa.array(
+                    [i or None for i in column.indices], pa.int32())
+                dictionary = pa.array(column.values, pa.string())
+                arrays.append(
+                    pa.DictionaryArray.from_arrays(indices, dictionary))
+            else:
+                arrays.append(pa.array(
+                    [None if v is None
+                     else list(v) if isinstance(v, tuple) else v
+                     for v in (column[row] for row in range(len(column)))]))
+        return pa.Table.from_arrays(arrays, names=list(self.fields))
+
+    def _record(self, row: int) -> tuple:
+        return self.Record._make(column[row] for column in self._columns)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, tuple):
+        if all(isinstance(v, str) for v in value):
+            return ','.join(value)
+        return json.dumps(list(value))
+    if isinstance(value, (dict, list, bool)):
+        return json.dumps(value)
+    return value
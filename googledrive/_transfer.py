@@ -0,0 +1,97 @@
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+
+class TransferResult(NamedTuple):
+    """Result of an item processed in parallel."""
+
+    item: Any
+    """The input item."""
+    result: Any
+    """The return value, or None if it failed."""
+    error: Exception
+    """The raised exception, or None if it succeeded."""
+
+
+def run_parallel(function: Callable[[Any], Any], items: Iterable[Any],
+                 max_workers: int,
+                 initializer: Callable[[], Any] = None,
+                 finalizer: Callable[[], Any] = None
+                 ) -> Iterator[TransferResult]:
+    """Run a function on a thread pool and yield in completion order.
+
+    At most twice ``max_workers`` items are in flight,
+    so ``items`` may be a lazy iterable.
+
+    Args:
+        function: The function called with each item.
+        items: The items.
+        max_workers: The number of worker threads.
+        initializer: A function called in each worker thread at its start.
+        finalizer: A function called after all workers finished.
+    Yields:
+        Results.
+    """
+    executor = ThreadPoolExecutor(max_workers, initializer=initializer)
+    try:
+        iterator = iter(items)
+        inflight = {}
+        while True:
+            for item in iterator:
+                inflight[executor.submit(function, item)] = item
+                if len(inflight) >= max_workers * 2:
+                    break
+            if not inflight:
+                break
+            done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = inflight.pop(future)
+                error = future.exception()
+                if error is None:
+                    yield TransferResult(item, future.result(), None)
+                else:
+                    yield TransferResult(item, None, error)
+    finally:
+        executor.shutdown(wait=True)
+        if finalizer:
+            finalizer()
+
+
+def run_serial(function: Callable[[Any], Any],
+               items: Iterable[Any]) -> Iterator[TransferResult]:
+    """Run a function in the consuming thread and yield in order.
+
+    Each item is processed when the next result is requested,
+    so the caller's transport is never used by two threads.
+
+    Args:
+        function: The function called with each item.
+        items: The items.
+    Yields:
+        Results.
+    """
+    for item in items:
+        try:
+            result = function(item)
+        except Exception as e:
+            yield TransferResult(item, None, e)
+        else:
+            yield TransferResult(item, result, None)
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split items into lists of up to a size.
+
+    Args:
+        items: The items.
+        size: The maximum number of items in a list.
+    Yields:
+        Lists of the items.
+    """
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            break
+        yield chunk
@@ -0,0 +1,87 @@
+from typing import Any, Callable, Optional
+
+from googleapiclient.errors import HttpError
+
+
+class UploadSession:
+    """Handle of a resumable upload session.
+
+    The session URI is set when the upload starts.
+    Persist it to continue an interrupted upload from the last byte offset
+    confirmed by the server, even after a process restart.
+
+    Examples:
+        >>> session = UploadSession(
+        ...   callback=lambda s: open('upload.uri', 'w').write(s.uri))
+        >>> gdrive.update_file_id(file_id, content, 'text/csv',
+        ...                       chunk_size=8 * 1024 * 1024, session=session)
+
+        After a restart:
+
+        >>> session = UploadSession(open('upload.uri').read())
+        >>> gdrive.update_file_id(file_id, content, 'text/csv',
+        ...                       chunk_size=8 * 1024 * 1024, session=session)
+    """
+
+    def __init__(self, uri: str = None,
+                 callback: Callable[['UploadSession'], None] = None):
+        """Init UploadSession.
+
+        Args:
+            uri: The session URI of an interrupted upload, or None.
+            callback: A function called with the session after each chunk.
+        """
+        self.uri = uri
+        self.callback = callback
+        self.progress = 0
+        """The number of bytes confirmed by the server."""
+        self.total_size: Optional[int] = None
+        """The total number of bytes, or None if unknown."""
+        self.done = False
+        """Whether the upload is completed."""
+
+    def __repr__(self) -> str:
+        """Return the representation."""
+        return (f'UploadSession(uri={self.uri!r}, progress={self.progress}, '
+                f'total_size={self.total_size}, done={self.done})')
+
+    def _resume(self, request, http) -> Optional[Any]:
+        """Query the byte offset confirmed by the server for the session.
+
+        Returns:
+            The response body if the upload is already completed,
+            or None to continue from ``request.resumable_progress``.
+        """
+        request.resumable_uri = self.uri
+        size = request.resumable.size()
+        headers = {'Content-Range': f'bytes */{"*" if size is None else size}',
+                   'content-length': '0'}
+        resp, content = http.request(self.uri, 'PUT', headers=headers)
+        if resp.status in (200, 201):
+            self._update(request, None)
+            return request.postproc(resp, content)
+        if resp.status != 308:
+            raise HttpError(resp, content, uri=self.uri)
+        confirmed = resp.get('range', None)
+        request.resumable_progress = \
+            int(confirmed.rsplit('-', 1)[1]) + 1 if confirmed else 0
+        self.progress = request.resumable_progress
+        self.total_size = size
+        return None
+
+    def _update(self, request, status) -> None:
+        self.uri = request.resumable_uri
+        if status is None:
+            size = request.resumable.size()
+            if size is None:
+                # The size of a streamed media is known by the last chunk.
+                media = request.resumable
+                size = request.resumable_progress + len(media.getbytes(
+                    request.resumable_progress, media.chunksize()))
+            self.progress = self.total_size = size
+            self.done = True
+        else:
+            self.progress = status.resumable_progress
+            self.total_size = status.total_size
+        if self.callback:
+            self.callback(self)
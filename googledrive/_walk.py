@@ -0,0 +1,70 @@
+from typing import List, Dict, Any, Iterator, NamedTuple
+
+from ._query import parents_query
+
+FOLDER_MIMETYPE = 'application/vnd.google-apps.folder'
+
+
+class WalkEntry(NamedTuple):
+    """Folder yielded by :py:func:`Files.walk`."""
+
+    path: List[str]
+    """The list of path names from the top folder."""
+    id: str
+    """The ID string of the folder."""
+    folders: List[Dict[str, Any]]
+    """The subfolders."""
+    files: List[Dict[str, Any]]
+    """The non-folder files."""
+
+
+def walk(files, top_id: str, max_depth: int, max_workers: int,
+         group_size: int, fields: str) -> Iterator[WalkEntry]:
+    """Walk a folder tree breadth-first.
+
+    The children of up to ``group_size`` sibling folders are listed
+    in a single query, and the queries of a depth level run in parallel.
+
+    Args:
+        files: The :py:class:`Files` object.
+        top_id: The ID string of the top folder.
+        max_depth: The maximum depth to be listed, or None for no limit.
+        max_workers: The number of worker threads.
+        group_size: The maximum number of folders listed in a query.
+        fields: The comma-separated list of additional file fields.
+    Yields:
+        Folders.
+    """
+    file_fields = 'id,name,mimeType,parents'
+    if fields:
+        file_fields += ',' + fields
+    file_fields = f'files({file_fields})'
+
+    def list_group(group):
+        children = {folder_id: ([], []) for _, folder_id in group}
+        query = parents_query([folder_id for _, folder_id in group],
+                              'trashed = false')
+        for file in files.each_files(None, query, file_fields,
+                                     files.MAX_PAGE_SIZE):
+            is_folder = file.get('mimeType') == FOLDER_MIMETYPE
+            for parent_id in file.get('parents', []):
+                if parent_id in children:
+                    children[parent_id][0 if is_folder else 1].append(file)
+        return children
+
+    level = [([], top_id)]
+    depth = 0
+    while level:
+        groups = [level[start:start + group_size]
+                  for start in range(0, len(level), group_size)]
+        level = []
+        for result in files._run_parallel(list_group, groups, max_workers):
+            if result.error is not None:
+                raise result.error
+            for path, folder_id in result.item:
+                folders, nonfolders = result.result[folder_id]
+                yield WalkEntry(path, folder_id, folders, nonfolders)
+                if max_depth is None or depth < max_depth:
+                    level.extend((path + [folder['name']], folder['id'])
+                                 for folder in folders)
+        depth += 1
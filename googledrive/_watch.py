@@ -0,0 +1,262 @@
+from typing import Any, Callable, Dict, List, Optional, Set
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Condition, Lock, Thread
+from time import time
+from uuid import uuid4
+
+Callback = Callable[[List[Dict[str, Any]]], None]
+
+
+class ChangeWatcher:
+    """Receiver of push notifications of the changes feed.
+
+    A ``changes.watch`` channel posts a notification to an embedded
+    HTTP receiver when files change.
+    A background thread then lists the new changes once for the
+    notifications received meanwhile, passes them to the callbacks,
+    and renews the channel before it expires.
+    The thread calls the API with its own HTTP transport, so the files
+    object needs ``http_factory`` or ``http_pool``.
+    The receiver should be behind an HTTPS endpoint reachable by
+    Google Drive, which is given as ``address``.
+
+    Examples:
+        >>> gdrive = Service(credentials).files(id_cache=IdCache())
+        >>> with gdrive.watch('https://example.com/drive', '0.0.0.0',
+        ...                   8080) as watcher:
+        ...   watcher.add_callback(lambda changes: print(len(changes)))
+        ...   serve_forever()
+    """
+
+    RETRY_INTERVAL = 60.0
+    """The seconds before a failed renewal is retried."""
+
+    POLL_RETRY_INTERVAL = 5.0
+    """The seconds before a failed poll is retried."""
+
+    def __init__(self, files, address: str = None, host: str = '127.0.0.1',
+                 port: int = 0, token: str = None, ttl: float = 3600,
+                 renew_before: float = 300):
+        """Init ChangeWatcher.
+
+        Args:
+            files: The :py:class:`Files` object calling the API.
+            address: The public HTTPS URL forwarded to the receiver,
+                or None for the URL of the receiver itself.
+            host: The host name the receiver binds.
+            port: The port the receiver binds, or 0 for a free port.
+            token: The secret string verified in each notification,
+                or None for a random one.
+            ttl: The lifetime of a channel in seconds.
+            renew_before: The seconds before the expiration
+                a channel is renewed at.
+        """
+        self.files = files
+        self.address = address
+        self.host = host
+        self.port = port
+        self.token = token or uuid4().hex
+        self.ttl = ttl
+        self.renew_before = renew_before
+        self.channel: Optional[Dict[str, Any]] = None
+        """The current channel resource, or None unless started."""
+        self.page_token: Optional[str] = None
+        """The page token of the changes not yet applied."""
+        self.notifications = 0
+        """The number of the accepted notifications."""
+        self.last_error: Optional[Exception] = None
+        """The last error in the background thread, or None."""
+        self._callbacks: List[Callback] = []
+        self._channel_ids: Set[str] = set()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[Thread] = None
+        self._cond = Condition()
+        self._poll_lock = Lock()
+        self._pending = False
+        self._closed = False
+        self._renew_at = 0.0
+        self._poll_at = 0.0
+
+    def __enter__(self):
+        """Start watching."""
+        return self.start()
+
+    def __exit__(self, *_):
+        """Stop watching."""
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """The URL of the embedded receiver."""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def add_callback(self, callback: Callback) -> None:
+        """Register a function called with each list of new changes.
+
+        Args:
+            callback: The function taking the change resources.
+        """
+        self._callbacks.append(callback)
+
+    def start(self) -> 'ChangeWatcher':
+        """Start the receiver and open a channel.
+
+        Raises:
+            ValueError: The files object has neither ``http_factory``
+                nor ``http_pool``.
+        """
+        if not self.files._concurrent:
+            raise ValueError('ChangeWatcher requires http_factory or '
+                             'http_pool')
+        watcher = self
+
+        class Handler(_Handler):
+            pass
+        Handler.watcher = watcher
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        Thread(target=self._server.serve_forever, daemon=True).start()
+        try:
+            self.page_token = self.files.start_page_token()
+            self._open()
+        except Exception:
+            self._server.shutdown()
+            self._server.server_close()
+            raise
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the channel and the receiver."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            if self.channel is not None:
+                self.files.stop_channel(self.channel)
+        finally:
+            if self._server is not None:
+                self._server.shutdown()
+                self._server.server_close()
+
+    def poll(self) -> int:
+        """Apply the changes after :py:attr:`page_token` to the callbacks.
+
+        Returns:
+            The number of the applied changes.
+        """
+        count = 0
+        with self._poll_lock:
+            for changes, page_token in self.files.each_changes(
+                    self.page_token):
+                if changes:
+                    for callback in self._callbacks:
+                        callback(changes)
+                count += len(changes)
+                self.page_token = page_token
+        return count
+
+    def renew(self) -> None:
+        """Open a new channel and stop the current one."""
+        previous = self.channel
+        self._open()
+        if previous is not None:
+            self._channel_ids.discard(previous['id'])
+            self.files.stop_channel(previous)
+
+    def notify(self, channel_id: str, token: str, state: str) -> bool:
+        """Accept a notification.
+
+        Args:
+            channel_id: The ``X-Goog-Channel-ID`` header.
+            token: The ``X-Goog-Channel-Token`` header.
+            state: The ``X-Goog-Resource-State`` header.
+        Returns:
+            Whether the notification is of an open channel.
+        """
+        if channel_id not in self._channel_ids or token != self.token:
+            return False
+        if state != 'sync':
+            with self._cond:
+                self.notifications += 1
+                self._pending = True
+                self._cond.notify()
+        return True
+
+    def _open(self) -> None:
+        channel = self.files.watch_changes(
+            self.page_token, self.address or self.url, uuid4().hex,
+            self.token, time() + self.ttl)
+        self._channel_ids.add(channel['id'])
+        self.channel = channel
+        expiration = channel.get('expiration', None)
+        expires_at = int(expiration) / 1000 if expiration \
+            else time() + self.ttl
+        self._renew_at = expires_at - self.renew_before
+
+    def _run(self) -> None:
+        initializer, finalizer = self.files._worker_hooks()
+        try:
+            initializer()
+        except Exception as e:
+            self.last_error = e
+            finalizer()
+            return
+        try:
+            self._loop()
+        finally:
+            finalizer()
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        return
+                    wake_at = self._renew_at
+                    if self._pending:
+                        wake_at = min(wake_at, self._poll_at)
+                    if time() >= wake_at:
+                        break
+                    self._cond.wait(wake_at - time())
+                pending = self._pending and time() >= self._poll_at
+                if pending:
+                    self._pending = False
+            if pending:
+                try:
+                    self.poll()
+                except Exception as e:
+                    # The changes stay unapplied until a poll succeeds.
+                    self.last_error = e
+                    with self._cond:
+                        self._pending = True
+                        self._poll_at = time() + self.POLL_RETRY_INTERVAL
+            if time() >= self._renew_at:
+                try:
+                    self.renew()
+                except Exception as e:
+                    self.last_error = e
+                    self._renew_at = time() + self.RETRY_INTERVAL
+
+
+class _Handler(BaseHTTPRequestHandler):
+    watcher: ChangeWatcher = None
+
+    def log_message(self, *_):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get('content-length') or 0)
+        if length:
+            self.rfile.read(length)
+        accepted = self.watcher.notify(
+            self.headers.get('x-goog-channel-id', ''),
+            self.headers.get('x-goog-channel-token', ''),
+            self.headers.get('x-goog-resource-state', ''))
+        self.send_response(200 if accepted else 403)
+        self.send_header('content-length', '0')
+        self.end_headers()
@@ -0,0 +1,283 @@
+from typing import Dict, List, Optional, Tuple, Union
+from threading import Condition, Lock, Thread
+from time import monotonic
+from pathlib import Path
+from uuid import uuid4
+import json
+import os
+
+from ._media import Content
+
+_Key = Tuple[Union[str, Tuple[str, ...]], str]
+
+
+class _Entry:
+    __slots__ = ('path', 'name', 'content', 'mimetype', 'chunk_size',
+                 'compression', 'due', 'spill')
+
+    def __init__(self, path, name, content, mimetype, chunk_size,
+                 compression, due, spill=None):
+        self.path = path
+        self.name = name
+        self.content = content
+        self.mimetype = mimetype
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.due = due
+        self.spill = spill
+
+    def discard(self) -> None:
+        if self.spill is not None:
+            _remove_spill(self.spill)
+
+
+class WriteQueue:
+    """Write-behind queue coalescing repeated writes to the same file.
+
+    :py:func:`Files.write` stages the content and returns immediately.
+    A background thread uploads a staged content ``delay`` seconds after
+    it is first staged, and only the latest content staged for the same
+    path and name is uploaded.
+    The staged contents are uploaded by :py:func:`flush`
+    and by :py:func:`Files.close` at the latest.
+
+    With a spill directory, the staged contents are kept on the disk
+    instead of the memory, and the contents left by a crashed process
+    are staged again on init.
+
+    Examples:
+        >>> with Service(credentials).files() as gdrive:
+        ...   gdrive.write_behind(delay=5, spill_dir='/var/tmp/gdrive')
+        ...   for step in range(1000):
+        ...     gdrive.write(('jobs',), 'status.json', status(step),
+        ...                  'application/json')
+    """
+
+    def __init__(self, files, delay: float = 1.0, spill_dir: str = None,
+                 max_workers: int = 4):
+        """Init WriteQueue.
+
+        Args:
+            files: The :py:class:`Files` object uploading the contents.
+            delay: The maximum seconds a content stays staged.
+            spill_dir: The directory to stage the contents,
+                or None to stage them in memory.
+            max_workers: The number of worker threads of an upload.
+        """
+        self.files = files
+        self.delay = delay
+        self.spill_dir = spill_dir
+        self.max_workers = max_workers
+        self._pending: Dict[_Key, _Entry] = {}
+        self._inflight: Dict[_Key, _Entry] = {}
+        self._cond = Condition()
+        self._flush_lock = Lock()
+        self._thread: Optional[Thread] = None
+        self._closed = False
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+            self._recover()
+
+    def __len__(self) -> int:
+        """Return the number of staged contents."""
+        with self._cond:
+            return len(self._pending) + len(self._inflight)
+
+    def put(self, path: Union[str, List[str]], name: str, content: Content,
+            mimetype: str, chunk_size: int = None,
+            compression: str = None) -> None:
+        """Stage a content replacing the staged content of the same file.
+
+        Args:
+            path: The path ID string, or the list of path names.
+            name: The file name.
+            content: The file content.
+            mimetype: The mime-type of the file.
+            chunk_size: The chunk size in bytes for a resumable upload,
+                or None for the default of :py:func:`Files.write`.
+            compression: The codec compressing the content, or None.
+        Raises:
+            ValueError: The queue is closed.
+        """
+        key = self._key(path, name)
+        content = self._snapshot(content)
+        spill = self._spill(path, name, content, mimetype, compression) \
+            if self.spill_dir is not None else None
+        with self._cond:
+            if self._closed:
+                if spill is not None:
+                    _remove_spill(spill)
+                raise ValueError('write queue is closed')
+            previous = self._pending.pop(key, None)
+            due = previous.due if previous is not None \
+                else monotonic() + self.delay
+            if previous is not None:
+                previous.discard()
+            self._pending[key] = _Entry(
+                path, name, content if spill is None else None, mimetype,
+                chunk_size, compression, due, spill)
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def get(self, path: Union[str, List[str]],
+            name: str) -> Optional[bytes]:
+        """Get the latest staged content of a file.
+
+        Args:
+            path: The path ID string, or the list of path names.
+            name: The file name.
+        Returns:
+            The staged content as bytes like a downloaded content,
+            or None unless it is staged.
+        """
+        key = self._key(path, name)
+        with self._cond:
+            entry = self._pending.get(key) or self._inflight.get(key)
+            if entry is None:
+                return None
+            if entry.spill is None:
+                content = entry.content
+                return content.encode('utf-8') if isinstance(content, str) \
+                    else content
+            with open(entry.spill, 'rb') as f:
+                return f.read()
+
+    def flush(self) -> None:
+        """Upload all staged contents.
+
+        Raises:
+            Exception: The first error after all uploads are attempted.
+                The failed contents stay staged.
+        """
+        errors = self._upload(force=True)
+        if errors:
+            raise errors[0]
+
+    def close(self) -> None:
+        """Upload all staged contents and stop the background thread.
+
+        Raises:
+            Exception: The first error after all uploads are attempted.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    due = min((e.due for e in self._pending.values()),
+                              default=None)
+                    if due is not None and due <= monotonic():
+                        break
+                    self._cond.wait(None if due is None
+                                    else due - monotonic())
+                if self._closed:
+                    return
+            self._upload(force=False)
+
+    def _upload(self, force: bool) -> List[Exception]:
+        with self._flush_lock:
+            with self._cond:
+                now = monotonic()
+                keys = [key for key, entry in self._pending.items()
+                        if force or entry.due <= now]
+                for key in keys:
+                    self._inflight[key] = self._pending.pop(key)
+                items = list(self._inflight.items())
+            errors = []
+            if not items:
+                return errors
+            results = self.files._run_parallel(self._write, items,
+                                               self.max_workers)
+            for result in results:
+                key, entry = result.item
+                with self._cond:
+                    del self._inflight[key]
+                    if result.error is None or key in self._pending:
+                        entry.discard()
+                    else:
+                        entry.due = monotonic() + self.delay
+                        self._pending[key] = entry
+                        errors.append(result.error)
+            return errors
+
+    def _write(self, item: Tuple[_Key, _Entry]) -> str:
+        entry = item[1]
+        if entry.spill is None:
+            content = entry.content
+        else:
+            content = Path(entry.spill)
+        return self.files._write(entry.path, entry.name, content,
+                                 entry.mimetype, entry.chunk_size,
+                                 entry.compression)
+
+    def _spill(self, path, name: str, content: Union[str, bytes],
+               mimetype: str, compression: Optional[str]) -> str:
+        filename = os.path.join(self.spill_dir, uuid4().hex)
+        data = content.encode('utf-8') if isinstance(content, str) \
+            else content
+        with open(filename + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(filename + '.tmp', filename)
+        with open(filename + '.json.tmp', 'w') as f:
+            json.dump({'path': path, 'name': name, 'mimetype': mimetype,
+                       'compression': compression,
+                       'staged_at': os.path.getmtime(filename)}, f)
+        os.replace(filename + '.json.tmp', filename + '.json')
+        return filename
+
+    def _recover(self) -> None:
+        stored = []
+        for entry in os.scandir(self.spill_dir):
+            if not entry.name.endswith('.json'):
+                continue
+            filename = entry.path[:-len('.json')]
+            try:
+                with open(entry.path) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if os.path.isfile(filename):
+                stored.append((meta['staged_at'], filename, meta))
+        for _, filename, meta in sorted(stored):
+            key = self._key(meta['path'], meta['name'])
+            previous = self._pending.pop(key, None)
+            if previous is not None:
+                previous.discard()
+            self._pending[key] = _Entry(
+                meta['path'], meta['name'], None, meta['mimetype'], None,
+                meta.get('compression', None), monotonic() + self.delay,
+                filename)
+        if self._pending:
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    @staticmethod
+    def _key(path: Union[str, List[str]], name: str) -> _Key:
+        return (path if isinstance(path, str) else tuple(path), name)
+
+    @staticmethod
+    def _snapshot(content: Content) -> Union[str, bytes]:
+        if isinstance(content, str):
+            return content
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        if isinstance(content, os.PathLike):
+            with open(content, 'rb') as f:
+                return f.read()
+        return content.read()
+
+
+def _remove_spill(filename: str) -> None:
+    for path in (filename, filename + '.json'):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
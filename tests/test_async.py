@@ -0,0 +1,123 @@
+"""Unittest for googledrive.AsyncFiles."""
+
+import asyncio
+import unittest
+from threading import get_ident
+from unittest.mock import MagicMock, patch
+
+import httplib2
+
+from googledrive import Service, IdCache
+from googleapiclient.errors import HttpError
+
+
+class TestAsyncFiles(unittest.TestCase):
+    """Test case for googledrive.AsyncFiles."""
+
+    def test_read(self):
+        """Test read with a path."""
+        PATH_IDS = {"'root' in parents and name='path1'": 'pathid1',
+                    "'pathid1' in parents and name='filename'": 'file-id'}
+        files, files_mock, https = self._get_files()
+        files_mock.list.side_effect = lambda **kwargs: MagicMock(**{
+            'execute.side_effect': lambda http: dict(
+                files=[dict(id=PATH_IDS[kwargs['q']])])
+        })
+        files_mock.get_media.side_effect = lambda fileId: MagicMock(**{
+            'execute.side_effect': lambda http: (
+                self.assertIs(https[get_ident()], http), 'content')[1]
+        })
+
+        async def run():
+            async with files:
+                return await asyncio.gather(
+                    *[files.read(['path1'], 'filename') for _ in range(5)])
+        self.assertEqual(asyncio.run(run()), ['content'] * 5)
+        self.assertLessEqual(len(https), 3)
+        for http in https.values():
+            http.close.assert_called_once_with()
+        files_mock.close.assert_called_once_with()
+
+    def test_each_files(self):
+        """Test each_files."""
+        files, files_mock, _ = self._get_files()
+        files_mock.list.return_value.execute.side_effect = [
+            dict(files=[dict(id='id1')], nextPageToken='token'),
+            dict(files=[dict(id='id2')]),
+        ]
+
+        async def run():
+            return [file async for file
+                    in files.each_files('parent', 'query', 'fields')]
+        self.assertEqual(asyncio.run(run()), [dict(id='id1'), dict(id='id2')])
+        call_args_list = files_mock.list.call_args_list
+        self.assertEqual(call_args_list[0].kwargs, dict(
+            q="'parent' in parents and query", spaces='drive',
+            fields='nextPageToken,fields', pageToken=None))
+        self.assertEqual(call_args_list[1].kwargs['pageToken'], 'token')
+
+    def test_write(self):
+        """Test write and delete_file_id with IdCache."""
+        files, files_mock, _ = self._get_files(id_cache=IdCache())
+        files_mock.list.return_value.execute.return_value = dict(files=[])
+        files_mock.create.return_value.execute.return_value = dict(id='new')
+        files_mock.update.return_value.execute.return_value = None
+        files_mock.delete.return_value.execute.return_value = None
+        files_mock.get.return_value.execute.side_effect = [
+            dict(appProperties={'googledriveCodec': 'gzip'})]
+
+        async def run():
+            self.assertEqual(
+                await files.write('parent', 'name', 'content', 'text/plain'),
+                'new')
+            self.assertEqual(
+                await files.write('parent', 'name', 'content', 'text/plain'),
+                'new')
+            await files.delete_file_id('new')
+        asyncio.run(run())
+        files_mock.list.assert_called_once()
+        files_mock.create.assert_called_once()
+        files_mock.update.assert_called_once()
+        self.assertEqual(files_mock.update.call_args.kwargs['body'],
+                         {'appProperties': {'googledriveCodec': None}})
+        self.assertEqual(len(files.id_cache), 0)
+
+    def test_retry(self):
+        """Test non-blocking retries."""
+        files, files_mock, _ = self._get_files(retry_interval=0)
+        error = HttpError(httplib2.Response({'status': 500}), b'')
+        files_mock.get_media.return_value.execute.side_effect = [
+            error, error, 'content']
+
+        async def run():
+            return await files.read_file_id('file-id')
+        with patch('asyncio.sleep', wraps=asyncio.sleep) as sleep_mock:
+            self.assertEqual(asyncio.run(run()), 'content')
+        self.assertEqual(sleep_mock.call_count, 2)
+
+        files_mock.get_media.return_value.execute.side_effect = error
+        with self.assertRaises(HttpError):
+            asyncio.run(run())
+
+    # Utility methods
+    @patch('googledrive._service.build')
+    def _get_files(self, build_mock, **kwargs):
+        service_mock = MagicMock()
+        build_mock.return_value = service_mock
+        files_mock = MagicMock()
+        service_mock.files.return_value = files_mock
+        https = {}
+
+        def new_http(credentials):
+            https[get_ident()] = MagicMock()
+            return https[get_ident()]
+        patcher = patch('googledrive._service.authorized_http',
+                        side_effect=new_http)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        files = Service('credential').async_files(max_concurrency=3, **kwargs)
+        return files, files_mock, https
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+"""Unittest for googledrive.Batch."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httplib2
+
+from googledrive import Service, IdCache
+from googleapiclient.errors import HttpError
+
+
+class FakeBatchHttpRequest:
+    """Stand-in for googleapiclient.http.BatchHttpRequest."""
+
+    def __init__(self, responder, callback):
+        self.responder = responder
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        for request_id, request in self.requests:
+            response, exception = self.responder(request)
+            self.callback(request_id, response, exception)
+
+
+class TestBatch(unittest.TestCase):
+    """Test case for googledrive.Batch."""
+
+    def test_get_ids(self):
+        """Test get_ids."""
+        files, files_mock, batches = self._get_files(
+            lambda request: (dict(files=[dict(id='id-' + request.tag)]),
+                             None))
+        files_mock.list.side_effect = (
+            lambda **kwargs: MagicMock(tag=kwargs['q'].split("'")[3]))
+        file_ids = files.get_ids('parent', ['a', 'b', None])
+        self.assertEqual(file_ids, ['id-a', 'id-b', None])
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0].requests), 2)
+
+    def test_chunks(self):
+        """Test splitting into round trips of up to 100 calls."""
+        files, files_mock, batches = self._get_files(
+            lambda request: (dict(id='file-id'), None))
+        metadata = files.get_metadata_many(
+            [f'id{idx}' for idx in range(250)], 'id')
+        self.assertEqual(len(metadata), 250)
+        self.assertEqual([len(batch.requests) for batch in batches],
+                         [100, 100, 50])
+        self.assertEqual(files_mock.get.call_args.kwargs['fields'], 'id')
+
+    def test_retry(self):
+        """Test retries of failed calls."""
+        error = HttpError(httplib2.Response({'status': 500}), b'')
+        responses = {'a': [(None, error), (None, None)],
+                     'b': [(None, None)],
+                     'c': [(None, error)] * 4}
+        files, files_mock, batches = self._get_files(
+            lambda request: responses[request.tag].pop(0))
+        files_mock.delete.side_effect = (
+            lambda fileId: MagicMock(tag=fileId))
+        with patch('googledrive._batch.sleep') as sleep_mock:
+            with self.assertRaises(HttpError):
+                files.delete_file_ids(['a', 'b', 'c'])
+        self.assertEqual([len(batch.requests) for batch in batches],
+                         [3, 2, 1, 1])
+        self.assertEqual(sleep_mock.call_count, 3)
+
+    def test_delete_cache(self):
+        """Test delete_file_id invalidates IdCache."""
+        files, files_mock, _ = self._get_files(
+            lambda request: (None, None), id_cache=IdCache())
+        files.id_cache.put('parent', 'name', 'file-id')
+        with files.batch() as batch:
+            future = batch.delete_file_id('file-id')
+            self.assertEqual(len(batch), 1)
+        self.assertIsNone(future.result())
+        self.assertEqual(len(files.id_cache), 0)
+
+    def test_delete_many(self):
+        """Test delete_many reporting per-item results."""
+        error = HttpError(httplib2.Response({'status': 404}), b'')
+        files, files_mock, batches = self._get_files(
+            lambda request: (None, error if request.tag == 'x' else None),
+            id_cache=IdCache())
+        files.id_cache.put('parent', 'name', 'id3')
+        files_mock.delete.side_effect = (
+            lambda fileId: MagicMock(tag=fileId))
+        ids = [f'id{idx}' for idx in range(5)] + ['x']
+        results = list(files.delete_many(ids, max_batch_size=2))
+        self.assertEqual(sorted(r.item for r in results), sorted(ids))
+        self.assertEqual({r.item for r in results if r.error}, {'x'})
+        self.assertEqual(len(batches), 3)
+        self.assertEqual(len(files.id_cache), 0)
+
+        files_mock.update.side_effect = (
+            lambda fileId, body, **_: MagicMock(tag=fileId))
+        results = list(files.delete_many(['id1'], trash=True))
+        self.assertEqual(results[0].error, None)
+        self.assertEqual(files_mock.update.call_args.kwargs['body'],
+                         {'trashed': True})
+
+    def test_delete_tree(self):
+        """Test delete_tree deleting the children and the folder."""
+        files, files_mock, batches = self._get_files(
+            lambda request: (None, None))
+        files_mock.list.return_value.execute.return_value = dict(
+            files=[dict(id='child1'), dict(id='child2')])
+        files_mock.delete.side_effect = (
+            lambda fileId: MagicMock(tag=fileId))
+        results = list(files.delete_tree('top', trash=False))
+        self.assertEqual([r.item for r in results][-1], 'top')
+        self.assertEqual(sorted(r.item for r in results),
+                         ['child1', 'child2', 'top'])
+        self.assertEqual(
+            files_mock.list.call_args.kwargs['q'],
+            "'top' in parents and trashed = false")
+
+        files_mock.update.side_effect = (
+            lambda fileId, body, **_: MagicMock(tag=fileId))
+        results = list(files.delete_tree('top', keep_root=True))
+        self.assertEqual(sorted(r.item for r in results),
+                         ['child1', 'child2'])
+        files_mock.update.assert_called()
+
+        files_mock.list.reset_mock()
+        files_mock.update.reset_mock()
+        results = list(files.delete_tree('top'))
+        self.assertEqual([r.item for r in results], ['top'])
+        files_mock.list.assert_not_called()
+        files_mock.update.assert_called_once_with(
+            fileId='top', body={'trashed': True}, fields='id')
+
+    # Utility methods
+    @patch('googledrive._service.build')
+    def _get_files(self, responder, build_mock, **kwargs):
+        service_mock = MagicMock()
+        build_mock.return_value = service_mock
+        files_mock = MagicMock()
+        service_mock.files.return_value = files_mock
+        batches = []
+
+        def new_batch_http_request(callback):
+            batch = FakeBatchHttpRequest(responder, callback)
+            batches.append(batch)
+            return batch
+        service_mock.new_batch_http_request.side_effect = \
+            new_batch_http_request
+        patcher = patch('googledrive._service.authorized_http')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        files = Service('credential').files(**kwargs)
+        return files, files_mock, batches
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""Unittest for the benchmarks against the fake server."""
+
+import unittest
+
+from googledrive import RetryPolicy
+from benchmarks.bench_files import run, format_results
+from benchmarks.fakedrive import FakeDrive, ROOT_ID
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test case for benchmarks."""
+
+    def test_fake_drive(self):
+        """Test Files against FakeDrive with rate limiting."""
+        with FakeDrive(rate_429=0.3) as drive:
+            folder_id = drive.add_path(['a', 'b'])
+            policy = RetryPolicy(max_retry=20, interval=0)
+            with drive.files(retry_policy=policy) as files:
+                self.assertEqual(files.get_path_id(['a', 'b']), folder_id)
+                self.assertIsNone(files.get_path_id(['a', 'c']))
+                folder_id = drive.add_folder(ROOT_ID, 'd')
+                file_id = files.write(['d'], 'f', b'content', 'text/plain')
+                self.assertEqual(files.read(folder_id, 'f'), b'content')
+                files.write(folder_id, 'f', b'updated', 'text/plain', 4)
+                self.assertEqual(files.list(folder_id)[0]['id'], file_id)
+                self.assertEqual(
+                    b''.join(files.iter_file_id(file_id, 3)), b'updated')
+                files.delete_file_id(file_id)
+                self.assertEqual(files.list(folder_id), [])
+            self.assertGreater(policy.info().retries, 0)
+
+    def test_get_path_id(self):
+        """Test get_path_id of a deep path in a round trip."""
+        with FakeDrive() as drive:
+            path = ['a', "it's", 'b\\c', 'a', 'd', 'e']
+            folder_id = drive.add_path(path)
+            drive.add_path(['a', 'x', 'a'])
+            with drive.files() as files:
+                self.assertEqual(files.get_path_id(path), folder_id)
+                requests = drive.requests
+                self.assertEqual(files.get_path_id(path), folder_id)
+                self.assertEqual(drive.requests - requests, 1)
+                self.assertIsNone(files.get_path_id(path[:3] + ['x']))
+                self.assertEqual(
+                    files.write(path[:2], "o'k", b'1', 'text/plain'),
+                    files.get_path_id(path[:2] + ["o'k"]))
+
+    def test_run(self):
+        """Test run."""
+        results = run(iterations=2, folder_sizes=[3], file_sizes=[10],
+                      depths=[2])
+        self.assertEqual([r.name for r in results], [
+            'list files=3', 'read bytes=10', 'write bytes=10',
+            'get_path_id depth=2'])
+        self.assertIn('ops/sec', format_results(results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Unittest for googledrive.IdCache."""
+
+import os
+import tempfile
+import unittest
+
+from googledrive import IdCache, ContentCache
+
+
+class TestIdCache(unittest.TestCase):
+    """Test case for googledrive.IdCache."""
+
+    def test_get_put(self):
+        """Test get and put."""
+        cache = IdCache()
+        self.assertIsNone(cache.get('parent', 'name'))
+        cache.put('parent', 'name', 'file-id')
+        self.assertEqual(cache.get('parent', 'name'), 'file-id')
+        cache.put('parent', 'none', None)
+        self.assertIsNone(cache.get('parent', 'none'))
+        info = cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 2, 1))
+
+    def test_lru(self):
+        """Test LRU eviction."""
+        cache = IdCache(maxsize=2)
+        cache.put('parent', 'a', 'id-a')
+        cache.put('parent', 'b', 'id-b')
+        cache.get('parent', 'a')
+        cache.put('parent', 'c', 'id-c')
+        self.assertEqual(cache.get('parent', 'a'), 'id-a')
+        self.assertIsNone(cache.get('parent', 'b'))
+        self.assertEqual(cache.get('parent', 'c'), 'id-c')
+        self.assertEqual(len(cache), 2)
+
+    def test_ttl(self):
+        """Test expiry."""
+        now = [0.0]
+        cache = IdCache(ttl=10, timer=lambda: now[0])
+        cache.put('parent', 'name', 'file-id')
+        now[0] = 9.0
+        self.assertEqual(cache.get('parent', 'name'), 'file-id')
+        now[0] = 10.0
+        self.assertIsNone(cache.get('parent', 'name'))
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate(self):
+        """Test invalidate and invalidate_id."""
+        cache = IdCache()
+        cache.put('root', 'folder', 'folder-id')
+        cache.put('folder-id', 'sub', 'sub-id')
+        cache.put('sub-id', 'file', 'file-id')
+        cache.put('root', 'other', 'other-id')
+        cache.invalidate('root', 'other')
+        self.assertEqual(len(cache), 3)
+        cache.invalidate_id('folder-id')
+        self.assertEqual(len(cache), 0)
+
+        cache.put('root', 'a', 'id-a')
+        cache.put('root', 'b', 'id-b')
+        cache.put('parent', 'a', 'id-c')
+        cache.invalidate(name='a')
+        self.assertEqual(len(cache), 1)
+        cache.invalidate('root')
+        self.assertEqual(len(cache), 0)
+        cache.clear()
+        self.assertEqual(cache.info().misses, 0)
+
+
+
+class TestContentCache(unittest.TestCase):
+    """Test case for googledrive.ContentCache."""
+
+    def setUp(self):
+        """Create a cache directory."""
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.directory = tmpdir.name
+
+    def test_get_put(self):
+        """Test get and put."""
+        cache = ContentCache(self.directory)
+        self.assertIsNone(cache.get('file-id', 'md5'))
+        cache.put('file-id', 'md5', b'content')
+        self.assertEqual(cache.get('file-id', 'md5'), b'content')
+        self.assertIsNone(cache.get('file-id', 'md5new'))
+        cache.put('file-id', 'md5new', b'new')
+        self.assertEqual(os.listdir(self.directory), ['file-id.md5new'])
+        self.assertEqual(cache.info(), (1, 2, 1 << 30, 3))
+        cache.invalidate('file-id')
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(os.listdir(self.directory), [])
+        with self.assertRaises(ValueError):
+            cache.put('../file', 'md5', b'content')
+
+    def test_lru(self):
+        """Test LRU eviction by size and reuse of stored entries."""
+        cache = ContentCache(self.directory, max_bytes=10)
+        cache.put('a', 'v1', b'aaaa')
+        cache.put('b', 'v1', b'bbbb')
+        cache.get('a', 'v1')
+        cache.put('c', 'v1', b'cccc')
+        self.assertIsNone(cache.get('b', 'v1'))
+        self.assertEqual(cache.info().currsize, 8)
+        cache.put('d', 'v1', b'd' * 11)
+        self.assertEqual(len(cache), 2)
+
+        cache = ContentCache(self.directory, max_bytes=10)
+        self.assertEqual(cache.get('c', 'v1'), b'cccc')
+        self.assertEqual(cache.info().currsize, 8)
+        cache.clear()
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Unittest for the transparent compression."""
+
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from googledrive import ContentCache, Metrics, UploadSession
+from googledrive._codec import CODEC_PROPERTY, CompressedMedia
+from googledrive._codec import compress_bytes, decompress_bytes
+from benchmarks.fakedrive import FakeDrive, ROOT_ID
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CHUNK_SIZE = 256 * 1024
+
+
+def _text(size: int) -> bytes:
+    line = b'{"id": 12345, "name": "example", "tags": ["a", "b"]}\n'
+    return (line * (size // len(line) + 1))[:size]
+
+
+class TestCompressedMedia(unittest.TestCase):
+    """Test case for CompressedMedia."""
+
+    def test_getbytes(self):
+        """Test chunks, a retried chunk and a rewind."""
+        content = os.urandom(50000) + _text(200000)
+        compressed = compress_bytes(content, 'gzip')
+        media = CompressedMedia(io.BytesIO(content), 'text/plain', 'gzip',
+                                1000)
+        self.assertTrue(media.resumable())
+        self.assertIsNone(media.size())
+        self.assertEqual(media.getbytes(0, 1000), compressed[:1000])
+        self.assertEqual(media.getbytes(1000, 1000), compressed[1000:2000])
+        self.assertEqual(media.getbytes(1000, 1000), compressed[1000:2000])
+        self.assertEqual(media.getbytes(30000, 10 ** 6), compressed[30000:])
+        self.assertEqual(media.getbytes(500, 1000), compressed[500:1500])
+
+    def test_unknown_codec(self):
+        """Test an unknown codec."""
+        with self.assertRaises(ValueError):
+            compress_bytes(b'', 'lzma')
+
+
+class TestCompression(unittest.TestCase):
+    """Test case for compressed writes and reads."""
+
+    def setUp(self):
+        """Start a fake server."""
+        self.drive = FakeDrive().start()
+        self.addCleanup(self.drive.stop)
+        self.folder_id = self.drive.add_folder(ROOT_ID, 'data')
+
+    def _check(self, files, codec):
+        content = _text(600000)
+        file_id = files.write(self.folder_id, 'a.json', content.decode(),
+                              'application/json', compression=codec)
+        stored = self.drive.contents[file_id]
+        self.assertLess(len(stored), len(content) // 10)
+        self.assertEqual(decompress_bytes(stored, codec), content)
+        self.assertEqual(
+            self.drive.metadata[file_id]['appProperties'][CODEC_PROPERTY],
+            codec)
+        self.assertEqual(files.read(self.folder_id, 'a.json'), content)
+        self.assertEqual(files.read(self.folder_id, 'a.json',
+                                    decompress=False), stored)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'b.csv'
+            path.write_bytes(content)
+            file_id = files.write(self.folder_id, 'b.csv', path, 'text/csv',
+                                  CHUNK_SIZE, compression=codec)
+            self.assertEqual(decompress_bytes(self.drive.contents[file_id],
+                                              codec), content)
+            self.assertEqual(b''.join(files.iter_file_id(
+                file_id, CHUNK_SIZE, decompress=True)), content)
+            files.download_file_id(file_id, path, decompress=True)
+            self.assertEqual(path.read_bytes(), content)
+        return file_id
+
+    def test_gzip(self):
+        """Test gzip with a streamed file and a plain overwrite."""
+        with self.drive.files() as files:
+            file_id = self._check(files, 'gzip')
+            with open(os.devnull, 'rb') as empty:
+                files.update_file_id(file_id, empty, 'text/csv',
+                                     compression='gzip')
+            self.assertEqual(files.read_file_id(file_id), b'')
+            files.write(self.folder_id, 'b.csv', b'plain', 'text/csv')
+            self.assertNotIn(CODEC_PROPERTY,
+                             self.drive.metadata[file_id]['appProperties'])
+            self.assertEqual(files.read_file_id(file_id), b'plain')
+
+    def test_content_cache(self):
+        """Test the compressed content kept in the content cache."""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ContentCache(tmp)
+            with self.drive.files(content_cache=cache) as files:
+                file_id = files.write(self.folder_id, 'c', 'x' * 1000,
+                                      'text/plain', compression='gzip')
+                for _ in range(2):
+                    self.assertEqual(files.read_file_id(file_id),
+                                     b'x' * 1000)
+                self.assertEqual(cache.info().hits, 1)
+                self.assertEqual(files.read(self.folder_id, 'c'),
+                                 b'x' * 1000)
+                self.assertEqual(files.read_file_id(file_id,
+                                                    decompress=False),
+                                 self.drive.contents[file_id])
+
+    def test_session_metrics(self):
+        """Test the session and metrics of a streamed upload."""
+        metrics = Metrics()
+        sessions = []
+        session = UploadSession(
+            callback=lambda s: sessions.append((s.progress, s.done)))
+        with self.drive.files(metrics=metrics) as files:
+            file_id = files.create_file(
+                self.folder_id, 'a', io.BytesIO(os.urandom(300000)),
+                'text/plain', CHUNK_SIZE, session, compression='gzip')
+        size = len(self.drive.contents[file_id])
+        self.assertGreater(size, CHUNK_SIZE)
+        self.assertEqual(sessions, [(CHUNK_SIZE, False), (size, True)])
+        self.assertEqual(session.total_size, size)
+        self.assertGreaterEqual(metrics.snapshot()['bytes_sent'], size)
+
+    @unittest.skipIf(zstandard is None, 'zstandard is not installed')
+    def test_zstd(self):
+        """Test zstd."""
+        with self.drive.files() as files:
+            self._check(files, 'zstd')
+
+
+if __name__ == '__main__':
+    unittest.main()
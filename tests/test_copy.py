@@ -0,0 +1,81 @@
+"""Unittest for the server-side copies and moves."""
+
+import unittest
+
+from googledrive import IdCache
+from benchmarks.fakedrive import FakeDrive, ROOT_ID
+
+
+class TestCopy(unittest.TestCase):
+    """Test case for copy_file_id, move_file_id and copy_tree."""
+
+    def setUp(self):
+        """Start a fake server."""
+        self.drive = FakeDrive().start()
+        self.addCleanup(self.drive.stop)
+
+    def test_copy_file_id(self):
+        """Test copy_file_id."""
+        drive = self.drive
+        src_id = drive.add_folder(ROOT_ID, 'src')
+        dst_id = drive.add_folder(ROOT_ID, 'dst')
+        file_id = drive.add_file(src_id, 'a', b'content')
+        with drive.files(id_cache=IdCache()) as files:
+            copy_id = files.copy_file_id(file_id, dst_id)
+            self.assertNotEqual(copy_id, file_id)
+            self.assertEqual(files.get_id(dst_id, 'a'), copy_id)
+            renamed_id = files.copy_file_id(file_id, name='b')
+            self.assertEqual(files.get_id(src_id, 'b'), renamed_id)
+            self.assertEqual(files.read(dst_id, 'a'), b'content')
+        self.assertEqual(drive.contents[renamed_id], b'content')
+        self.assertEqual(drive.metadata[file_id]['parents'], [src_id])
+
+    def test_move_file_id(self):
+        """Test move_file_id."""
+        drive = self.drive
+        src_id = drive.add_folder(ROOT_ID, 'src')
+        dst_id = drive.add_folder(ROOT_ID, 'dst')
+        file_id = drive.add_file(src_id, 'a', b'content')
+        with drive.files(id_cache=IdCache()) as files:
+            self.assertEqual(files.get_id(src_id, 'a'), file_id)
+            files.move_file_id(file_id, dst_id, 'b')
+            self.assertIsNone(files.get_id(src_id, 'a'))
+            self.assertEqual(files.get_id(dst_id, 'b'), file_id)
+        self.assertEqual(drive.metadata[file_id]['parents'], [dst_id])
+        self.assertEqual(drive.metadata[file_id]['name'], 'b')
+
+    def test_copy_tree(self):
+        """Test copy_tree into a new folder."""
+        drive = self.drive
+        src_id = drive.add_folder(ROOT_ID, 'src')
+        drive.add_file(src_id, 'a', b'1')
+        sub_id = drive.add_folder(src_id, 'sub')
+        drive.add_file(sub_id, 'b', b'2')
+        drive.add_file(drive.add_folder(sub_id, 'deep'), 'c', b'3')
+        drive.add_folder(src_id, 'empty')
+        with drive.files() as files:
+            results = list(files.copy_tree(['src'], ['copy'], max_workers=2))
+            self.assertTrue(all(r.error is None for r in results))
+            self.assertEqual(sorted(r.item for r in results),
+                             ['a', 'sub/b', 'sub/deep/c'])
+            self.assertEqual(files.read(['copy', 'sub', 'deep'], 'c'), b'3')
+            self.assertIsNotNone(files.get_path_id(['copy', 'empty']))
+            with self.assertRaises(FileNotFoundError):
+                files.copy_tree(['missing'], ['copy2'])
+            with self.assertRaises(FileNotFoundError):
+                files.copy_tree(['src'], ['missing', 'copy2'])
+
+    def test_copy_tree_into_source(self):
+        """Test copy_tree into a folder inside the source tree."""
+        drive = self.drive
+        src_id = drive.add_folder(ROOT_ID, 'src')
+        drive.add_file(drive.add_folder(src_id, 'sub'), 'a', b'1')
+        with drive.files() as files:
+            results = list(files.copy_tree(src_id, ['src', 'sub', 'copy']))
+            self.assertEqual([r.item for r in results], ['sub/a'])
+            self.assertEqual(files.read(['src', 'sub', 'copy', 'sub'], 'a'),
+                             b'1')
+
+
+if __name__ == '__main__':
+    unittest.main()
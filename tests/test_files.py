@@ -1,10 +1,21 @@
 """Unittest for googledrive.Files."""
 
+import json
+import os
+import tempfile
 import unittest
+from io import BytesIO
 from unittest.mock import MagicMock, patch
 
-from googledrive import Service
-from googleapiclient.http import MediaUpload
+import httplib2
+
+from googledrive import Service, IdCache, ContentCache, UploadSession
+from googledrive import RetryPolicy
+from googleapiclient.http import MediaUpload, HttpRequest
+from googleapiclient.errors import HttpError
+from googledrive._codec import CODEC_PROPERTY
+
+FOLDER = 'application/vnd.google-apps.folder'
 
 
 class TestFiles(unittest.TestCase):
@@ -14,6 +25,30 @@ class TestFiles(unittest.TestCase):
         """Test __init__."""
         self._get_files()
 
+    def test_lazy_build(self):
+        """Test building the API client on first use."""
+        with patch('googledrive._service.build') as build_mock:
+            service = Service('credential', cache_discovery=False)
+            build_mock.assert_not_called()
+            service.files()
+            service.files()
+            build_mock.assert_called_once_with(
+                'drive', 'v3', credentials='credential',
+                cache_discovery=False)
+
+    def test_http_factory(self):
+        """Test the transport options of Service."""
+        http = httplib2.Http(timeout=7)
+        credentials = MagicMock(spec=[])
+        with patch('googledrive._service.build') as build_mock:
+            service = Service(credentials, http_factory=lambda: http)
+            service.files()
+            authorized = build_mock.call_args.kwargs['http']
+            self.assertNotIn('credentials', build_mock.call_args.kwargs)
+        self.assertIs(authorized.http, http)
+        self.assertIs(authorized.credentials, credentials)
+        self.assertIs(service.new_http().http, http)
+
     def test_get_id(self):
         """Test get_id."""
         FILE_ID = 'file-id'
@@ -32,6 +67,28 @@ class TestFiles(unittest.TestCase):
         )
         list_execute_mock.assert_called_once_with()
 
+    def test_get_id_cache(self):
+        """Test get_id with IdCache."""
+        FILE_ID = 'file-id'
+        files, files_mock = self._get_files(id_cache=IdCache())
+        list_execute_mock = self._assign_execute_mock(
+            files_mock.list, dict(files=[dict(id=FILE_ID)])
+        )
+        self.assertEqual(files.get_id('parent', 'filename'), FILE_ID)
+        self.assertEqual(files.get_id('parent', 'filename'), FILE_ID)
+        list_execute_mock.assert_called_once_with()
+        self.assertEqual(files.id_cache.info().hits, 1)
+
+        self._assign_execute_mock(files_mock.delete, None)
+        files.delete_file_id(FILE_ID)
+        files.get_id('parent', 'filename')
+        self.assertEqual(files_mock.list.call_count, 2)
+
+        self._assign_execute_mock(files_mock.create, dict(id='new-id'))
+        files.create_file('parent', 'new', 'content', 'text/plain')
+        self.assertEqual(files.get_id('parent', 'new'), 'new-id')
+        self.assertEqual(files_mock.list.call_count, 2)
+
     def test_create_file(self):
         """Test create_file."""
         FILE_ID = 'file-id'
@@ -57,11 +114,95 @@ class TestFiles(unittest.TestCase):
         )
         create_execute_mock.assert_called_once_with()
 
+    def test_create_file_binary(self):
+        """Test create_file with binary content."""
+        CONTENT = b'\x00\xffbinary'
+        files, files_mock = self._get_files()
+        self._assign_execute_mock(files_mock.create, dict(id='file-id'))
+        files_mock.create.return_value.next_chunk.return_value = (
+            None, dict(id='file-id'))
+        for content, resumable in [(CONTENT, False),
+                                   (memoryview(CONTENT), False),
+                                   (BytesIO(CONTENT), True)]:
+            self.assertEqual(
+                files.create_file('parent', 'name', content, 'image/png'),
+                'file-id')
+            self._assert_called_with_kwargs(
+                files_mock.create,
+                media_body=lambda arg: (
+                    self.assertEqual(arg.mimetype(), 'image/png'),
+                    self.assertEqual(arg.resumable(), resumable),
+                    self.assertEqual(arg.getbytes(0, 100), CONTENT)
+                )
+            )
+
+    def test_create_file_large(self):
+        """Test create_file with a content larger than a chunk."""
+        files, files_mock = self._get_files()
+        files.CHUNK_SIZE = 4
+        files_mock.create.return_value.next_chunk.return_value = (
+            None, dict(id='file-id'))
+        files.create_file('parent', 'name', b'0123456789', 'image/png')
+        media = files_mock.create.call_args.kwargs['media_body']
+        self.assertTrue(media.resumable())
+        self.assertEqual(media.chunksize(), 4)
+        files_mock.create.return_value.execute.assert_not_called()
+
+    def test_create_file_resumable(self):
+        """Test create_file with a resumable upload."""
+        CONTENT = 'content-✓'
+        files, files_mock = self._get_files(retry_interval=0)
+        http_mock, received = self._assign_upload_mock(
+            files_mock.create, len(CONTENT.encode()), ['chunk'])
+        sessions = []
+        session = UploadSession(
+            callback=lambda s: sessions.append((s.progress, s.done)))
+        file_id = files.create_file('parent', 'name', CONTENT, 'text/plain',
+                                    chunk_size=4, session=session)
+        self.assertEqual(file_id, 'file-id')
+        self.assertEqual(b''.join(received), CONTENT.encode())
+        self.assertEqual(session.uri, 'session-uri')
+        self.assertEqual(sessions, [(4, False), (8, False), (11, True)])
+
+    def test_update_file_id_resume(self):
+        """Test update_file_id resuming an upload session."""
+        CONTENT = '0123456789'
+        files, files_mock = self._get_files()
+        http_mock, received = self._assign_upload_mock(
+            files_mock.update, len(CONTENT), confirmed=6)
+        session = UploadSession('session-uri')
+        files.update_file_id('file-id', CONTENT, 'text/plain', 4, session)
+        self.assertEqual(received, [b'6789'])
+        self.assertTrue(session.done)
+        self.assertEqual(http_mock.request.call_args_list[0].args,
+                         ('session-uri', 'PUT'))
+
+    def test_update_file_id_resume_done(self):
+        """Test resuming a completed or expired upload session."""
+        files, files_mock = self._get_files()
+        http_mock, received = self._assign_upload_mock(
+            files_mock.update, 4)
+        http_mock.request.side_effect = [
+            (httplib2.Response({'status': 200}), b'{"id": "file-id"}'),
+            (httplib2.Response({'status': 404}), b'')]
+        session = UploadSession('session-uri')
+        files.update_file_id('file-id', 'abcd', 'text/plain', 4, session)
+        self.assertTrue(session.done)
+        self.assertEqual(session.progress, 4)
+        self.assertEqual(http_mock.request.call_args.kwargs['headers'],
+                         {'Content-Range': 'bytes */4',
+                          'content-length': '0'})
+        with self.assertRaises(HttpError):
+            files.update_file_id('file-id', 'abcd', 'text/plain', 4,
+                                 UploadSession('session-uri'))
+        self.assertEqual(received, [])
+
     def test_read_file_id(self):
         """Test read_file_id."""
         FILE_ID = 'file-id'
         CONTENT = 'content'
         files, files_mock = self._get_files()
+        get_execute_mock = self._assign_execute_mock(files_mock.get, {})
         get_media_execute_mock = self._assign_execute_mock(
             files_mock.get_media, CONTENT
         )
@@ -73,6 +214,94 @@ class TestFiles(unittest.TestCase):
             fileId=FILE_ID
         )
         get_media_execute_mock.assert_called_once_with()
+        self._assert_called_with_kwargs(
+            files_mock.get, fileId=FILE_ID, fields='appProperties')
+
+        self.assertEqual(files.read_file_id(FILE_ID, decompress=False),
+                         CONTENT)
+        get_execute_mock.assert_called_once_with()
+
+    def test_read_file_id_cache(self):
+        """Test read_file_id with ContentCache."""
+        FILE_ID = 'file-id'
+        CONTENT = b'content'
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files, files_mock = self._get_files(
+                content_cache=ContentCache(tmpdir))
+            get_execute_mock = self._assign_execute_mock(
+                files_mock.get, dict(md5Checksum='md5', version='1')
+            )
+            get_media_execute_mock = self._assign_execute_mock(
+                files_mock.get_media, CONTENT
+            )
+            self.assertEqual(files.read_file_id(FILE_ID), CONTENT)
+            self.assertEqual(files.read_file_id(FILE_ID), CONTENT)
+            get_media_execute_mock.assert_called_once_with()
+            self.assertEqual(get_execute_mock.call_count, 2)
+            self._assert_called_with_kwargs(
+                files_mock.get,
+                fileId=FILE_ID, fields='md5Checksum,version,appProperties'
+            )
+            self.assertEqual(files.content_cache.info().hits, 1)
+
+            files.read_file_id(FILE_ID, use_cache=False, decompress=False)
+            self.assertEqual(get_media_execute_mock.call_count, 2)
+            self.assertEqual(get_execute_mock.call_count, 2)
+
+            get_execute_mock.return_value = dict(version='2')
+            files.read_file_id(FILE_ID)
+            self.assertEqual(get_media_execute_mock.call_count, 3)
+            self.assertEqual(os.listdir(tmpdir), ['file-id.v2'])
+
+            self._assign_execute_mock(files_mock.update, None)
+            files.update_file_id(FILE_ID, 'new', 'text/plain')
+            self.assertEqual(len(files.content_cache), 0)
+
+    def test_download_file_id(self):
+        """Test download_file_id."""
+        FILE_ID = 'file-id'
+        CONTENT = b'0123456789'
+        files, files_mock = self._get_files(retry_interval=0)
+        error = HttpError(httplib2.Response({'status': 500}), b'')
+        http_mock = self._assign_media_mock(files_mock, CONTENT, [error])
+        fileobj = BytesIO()
+        files.download_file_id(FILE_ID, fileobj, 4)
+        self.assertEqual(fileobj.getvalue(), CONTENT)
+        self._assert_called_with_kwargs(
+            files_mock.get_media,
+            fileId=FILE_ID
+        )
+        ranges = [call.kwargs['headers']['range']
+                  for call in http_mock.request.call_args_list]
+        self.assertEqual(ranges, ['bytes=0-3', 'bytes=0-3',
+                                  'bytes=4-7', 'bytes=8-11'])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'file')
+            files.download_file_id(FILE_ID, path, 4)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), CONTENT)
+
+    def test_readinto_file_id(self):
+        """Test readinto_file_id."""
+        CONTENT = b'0123456789'
+        files, files_mock = self._get_files()
+        self._assign_media_mock(files_mock, CONTENT)
+        buffer = bytearray(16)
+        self.assertEqual(files.readinto_file_id('file-id', buffer, 4), 10)
+        self.assertEqual(buffer[:10], CONTENT)
+
+        self._assign_media_mock(files_mock, CONTENT)
+        with self.assertRaises(ValueError):
+            files.readinto_file_id('file-id', bytearray(8), 4)
+
+    def test_iter_file_id(self):
+        """Test iter_file_id."""
+        CONTENT = b'0123456789'
+        files, files_mock = self._get_files()
+        self._assign_media_mock(files_mock, CONTENT)
+        chunks = list(files.iter_file_id('file-id', 4))
+        self.assertEqual(chunks, [b'0123', b'4567', b'89'])
 
     def test_update_file_id(self):
         """Test update_file_id."""
@@ -80,6 +309,7 @@ class TestFiles(unittest.TestCase):
         CONTENT = 'content'
         MIMETYPE = 'mimetype'
         files, files_mock = self._get_files()
+        get_execute_mock = self._assign_execute_mock(files_mock.get, {})
         update_execute_mock = self._assign_execute_mock(
             files_mock.update, None
         )
@@ -92,9 +322,18 @@ class TestFiles(unittest.TestCase):
                 self.assertIsInstance(arg, MediaUpload),
                 self.assertEqual(arg.mimetype(), MIMETYPE),
                 self.assertEqual(arg.getbytes(0, len(CONTENT)+1), CONTENT)
-            )
+            ),
+            body=None
         )
         update_execute_mock.assert_called_once_with()
+        self._assert_called_with_kwargs(
+            files_mock.get, fileId=FILE_ID, fields='appProperties')
+
+        get_execute_mock.return_value = dict(
+            appProperties={CODEC_PROPERTY: 'gzip'})
+        files.update_file_id(FILE_ID, CONTENT, MIMETYPE)
+        self._assert_called_with_kwargs(
+            files_mock.update, body={'appProperties': {CODEC_PROPERTY: None}})
 
     def test_delete_file_id(self):
         """Test delete_file_id."""
@@ -111,6 +350,46 @@ class TestFiles(unittest.TestCase):
         )
         delete_execute_mock.assert_called_once_with()
 
+    def test_retry_policy(self):
+        """Test retries with RetryPolicy."""
+        policy = RetryPolicy(interval=0)
+        files, files_mock = self._get_files(retry_policy=policy)
+        delete_execute_mock = self._assign_execute_mock(
+            files_mock.delete, None
+        )
+        delete_execute_mock.side_effect = [
+            HttpError(httplib2.Response({'status': 503}), b''), None
+        ]
+        files.delete_file_id('file-id')
+        self.assertEqual(delete_execute_mock.call_count, 2)
+        self.assertEqual(policy.info().retries, 1)
+
+        delete_execute_mock.side_effect = HttpError(
+            httplib2.Response({'status': 404}), b'')
+        delete_execute_mock.reset_mock()
+        with self.assertRaises(HttpError):
+            files.delete_file_id('file-id')
+        delete_execute_mock.assert_called_once_with()
+
+        create_execute_mock = self._assign_execute_mock(
+            files_mock.create, None
+        )
+        files_mock.create.return_value.method = 'POST'
+        create_execute_mock.side_effect = [
+            HttpError(httplib2.Response({'status': 503}), b''),
+            dict(id='new-id')
+        ]
+        self.assertEqual(
+            files.create_file('parent', 'new', 'content', 'text/plain'),
+            'new-id')
+        self.assertEqual(create_execute_mock.call_count, 2)
+
+        create_execute_mock.reset_mock()
+        create_execute_mock.side_effect = TimeoutError()
+        with self.assertRaises(TimeoutError):
+            files.create_file('parent', 'new', 'content', 'text/plain')
+        create_execute_mock.assert_called_once_with()
+
     def test_each_files(self):
         """Test each_files."""
         FILE_IDS = ['file-id1', 'file-id2', 'file-id3']
@@ -157,45 +436,93 @@ class TestFiles(unittest.TestCase):
             fields='nextPageToken,fields', pageToken=None
         )
 
+    @patch('googledrive._service.authorized_http')
+    def test_each_files_prefetch(self, authorized_http_mock):
+        """Test each_files with page_size and prefetch."""
+        files, files_mock = self._get_files()
+        list_execute_mock = self._assign_execute_mock(
+            files_mock.list, None
+        )
+        pages = [
+            dict(files=[dict(id='id1')], nextPageToken='token1'),
+            dict(files=[dict(id='id2')], nextPageToken='token2'),
+            dict(files=[dict(id='id3')]),
+        ]
+        list_execute_mock.side_effect = lambda http: pages.pop(0)
+        iterator = files.each_files('parent', page_size=5000, prefetch=True)
+        self.assertEqual(next(iterator), dict(id='id1'))
+        self.assertEqual(list(iterator), [dict(id='id2'), dict(id='id3')])
+        self.assertEqual(files_mock.list.call_count, 3)
+        call_args_list = files_mock.list.call_args_list
+        self.assertEqual([c.kwargs['pageToken'] for c in call_args_list],
+                         [None, 'token1', 'token2'])
+        self.assertEqual(call_args_list[0].kwargs['pageSize'], 1000)
+        http_mock = authorized_http_mock.return_value
+        list_execute_mock.assert_called_with(http=http_mock)
+        http_mock.close.assert_called_once_with()
+
     def test_get_path_id(self):
-        """Test get_path_id."""
+        """Test get_path_id in a single query."""
         TOPID = 'topid'
         PATH = ('path1', 'path2', 'path3')
         PATH_IDS = ['pathid1', 'pathid2', 'pathid3']
         files, files_mock = self._get_files()
         list_execute_mock = self._assign_execute_mock(
-            files_mock.list, None
-        )
-        list_execute_mock.side_effect = [
-            dict(files=[dict(id=fileid)]) for fileid in PATH_IDS
-        ]
+            files_mock.list, self._path_files(TOPID, PATH, PATH_IDS))
         path_id = files.get_path_id(PATH, TOPID)
         self.assertEqual(path_id, PATH_IDS[2])
-        call_args_list = files_mock.list.call_args_list
-        for idx, parent in enumerate([TOPID, PATH_IDS[0], PATH_IDS[1]]):
-            self._assert_kwargs(
-                call_args_list[idx].kwargs,
-                q=f"'{parent}' in parents and name='{PATH[idx]}'"
-            )
-        self.assertEqual(list_execute_mock.call_count, 3)
+        files_mock.list.assert_called_once()
+        self._assert_called_with_kwargs(
+            files_mock.list,
+            q=f"(mimeType='{FOLDER}' and (name='path1' or name='path2'))"
+              " or name='path3'",
+            fields='nextPageToken,files(id,name,parents)', pageSize=1000)
+        list_execute_mock.assert_called_once_with()
+
+        files_mock.list.reset_mock()
+        self._assign_execute_mock(
+            files_mock.list, self._path_files(TOPID, PATH[:2], PATH_IDS[:2]))
+        get_execute_mock = self._assign_execute_mock(
+            files_mock.get, dict(id=TOPID))
+        self.assertIsNone(files.get_path_id(PATH))
+        self.assertIsNone(files.get_path_id(['path1', 'none']))
+        self.assertEqual(files_mock.list.call_count, 2)
+        get_execute_mock.assert_called_once_with()
+        self._assert_called_with_kwargs(files_mock.get, fileId='root')
 
-        PATH_IDS = ['pathid', None]
-        list_execute_mock = self._assign_execute_mock(
-            files_mock.list, None
-        )
-        list_execute_mock.side_effect = [
-            dict(files=[dict(id=fileid)]) for fileid in PATH_IDS
-        ]
         files_mock.list.reset_mock()
-        path_id = files.get_path_id(PATH)
-        self.assertIsNone(path_id)
+        files.get_path_id(["it's", 'a\\b'], TOPID)
+        self._assert_called_with_kwargs(
+            files_mock.list,
+            q=f"(mimeType='{FOLDER}' and (name='it\\'s'))"
+              " or name='a\\\\b'")
+
+    def test_get_path_id_fallback(self):
+        """Test get_path_id with the ID cache and many candidates."""
+        TOPID = 'topid'
+        PATH = ('path1', 'path2', 'path3', 'path4')
+        PATH_IDS = ['pathid1', 'pathid2', 'pathid3', 'pathid4']
+        files, files_mock = self._get_files(id_cache=IdCache())
+        files.id_cache.put(TOPID, PATH[0], PATH_IDS[0])
+        response = self._path_files(PATH_IDS[0], PATH[1:2], PATH_IDS[1:2])
+        response['nextPageToken'] = 'token'
+        list_execute_mock = self._assign_execute_mock(files_mock.list, None)
+        list_execute_mock.side_effect = [
+            response, dict(files=[dict(id=PATH_IDS[2])]),
+            dict(files=[dict(id=PATH_IDS[3])])]
+        self.assertEqual(files.get_path_id(PATH, TOPID), PATH_IDS[3])
         call_args_list = files_mock.list.call_args_list
-        for idx, parent in enumerate(['root', PATH_IDS[0]]):
+        self._assert_kwargs(
+            call_args_list[0].kwargs,
+            q=f"(mimeType='{FOLDER}' and (name='path2' or name='path3'))"
+              " or name='path4'")
+        for idx in (1, 2):
             self._assert_kwargs(
                 call_args_list[idx].kwargs,
-                q=f"'{parent}' in parents and name='{PATH[idx]}'"
-            )
-        self.assertEqual(list_execute_mock.call_count, 2)
+                q=f"'{PATH_IDS[idx]}' in parents and name='{PATH[idx + 1]}'")
+        files_mock.list.reset_mock()
+        self.assertEqual(files.get_path_id(PATH, TOPID), PATH_IDS[3])
+        files_mock.list.assert_not_called()
 
     def test_list(self):
         """Test list."""
@@ -223,10 +550,10 @@ class TestFiles(unittest.TestCase):
             files_mock.list, None
         )
         list_execute_mock.side_effect = [
-            dict(files=[dict(id=PATH_IDS[0])]),
-            dict(files=[dict(id=PATH_IDS[1])]),
+            self._path_files('rootid', PATH, PATH_IDS),
             dict(files=[dict(id=FILE_IDS[0]), dict(id=FILE_IDS[1])])
         ]
+        self._assign_execute_mock(files_mock.get, dict(id='rootid'))
         files_mock.list.reset_mock()
         file_list = files.list(PATH, 'query', 'fields')
         self.assertEqual(
@@ -234,17 +561,16 @@ class TestFiles(unittest.TestCase):
             list(map(lambda id: {'id': id}, FILE_IDS))
         )
         call_args_list = files_mock.list.call_args_list
-        for idx, parent in enumerate(['root', PATH_IDS[0]]):
-            self._assert_kwargs(
-                call_args_list[idx].kwargs,
-                q=f"'{parent}' in parents and name='{PATH[idx]}'"
-            )
         self._assert_kwargs(
-            call_args_list[2].kwargs,
+            call_args_list[0].kwargs,
+            q=f"(mimeType='{FOLDER}' and (name='path1')) or name='path2'"
+        )
+        self._assert_kwargs(
+            call_args_list[1].kwargs,
             q=f"'{PATH_IDS[1]}' in parents and query", spaces='drive',
             fields='nextPageToken,fields', pageToken=None
         )
-        self.assertEqual(list_execute_mock.call_count, 3)
+        self.assertEqual(list_execute_mock.call_count, 2)
 
         list_execute_mock = self._assign_execute_mock(
             files_mock.list,
@@ -272,6 +598,7 @@ class TestFiles(unittest.TestCase):
         list_execute_mock = self._assign_execute_mock(
             files_mock.list, dict(files=[dict(id=FILE_ID)])
         )
+        self._assign_execute_mock(files_mock.get, {})
         get_media_execute_mock = self._assign_execute_mock(
             files_mock.get_media, CONTENT
         )
@@ -291,10 +618,10 @@ class TestFiles(unittest.TestCase):
         get_media_execute_mock.assert_called_once_with()
 
         list_execute_mock.side_effect = [
-            dict(files=[dict(id=PATH_IDS[0])]),
-            dict(files=[dict(id=PATH_IDS[1])]),
+            self._path_files('rootid', PATH, PATH_IDS),
             dict(files=[dict(id=FILE_ID)])
         ]
+        self._assign_execute_mock(files_mock.get, dict(id='rootid'))
         files_mock.list.reset_mock()
         get_media_execute_mock = self._assign_execute_mock(
             files_mock.get_media, CONTENT
@@ -303,16 +630,15 @@ class TestFiles(unittest.TestCase):
         content = files.read(PATH, 'filename')
         self.assertEqual(content, CONTENT)
         call_args_list = files_mock.list.call_args_list
-        for idx, parent in enumerate(['root', PATH_IDS[0]]):
-            self._assert_kwargs(
-                call_args_list[idx].kwargs,
-                q=f"'{parent}' in parents and name='{PATH[idx]}'"
-            )
         self._assert_kwargs(
-            call_args_list[2].kwargs,
+            call_args_list[0].kwargs,
+            q=f"(mimeType='{FOLDER}' and (name='path1')) or name='path2'"
+        )
+        self._assert_kwargs(
+            call_args_list[1].kwargs,
             q=f"'{PATH_IDS[1]}' in parents and name='filename'"
         )
-        self.assertEqual(list_execute_mock.call_count, 3)
+        self.assertEqual(list_execute_mock.call_count, 2)
         files_mock.get_media.assert_called_once()
         self._assert_called_with_kwargs(
             files_mock.get_media,
@@ -354,10 +680,10 @@ class TestFiles(unittest.TestCase):
         update_execute_mock.assert_called_once_with()
 
         list_execute_mock.side_effect = [
-            dict(files=[dict(id=PATH_IDS[0])]),
-            dict(files=[dict(id=PATH_IDS[1])]),
+            self._path_files('rootid', PATH, PATH_IDS),
             dict(files=[dict(id=FILE_ID)])
         ]
+        self._assign_execute_mock(files_mock.get, dict(id='rootid'))
         files_mock.list.reset_mock()
         update_execute_mock = self._assign_execute_mock(
             files_mock.update, None
@@ -365,16 +691,15 @@ class TestFiles(unittest.TestCase):
         files_mock.update.reset_mock()
         files.write(PATH, 'filename', CONTENT, MIMETYPE)
         call_args_list = files_mock.list.call_args_list
-        for idx, parent in enumerate(['root', PATH_IDS[0]]):
-            self._assert_kwargs(
-                call_args_list[idx].kwargs,
-                q=f"'{parent}' in parents and name='{PATH[idx]}'"
-            )
         self._assert_kwargs(
-            call_args_list[2].kwargs,
+            call_args_list[0].kwargs,
+            q=f"(mimeType='{FOLDER}' and (name='path1')) or name='path2'"
+        )
+        self._assert_kwargs(
+            call_args_list[1].kwargs,
             q=f"'{PATH_IDS[1]}' in parents and name='filename'"
         )
-        self.assertEqual(list_execute_mock.call_count, 3)
+        self.assertEqual(list_execute_mock.call_count, 2)
         files_mock.update.assert_called_once()
         self._assert_called_with_kwargs(
             files_mock.update,
@@ -388,27 +713,92 @@ class TestFiles(unittest.TestCase):
         update_execute_mock.assert_called_once_with()
 
     # Utility methods
-    def _get_files(self):
+    def _get_files(self, **kwargs):
         service, service_mock = self._get_service()
         files_mock = MagicMock()
         service_mock.files.return_value = files_mock
-        files = service.files()
+        files = service.files(**kwargs)
         service_mock.files.assert_called()
         return files, files_mock
 
-    @patch('googledrive._service.build')
-    def _get_service(self, mock: MagicMock):
+    def _get_service(self):
         service_mock = MagicMock()
-        mock.return_value = service_mock
+        patcher = patch('googledrive._service.build',
+                        return_value=service_mock)
+        mock = patcher.start()
+        self.addCleanup(patcher.stop)
         service = Service('credential')
-        mock.assert_called()
+        mock.assert_not_called()
         return service, service_mock
 
+    @staticmethod
+    def _path_files(parent_id, path, path_ids):
+        files = []
+        for name, file_id in zip(path, path_ids):
+            files.append(dict(id=file_id, name=name, parents=[parent_id]))
+            parent_id = file_id
+        return dict(files=files)
+
     def _assign_execute_mock(self, target, execute_return) -> MagicMock:
         mock = MagicMock(**{'execute.return_value': execute_return})
         target.return_value = mock
         return mock.execute
 
+    def _assign_upload_mock(self, target, size, errors=(),
+                            confirmed=0) -> MagicMock:
+        errors = list(errors)
+        received = []
+        state = dict(offset=confirmed)
+
+        def request(uri, method='GET', body=None, headers=None, **_):
+            if uri == 'uri':
+                return httplib2.Response(
+                    {'status': 200, 'location': 'session-uri'}), b''
+            content_range = headers['Content-Range']
+            if content_range.startswith('bytes */') and state['offset']:
+                return httplib2.Response({
+                    'status': 308, 'range': f'bytes=0-{state["offset"] - 1}'
+                }), b''
+            if content_range.startswith('bytes */'):
+                return httplib2.Response({'status': 308}), b''
+            if errors:
+                errors.pop(0)
+                raise TimeoutError()
+            data = body.read()
+            received.append(data)
+            state['offset'] += len(data)
+            if state['offset'] < size:
+                return httplib2.Response({
+                    'status': 308, 'range': f'bytes=0-{state["offset"] - 1}'
+                }), b''
+            return httplib2.Response({'status': 200}), b'{"id": "file-id"}'
+        http_mock = MagicMock()
+        http_mock.request.side_effect = request
+        target.side_effect = lambda media_body, **_: HttpRequest(
+            http_mock, lambda resp, content: json.loads(content), 'uri',
+            method='POST', resumable=media_body)
+        return http_mock, received
+
+    def _assign_media_mock(self, files_mock, content,
+                           errors=()) -> MagicMock:
+        errors = list(errors)
+
+        def request(uri, method, headers):
+            if errors:
+                raise errors.pop(0)
+            start, end = map(int, headers['range'][6:].split('-'))
+            chunk = content[start:end + 1]
+            return httplib2.Response({
+                'status': 206,
+                'content-range':
+                    f'bytes {start}-{start + len(chunk) - 1}/{len(content)}'
+            }), chunk
+        http_mock = MagicMock()
+        http_mock.request.side_effect = request
+        files_mock.get_media.return_value = MagicMock(
+            uri='uri', headers={}, http=http_mock)
+        return http_mock
+
     def _assert_called_with_kwargs(self, method, **kwargs):
         self._assert_kwargs(method.call_args.kwargs, **kwargs)
 
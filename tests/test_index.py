@@ -0,0 +1,131 @@
+"""Unittest for googledrive.MetadataIndex."""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from googledrive import Service, MetadataIndex
+
+FILES = [
+    dict(id='folder', name='folder', parents=['root-id'],
+         mimeType='application/vnd.google-apps.folder'),
+    dict(id='file1', name='file1', parents=['folder'], mimeType='text/plain',
+         md5Checksum='md5', modifiedTime='2020-01-01T00:00:00.000Z'),
+    dict(id='file2', name='file2', parents=['folder'], mimeType='text/plain'),
+]
+
+
+class TestMetadataIndex(unittest.TestCase):
+    """Test case for googledrive.MetadataIndex."""
+
+    def test_index(self):
+        """Test reset, apply_changes and queries."""
+        index = MetadataIndex()
+        self.assertFalse(index.is_fresh())
+        index.reset('root-id', FILES, 'token1')
+        self.assertTrue(index.is_fresh())
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.get_id('root', 'folder'), 'folder')
+        self.assertEqual(index.get_id('folder', 'file1'), 'file1')
+        self.assertIsNone(index.get_id('folder', 'none'))
+        self.assertEqual(index.get('file1'), FILES[1])
+        self.assertEqual(index.list('folder', ['id', 'name']),
+                         [dict(id='file1', name='file1'),
+                          dict(id='file2', name='file2')])
+
+        index.apply_changes([
+            dict(fileId='file1', removed=True),
+            dict(fileId='file2', file=dict(FILES[2], trashed=True)),
+            dict(fileId='file3', file=dict(id='file3', name='file3',
+                                           parents=['folder'])),
+        ], 'token2')
+        self.assertEqual(index.page_token, 'token2')
+        self.assertEqual([f['id'] for f in index.list('folder')], ['file3'])
+
+        index.max_age = 0
+        self.assertFalse(index.is_fresh())
+        index.close()
+
+    def test_reset_unlocked(self):
+        """Test queries from another thread while reset crawls."""
+        index = MetadataIndex()
+        index.BATCH_SIZE = 2
+        index.reset('root-id', FILES[:1], 'token1')
+        answers = []
+
+        def crawl():
+            with ThreadPoolExecutor(1) as executor:
+                for file in FILES + [dict(id='file3', name='file3',
+                                          parents=['folder', 'other'])]:
+                    answers.append(executor.submit(
+                        lambda: (index.is_fresh(), len(index))).result(5))
+                    yield file
+        index.reset('root-id', crawl(), 'token2')
+        self.assertEqual(answers, [(True, 1)] * 4)
+        self.assertEqual(len(index), 4)
+        self.assertEqual(sorted(index.get('file3')['parents']),
+                         ['folder', 'other'])
+        self.assertEqual(sorted(index.list('folder')[2]['parents']),
+                         ['folder', 'other'])
+        self.assertEqual(index.list('other', ['id']), [dict(id='file3')])
+
+        def failing():
+            yield FILES[0]
+            raise TimeoutError()
+        with self.assertRaises(TimeoutError):
+            index.reset('root-id', failing(), 'token3')
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.page_token, 'token2')
+        index.close()
+
+    def test_projection(self):
+        """Test projection."""
+        self.assertEqual(MetadataIndex.projection(None),
+                         list(MetadataIndex.FIELDS))
+        self.assertEqual(MetadataIndex.projection('files(id, name)'),
+                         ['id', 'name'])
+        self.assertIsNone(MetadataIndex.projection('files(id,size)'))
+        self.assertIsNone(MetadataIndex.projection('kind'))
+
+    @patch('googledrive._service.authorized_http')
+    @patch('googledrive._service.build')
+    def test_files(self, build_mock, _):
+        """Test Files with MetadataIndex."""
+        service_mock = MagicMock()
+        build_mock.return_value = service_mock
+        files_mock = service_mock.files.return_value
+        changes_mock = service_mock.changes.return_value
+        changes_mock.getStartPageToken.return_value.execute.return_value = \
+            dict(startPageToken='token1')
+        files_mock.get.return_value.execute.return_value = dict(id='root-id')
+        files_mock.list.return_value.execute.return_value = dict(files=FILES)
+        index = MetadataIndex()
+        files = Service('credential').files(metadata_index=index)
+        files.build_index()
+        self.assertEqual(len(index), 3)
+        self.assertIn('trashed = false', files_mock.list.call_args.kwargs['q'])
+        self.assertEqual(files_mock.list.call_args.kwargs['pageSize'], 1000)
+
+        files_mock.list.reset_mock()
+        self.assertEqual(files.get_path_id(['folder', 'file2']), 'file2')
+        self.assertEqual(
+            [f['id'] for f in files.list(['folder'], fields='files(id)')],
+            ['file1', 'file2'])
+        files_mock.list.assert_not_called()
+
+        changes_mock.list.return_value.execute.side_effect = [
+            dict(changes=[dict(fileId='file1', removed=True)],
+                 nextPageToken='token2'),
+            dict(changes=[], newStartPageToken='token3'),
+        ]
+        files.update_index()
+        self.assertEqual(index.page_token, 'token3')
+        self.assertEqual(
+            changes_mock.list.call_args_list[1].kwargs['pageToken'], 'token2')
+        files_mock.list.return_value.execute.return_value = dict(files=[])
+        self.assertIsNone(files.get_id('folder', 'file1'))
+        files_mock.list.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Unittest for binary media of googledrive."""
+
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from pathlib import Path
+
+from googledrive._media import BufferReader, BufferWriter, open_media
+from googledrive._codec import decompress_bytes
+
+
+class TestMedia(unittest.TestCase):
+    """Test case for the media helpers."""
+
+    def test_buffer_reader(self):
+        """Test BufferReader."""
+        reader = BufferReader(memoryview(b'0123456789'))
+        self.assertEqual(reader.read(4), b'0123')
+        self.assertEqual(reader.seek(-2, os.SEEK_END), 8)
+        self.assertEqual(reader.read(), b'89')
+        self.assertEqual(reader.read(), b'')
+        reader.seek(2)
+        buffer = bytearray(3)
+        self.assertEqual(reader.readinto(buffer), 3)
+        self.assertEqual(buffer, b'234')
+        reader.close()
+        self.assertTrue(reader.closed)
+
+    def test_buffer_writer(self):
+        """Test BufferWriter."""
+        buffer = bytearray(6)
+        writer = BufferWriter(buffer)
+        writer.write(b'abc')
+        writer.write(memoryview(b'de'))
+        self.assertEqual(writer.tell(), 5)
+        self.assertEqual(buffer, b'abcde\0')
+        with self.assertRaises(ValueError):
+            writer.write(b'fg')
+
+    def test_open_media(self):
+        """Test open_media with various contents."""
+        with open_media('text', 'text/plain') as media:
+            self.assertEqual(media.getbytes(0, 10), 'text')
+        with open_media('text', 'text/plain', 2, True) as media:
+            self.assertTrue(media.resumable())
+            self.assertEqual(media.chunksize(), 2)
+            self.assertEqual(media.getbytes(0, 10), b'text')
+        with open_media(bytearray(b'bytes'), 'text/plain') as media:
+            self.assertEqual(media.size(), 5)
+            self.assertEqual(media.getbytes(1, 3), b'yte')
+        fileobj = BytesIO(b'fileobj')
+        with open_media(fileobj, 'text/plain') as media:
+            self.assertEqual(media.getbytes(0, 4), b'file')
+        self.assertFalse(fileobj.closed)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir, 'file.bin')
+            path.write_bytes(b'mapped')
+            with open_media(path, 'application/octet-stream') as media:
+                stream = media.stream()
+                self.assertEqual(media.getbytes(0, 100), b'mapped')
+            self.assertTrue(stream.closed)
+            empty = Path(tmpdir, 'empty.bin')
+            empty.write_bytes(b'')
+            with open_media(empty, 'application/octet-stream') as media:
+                self.assertEqual(media.size(), 0)
+
+    def test_open_media_compressed(self):
+        """Test open_media streaming a compressed string."""
+        with open_media('text' * 100, 'text/plain', 16,
+                        compression='gzip') as media:
+            self.assertTrue(media.resumable())
+            self.assertIsNone(media.size())
+            self.assertEqual(len(media.getbytes(0, 16)), 16)
+            data = media.getbytes(0, 1000)
+        self.assertEqual(decompress_bytes(data, 'gzip'), b'text' * 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Unittest for googledrive.Metrics."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httplib2
+
+from googledrive import Service, Metrics, RetryPolicy
+from googleapiclient.errors import HttpError
+
+
+class TestMetrics(unittest.TestCase):
+    """Test case for googledrive.Metrics."""
+
+    def test_call(self):
+        """Test call and snapshot."""
+        metrics = Metrics(buckets=(0.1, 1.0))
+        self.assertEqual(metrics.call('m', lambda: 'ok'), 'ok')
+        with self.assertRaises(TimeoutError):
+            metrics.call('m', self._raise(TimeoutError()))
+        with self.assertRaises(HttpError):
+            metrics.call('n', self._raise(
+                HttpError(httplib2.Response({'status': 404}), b'')))
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['calls'], {'m': 2, 'n': 1})
+        self.assertEqual(snapshot['errors'], {'TimeoutError': 1, '404': 1})
+        self.assertEqual(snapshot['latency']['m']['count'], 2)
+        self.assertEqual(snapshot['latency']['m']['buckets'],
+                         {0.1: 2, 1.0: 2, float('inf'): 2})
+        metrics.reset()
+        self.assertEqual(metrics.snapshot()['calls'], {})
+
+    def test_hooks(self):
+        """Test add_hooks."""
+        metrics = Metrics()
+        before, after = MagicMock(), MagicMock()
+        metrics.add_hooks(before, after)
+        metrics.call('m', lambda: None, 'request')
+        before.assert_called_once_with('m', 'request')
+        self.assertEqual(after.call_args.args[0:2], ('m', 'request'))
+        self.assertIsNone(after.call_args.args[3])
+
+    def test_to_prometheus(self):
+        """Test to_prometheus."""
+        metrics = Metrics(buckets=(1.0,))
+        metrics.record_call('drive.files.list', 0.5)
+        metrics.record_bytes(sent=3, received=5)
+        metrics.record_retry(2.0)
+        text = metrics.to_prometheus()
+        self.assertIn(
+            'googledrive_requests_total{method="drive.files.list"} 1', text)
+        self.assertIn('googledrive_request_duration_seconds_bucket'
+                      '{method="drive.files.list",le="1.0"} 1', text)
+        self.assertIn('googledrive_request_duration_seconds_bucket'
+                      '{method="drive.files.list",le="+Inf"} 1', text)
+        self.assertIn('googledrive_bytes_sent_total 3', text)
+        self.assertIn('googledrive_bytes_received_total 5', text)
+        self.assertIn('googledrive_retries_total 1', text)
+
+    @patch('googledrive._retry.sleep')
+    def test_files(self, _):
+        """Test Files with Metrics."""
+        metrics = Metrics()
+        files, files_mock = self._get_files(
+            metrics=metrics, retry_policy=RetryPolicy(interval=0))
+        request = MagicMock(methodId='drive.files.get_media', body=None)
+        request.execute.side_effect = [
+            HttpError(httplib2.Response({'status': 503}), b''), b'content']
+        files_mock.get_media.return_value = request
+        self.assertEqual(files.read_file_id('file-id', decompress=False),
+                         b'content')
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['calls'], {'drive.files.get_media': 2})
+        self.assertEqual(snapshot['errors'], {'503': 1})
+        self.assertEqual(snapshot['retries'], 1)
+        self.assertEqual(snapshot['bytes_received'], 7)
+
+    # Utility methods
+    @staticmethod
+    def _raise(error):
+        def function():
+            raise error
+        return function
+
+    @patch('googledrive._service.build')
+    def _get_files(self, build_mock: MagicMock, **kwargs):
+        service_mock = MagicMock()
+        build_mock.return_value = service_mock
+        files_mock = MagicMock()
+        service_mock.files.return_value = files_mock
+        return Service('credential').files(**kwargs), files_mock
+
+
+if __name__ == '__main__':
+    unittest.main()
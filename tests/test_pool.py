@@ -0,0 +1,67 @@
+"""Unittest for googledrive.HttpPool."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from googledrive import Service, HttpPool, PoolInfo
+
+
+class TestHttpPool(unittest.TestCase):
+    """Test case for googledrive.HttpPool."""
+
+    def test_acquire_release(self):
+        """Test acquire and release."""
+        pool = HttpPool(MagicMock, max_size=1)
+        http1, http2 = pool.acquire(), pool.acquire()
+        self.assertIsNot(http1, http2)
+        self.assertEqual(pool.info(), PoolInfo(2, 0, 0, 2))
+        pool.release(http1)
+        pool.release(http2)
+        http2.close.assert_called_once_with()
+        with pool.connection() as http:
+            self.assertIs(http, http1)
+        self.assertEqual(pool.info(), PoolInfo(2, 1, 1, 0))
+        pool.close()
+        http1.close.assert_called_once_with()
+        with self.assertRaises(ValueError):
+            pool.acquire()
+
+    def test_max_idle(self):
+        """Test closing expired objects."""
+        pool = HttpPool(MagicMock, max_idle=0)
+        http = pool.acquire()
+        pool.release(http)
+        with patch('googledrive._pool.monotonic', return_value=1e9):
+            self.assertIsNot(pool.acquire(), http)
+        http.close.assert_called_once_with()
+
+    @patch('googledrive._service.authorized_http')
+    @patch('googledrive._service.build')
+    def test_files(self, build_mock, authorized_http_mock):
+        """Test sharing pooled objects between files objects and threads."""
+        authorized_http_mock.side_effect = lambda _: MagicMock()
+        files_mock = build_mock.return_value.files.return_value
+        execute_mock = files_mock.get_media.return_value.execute
+        execute_mock.return_value = b'content'
+        service = Service('credential', pool_size=4)
+        with service.files() as files:
+            self.assertEqual(files.read_file_id('file-id', decompress=False),
+                             b'content')
+            results = list(files._run_parallel(
+                lambda file_id: files.read_file_id(file_id, decompress=False),
+                ['a', 'b', 'c'], 2))
+            self.assertEqual([r.error for r in results], [None] * 3)
+        created = service.http_pool.info().created
+        self.assertLessEqual(created, 2)
+        with service.files() as files:
+            files.read_file_id('file-id', decompress=False)
+        http = execute_mock.call_args.kwargs['http']
+        info = service.http_pool.info()
+        self.assertEqual(info.created, created)
+        self.assertEqual(info.in_use, 0)
+        service.close()
+        http.close.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""Unittest for the byte-range reads."""
+
+import io
+import os
+import unittest
+
+from googledrive import RangeReader
+from benchmarks.fakedrive import FakeDrive, ROOT_ID
+
+
+class TestRangeReader(unittest.TestCase):
+    """Test case for read_range and open_file_id."""
+
+    def setUp(self):
+        """Start a fake server with a file."""
+        self.drive = FakeDrive().start()
+        self.addCleanup(self.drive.stop)
+        self.content = os.urandom(10000)
+        self.file_id = self.drive.add_file(ROOT_ID, 'data', self.content)
+        self.files = self.drive.files()
+        self.addCleanup(self.files.close)
+
+    def test_read_range(self):
+        """Test read_range."""
+        files, content = self.files, self.content
+        self.assertEqual(files.read_range(self.file_id, 10, 20),
+                         content[10:20])
+        self.assertEqual(files.read_range(self.file_id, 9990),
+                         content[9990:])
+        self.assertEqual(files.read_range(self.file_id, -100),
+                         content[-100:])
+        self.assertEqual(files.read_range(self.file_id, 9995, 20000),
+                         content[9995:])
+        self.assertEqual(files.read_range(self.file_id, 20000), b'')
+        self.assertEqual(files.read_range(self.file_id, 5, 5), b'')
+        with self.assertRaises(ValueError):
+            files.read_range(self.file_id, -1, 5)
+
+    def test_open_file_id(self):
+        """Test random access with the block cache."""
+        with self.files.open_file_id(self.file_id, block_size=1000,
+                                     max_blocks=4, readahead=2) as f:
+            self.assertIsInstance(f, RangeReader)
+            self.assertEqual(f.size, 10000)
+            f.seek(-8, io.SEEK_END)
+            self.assertEqual(f.read(), self.content[-8:])
+            self.assertEqual(f.requests, 1)
+            f.seek(9500)
+            self.assertEqual(f.read(100), self.content[9500:9600])
+            self.assertEqual(f.requests, 1)
+            f.seek(0)
+            self.assertEqual(f.read(10), self.content[:10])
+            self.assertEqual(f.requests, 2)
+            self.assertEqual(f.read(2990), self.content[10:3000])
+            self.assertEqual(f.requests, 3)
+            f.seek(4500)
+            self.assertEqual(f.read(100), self.content[4500:4600])
+            self.assertEqual(f.requests, 3)
+            f.seek(3000)
+            self.assertEqual(f.read(), self.content[3000:])
+            self.assertEqual(f.tell(), 10000)
+            self.assertEqual(f.read(10), b'')
+            with self.assertRaises(ValueError):
+                f.seek(-1)
+
+    def test_buffered(self):
+        """Test a sequential read through io.BufferedReader."""
+        raw = self.files.open_file_id(self.file_id, block_size=4096)
+        with io.BufferedReader(raw, 1024) as f:
+            self.assertEqual(b''.join(iter(lambda: f.read(700), b'')),
+                             self.content)
+        self.assertEqual(raw.requests, 1)
+
+    def test_no_content(self):
+        """Test open_file_id of a file without binary content."""
+        doc_id = self.drive.add_file(ROOT_ID, 'doc', None,
+                                     'application/vnd.google-apps.document')
+        self.drive.metadata[doc_id].pop('size', None)
+        with self.assertRaises(ValueError):
+            self.files.open_file_id(doc_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
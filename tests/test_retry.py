@@ -0,0 +1,114 @@
+"""Unittest for googledrive.RetryPolicy."""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httplib2
+
+from googledrive import RetryPolicy
+from googleapiclient.errors import HttpError
+
+
+def http_error(status, reason=None, headers=None):
+    """Return an HttpError."""
+    content = b''
+    if reason:
+        content = json.dumps(
+            {'error': {'errors': [{'reason': reason}]}}).encode()
+    return HttpError(httplib2.Response(dict(status=status, **(headers or {}))),
+                     content)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test case for googledrive.RetryPolicy."""
+
+    def test_is_retryable(self):
+        """Test is_retryable."""
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_retryable(http_error(429)))
+        self.assertTrue(policy.is_retryable(http_error(503)))
+        self.assertTrue(policy.is_retryable(
+            http_error(403, 'rateLimitExceeded')))
+        self.assertTrue(policy.is_retryable(TimeoutError()))
+        self.assertFalse(policy.is_retryable(http_error(403, 'forbidden')))
+        self.assertFalse(policy.is_retryable(http_error(404)))
+        self.assertFalse(policy.is_retryable(http_error(400)))
+        self.assertFalse(policy.is_retryable(ValueError()))
+        self.assertTrue(policy.is_retryable(http_error(503), False))
+        self.assertTrue(policy.is_retryable(http_error(500), False))
+        self.assertTrue(policy.is_retryable(http_error(408), False))
+        self.assertTrue(policy.is_retryable(http_error(429), False))
+        self.assertTrue(policy.is_retryable(
+            http_error(403, 'userRateLimitExceeded'), False))
+        self.assertFalse(policy.is_retryable(http_error(404), False))
+        self.assertFalse(policy.is_retryable(TimeoutError(), False))
+        self.assertFalse(policy.is_retryable(ConnectionResetError(), False))
+
+    def test_delay(self):
+        """Test delay with backoff, jitter and Retry-After."""
+        policy = RetryPolicy(interval=1, max_interval=5, jitter=False)
+        self.assertEqual([policy.delay(n) for n in range(4)], [1, 2, 4, 5])
+        policy.jitter = True
+        for n in range(4):
+            self.assertLessEqual(policy.delay(n), min(5, 2 ** n))
+        self.assertEqual(
+            policy.delay(0, http_error(429, headers={'retry-after': '7'})), 7)
+        self.assertEqual(policy.delay(0, http_error(
+            429, headers={'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'})),
+            0)
+
+    @patch('googledrive._retry.sleep')
+    def test_call(self, sleep_mock):
+        """Test call."""
+        policy = RetryPolicy(max_retry=3, jitter=False)
+        function = MagicMock(side_effect=[http_error(500), TimeoutError(), 1])
+        self.assertEqual(policy.call(function), 1)
+        self.assertEqual(function.call_count, 3)
+        self.assertEqual(policy.info(), (2, 3.0))
+
+        function = MagicMock(side_effect=http_error(404))
+        with self.assertRaises(HttpError):
+            policy.call(function)
+        function.assert_called_once_with()
+
+        function = MagicMock(side_effect=http_error(500))
+        with self.assertRaises(HttpError):
+            policy.call(function)
+        self.assertEqual(function.call_count, 4)
+        self.assertEqual(policy.info().retries, 5)
+        policy.reset()
+        self.assertEqual(policy.info(), (0, 0.0))
+
+    @patch('googledrive._retry.sleep')
+    def test_call_not_idempotent(self, sleep_mock):
+        """Test call of a non-idempotent function."""
+        policy = RetryPolicy(max_retry=3, jitter=False)
+        function = MagicMock(side_effect=[http_error(503), http_error(500), 1])
+        self.assertEqual(policy.call(function, idempotent=False), 1)
+        self.assertEqual(function.call_count, 3)
+
+        function = MagicMock(side_effect=[TimeoutError(), 1])
+        with self.assertRaises(TimeoutError):
+            policy.call(function, idempotent=False)
+        function.assert_called_once_with()
+        function = MagicMock(side_effect=[ConnectionResetError(), 1])
+        with self.assertRaises(ConnectionResetError):
+            policy.call(function, idempotent=False)
+        function.assert_called_once_with()
+        self.assertEqual(policy.info().retries, 2)
+
+    @patch('googledrive._retry.sleep')
+    def test_deadline(self, sleep_mock):
+        """Test deadline."""
+        policy = RetryPolicy(max_retry=10, interval=8, jitter=False,
+                             deadline=10)
+        function = MagicMock(side_effect=http_error(503))
+        with self.assertRaises(HttpError):
+            policy.call(function)
+        self.assertEqual(function.call_count, 2)
+        self.assertEqual(policy.info().sleep_time, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Unittest for googledrive.Files.sync_up and sync_down."""
+
+import hashlib
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from googledrive import Service
+
+FOLDER = 'application/vnd.google-apps.folder'
+
+
+def remote_file(file_id, name, parent, content):
+    """Return the metadata of a remote file."""
+    return dict(id=file_id, name=name, parents=[parent],
+                mimeType='text/plain', size=str(len(content)),
+                md5Checksum=hashlib.md5(content).hexdigest())
+
+
+class TestSync(unittest.TestCase):
+    """Test case for Files.sync_up and Files.sync_down."""
+
+    def setUp(self):
+        """Create a local directory."""
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.root = Path(tmpdir.name)
+        self.remote = {
+            'top': [
+                remote_file('same', 'same.txt', 'top', b'same'),
+                remote_file('changed', 'changed.txt', 'top', b'old'),
+                dict(id='sub', name='sub', parents=['top'], mimeType=FOLDER),
+                dict(id='doc', name='doc', parents=['top'],
+                     mimeType='application/vnd.google-apps.document'),
+            ],
+            'sub': [remote_file('nested', 'nested.txt', 'sub', b'nested')],
+        }
+
+    def test_sync_up(self):
+        """Test sync_up."""
+        (self.root / 'same.txt').write_bytes(b'same')
+        (self.root / 'changed.txt').write_bytes(b'new')
+        (self.root / 'new.txt').write_bytes(b'new')
+        (self.root / 'sub').mkdir()
+        (self.root / 'sub' / 'nested.txt').write_bytes(b'nested')
+        (self.root / 'other').mkdir()
+        (self.root / 'other' / 'file.txt').write_bytes(b'file')
+        files, files_mock = self._get_files()
+        results = sorted(files.sync_up(str(self.root), 'top', 2))
+        self.assertEqual([(r.item, r.result, r.error) for r in results], [
+            ('changed.txt', 'changed', None),
+            ('new.txt', 'created-new.txt', None),
+            ('other/file.txt', 'created-file.txt', None),
+        ])
+        files_mock.update.assert_called_once()
+        self.assertEqual(files_mock.update.call_args.kwargs['fileId'],
+                         'changed')
+        bodies = [c.kwargs['body'] for c in files_mock.create.call_args_list]
+        self.assertIn(dict(name='other', parents=['top'], mimeType=FOLDER),
+                      bodies)
+        self.assertIn(dict(name='file.txt', parents=['created-other']),
+                      bodies)
+
+    def test_sync_down(self):
+        """Test sync_down."""
+        (self.root / 'same.txt').write_bytes(b'same')
+        (self.root / 'changed.txt').write_bytes(b'new')
+        files, files_mock = self._get_files()
+        downloaded = []
+
+        def download_file_id(file_id, path):
+            downloaded.append(file_id)
+            Path(path).write_bytes(b'downloaded ' + file_id.encode())
+        files.download_file_id = download_file_id
+        results = sorted(files.sync_down('top', str(self.root), 2))
+        self.assertEqual([r.item for r in results],
+                         ['changed.txt', 'sub/nested.txt'])
+        self.assertEqual(sorted(downloaded), ['changed', 'nested'])
+        self.assertEqual((self.root / 'sub' / 'nested.txt').read_bytes(),
+                         b'downloaded nested')
+        self.assertEqual((self.root / 'same.txt').read_bytes(), b'same')
+        self.assertFalse((self.root / 'doc').exists())
+
+    # Utility methods
+    @patch('googledrive._service.build')
+    def _get_files(self, build_mock):
+        service_mock = MagicMock()
+        build_mock.return_value = service_mock
+        files_mock = service_mock.files.return_value
+
+        def list_request(q, **_):
+            parent_ids = re.findall(r"'([^']*)' in parents", q)
+            children = [child for parent_id in parent_ids
+                        for child in self.remote.get(parent_id, [])]
+            return MagicMock(**{'execute.side_effect':
+                                lambda **_: dict(files=children)})
+        files_mock.list.side_effect = list_request
+        files_mock.create.side_effect = lambda body, **_: MagicMock(**{
+            'execute.side_effect':
+                lambda **_: dict(id='created-' + body['name']),
+            'next_chunk.side_effect':
+                lambda **_: (None, dict(id='created-' + body['name']))})
+        files_mock.update.return_value.next_chunk.return_value = (None, {})
+        patcher = patch('googledrive._service.authorized_http')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return Service('credential').files(), files_mock
+
+
+if __name__ == '__main__':
+    unittest.main()
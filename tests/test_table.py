@@ -0,0 +1,117 @@
+"""Unittest for googledrive.FileTable."""
+
+import io
+import unittest
+
+from googledrive import FileTable, MetadataIndex
+from googledrive._table import field_names
+from benchmarks.fakedrive import FakeDrive, ROOT_ID
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+FILES = [
+    {'id': 'id1', 'name': 'a', 'mimeType': 'text/csv', 'parents': ['p'],
+     'size': '10', 'kind': 'drive#file'},
+    {'id': 'id2', 'name': 'b,c', 'mimeType': 'text/csv', 'parents': ['p'],
+     'owners': [{'emailAddress': 'x@example.com'}]},
+    {'id': 'id3', 'name': 'a', 'mimeType': 'image/png',
+     'parents': ['p', 'q'], 'size': '20'},
+]
+
+
+class TestFileTable(unittest.TestCase):
+    """Test case for FileTable."""
+
+    def test_field_names(self):
+        """Test field_names."""
+        self.assertEqual(
+            field_names('id, name,owners(emailAddress,permissionId),'
+                        'capabilities/canEdit,id'),
+            ['id', 'name', 'owners', 'capabilities'])
+
+    def test_table(self):
+        """Test projection, interning, iteration and slicing."""
+        table = FileTable('id,name,mimeType,parents,size', FILES)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.fields,
+                         ('id', 'name', 'mimeType', 'parents', 'size'))
+        self.assertEqual(table[0], ('id1', 'a', 'text/csv', ('p',), '10'))
+        self.assertEqual(table[-1].parents, ('p', 'q'))
+        self.assertIsNone(table[1].size)
+        self.assertEqual([r.id for r in table], ['id1', 'id2', 'id3'])
+        self.assertEqual(table.column('mimeType'),
+                         ['text/csv', 'text/csv', 'image/png'])
+        mimetypes = table._columns[2]
+        self.assertEqual(mimetypes.values, [None, 'text/csv', 'image/png'])
+        self.assertEqual(table._columns[1].values, [None, 'a', 'b,c'])
+        with self.assertRaises(IndexError):
+            table[3]
+
+        sliced = table[1:]
+        self.assertIsInstance(sliced, FileTable)
+        self.assertEqual([r.name for r in sliced], ['b,c', 'a'])
+        self.assertIs(sliced._columns[2].values, mimetypes.values)
+        self.assertEqual(len(table[::2]), 2)
+        sliced.append({'id': 'id4', 'mimeType': 'text/csv'})
+        self.assertEqual(len(mimetypes.values), 3)
+        self.assertEqual(len(table), 3)
+
+    def test_to_csv(self):
+        """Test to_csv."""
+        table = FileTable('id,name,parents,owners', FILES)
+        buffer = io.StringIO()
+        table.to_csv(buffer)
+        self.assertEqual(buffer.getvalue().splitlines(), [
+            'id,name,parents,owners',
+            'id1,a,p,',
+            'id2,"b,c",p,"[{""emailAddress"": ""x@example.com""}]"',
+            'id3,a,"p,q",'])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_to_arrow(self):
+        """Test to_arrow."""
+        arrow = FileTable('id,mimeType,parents,size', FILES)[1:].to_arrow()
+        self.assertEqual(arrow.column_names,
+                         ['id', 'mimeType', 'parents', 'size'])
+        self.assertTrue(pyarrow.types.is_dictionary(arrow['mimeType'].type))
+        self.assertEqual(arrow.to_pylist(), [
+            {'id': 'id2', 'mimeType': 'text/csv', 'parents': ['p'],
+             'size': None},
+            {'id': 'id3', 'mimeType': 'image/png', 'parents': ['p', 'q'],
+             'size': '20'}])
+
+    def test_list_table(self):
+        """Test Files.list_table against FakeDrive."""
+        with FakeDrive(page_size=2) as drive:
+            folder_id = drive.add_folder(ROOT_ID, 'folder')
+            for i in range(5):
+                drive.add_file(folder_id, f'f{i}', b'x' * i, 'text/plain')
+            with drive.files() as files:
+                table = files.list_table(['folder'], fields='id,name,size',
+                                         page_size=2)
+        self.assertEqual(table.fields, ('id', 'name', 'size'))
+        self.assertEqual(table.column('name'), [f'f{i}' for i in range(5)])
+        self.assertEqual(table.column('size'), [str(i) for i in range(5)])
+
+    def test_list_table_index(self):
+        """Test Files.list_table from a fresh MetadataIndex."""
+        with FakeDrive() as drive:
+            folder_id = drive.add_folder(ROOT_ID, 'folder')
+            for i in range(3):
+                drive.add_file(folder_id, f'f{i}', b'', 'text/plain')
+            with drive.files(metadata_index=MetadataIndex()) as files:
+                files.build_index()
+                requests = drive.requests
+                table = files.list_table(folder_id, fields='id,name')
+                self.assertEqual(drive.requests, requests)
+                self.assertEqual(sorted(table.column('name')),
+                                 ['f0', 'f1', 'f2'])
+                files.list_table(folder_id, fields='id,size')
+                self.assertEqual(drive.requests, requests + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
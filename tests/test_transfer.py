@@ -0,0 +1,98 @@
+"""Unittest for parallel transfers of googledrive.Files."""
+
+import unittest
+from threading import get_ident
+from unittest.mock import MagicMock, patch
+
+from googledrive import Service, Files
+
+
+class TestTransfer(unittest.TestCase):
+    """Test case for Files.read_many and Files.write_many."""
+
+    def test_read_many(self):
+        """Test read_many."""
+        files, files_mock, https = self._get_files()
+        files_mock.list.side_effect = lambda **kwargs: MagicMock(**{
+            'execute.side_effect': lambda http: dict(
+                files=[dict(id=kwargs['q'].split("'")[3])])
+        })
+        files_mock.get.return_value.execute.return_value = {}
+        files_mock.get_media.side_effect = lambda fileId: MagicMock(**{
+            'execute.side_effect': (
+                lambda http: self._content(fileId, http, https))
+        })
+        items = [('parent', f'name{idx}') for idx in range(20)]
+        items.append(('parent', 'error'))
+        results = list(files.read_many(items, max_workers=4))
+        self.assertEqual(len(results), 21)
+        for result in results:
+            if result.item[1] == 'error':
+                self.assertIsInstance(result.error, ValueError)
+                self.assertIsNone(result.result)
+            else:
+                self.assertIsNone(result.error)
+                self.assertEqual(result.result,
+                                 'content of ' + result.item[1])
+        self.assertLessEqual(len(https), 4)
+        for http in https.values():
+            http.close.assert_called_once_with()
+
+    def test_write_many(self):
+        """Test write_many."""
+        files, files_mock, https = self._get_files()
+        self._assign_execute_mock(files_mock.list, dict(files=[]))
+        self._assign_execute_mock(files_mock.create, dict(id='file-id'))
+        items = [('parent', f'name{idx}', 'content', 'text/plain')
+                 for idx in range(10)]
+        results = list(files.write_many(items, max_workers=2))
+        self.assertEqual([r.result for r in results], ['file-id'] * 10)
+        self.assertEqual(files_mock.create.call_count, 10)
+        self.assertLessEqual(len(https), 2)
+
+    def test_serial(self):
+        """Test running in the consuming thread without http_factory."""
+        files = Files(MagicMock())
+        idents = []
+        files.read = lambda parent, name: idents.append(get_ident()) or name
+        results = files.read_many([('parent', 'a'), ('parent', 'b')])
+        self.assertEqual(idents, [])
+        self.assertEqual(next(results).result, 'a')
+        self.assertEqual(idents, [get_ident()])
+        self.assertEqual([r.result for r in results], ['b'])
+        self.assertEqual(idents, [get_ident()] * 2)
+
+    # Utility methods
+    def _content(self, file_id, http, https):
+        self.assertIs(https[get_ident()], http)
+        if file_id == 'error':
+            raise ValueError(file_id)
+        return 'content of ' + file_id
+
+    @patch('googledrive._service.build')
+    def _get_files(self, build_mock):
+        service_mock = MagicMock()
+        build_mock.return_value = service_mock
+        files_mock = MagicMock()
+        service_mock.files.return_value = files_mock
+        https = {}
+
+        def new_http(credentials):
+            self.assertEqual(credentials, 'credential')
+            https[get_ident()] = MagicMock()
+            return https[get_ident()]
+        patcher = patch('googledrive._service.authorized_http',
+                        side_effect=new_http)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        files = Service('credential').files()
+        return files, files_mock, https
+
+    def _assign_execute_mock(self, target, execute_return) -> MagicMock:
+        mock = MagicMock(**{'execute.return_value': execute_return})
+        target.return_value = mock
+        return mock.execute
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Unittest for googledrive.Files.walk."""
+
+import re
+import unittest
+from unittest.mock import MagicMock, patch
+
+from googledrive import Service
+
+FOLDER = 'application/vnd.google-apps.folder'
+TREE = {
+    'root-id': ['a', 'b', 'f1'],
+    'a': ['a1', 'a2', 'f2'],
+    'b': ['f3'],
+    'a1': ['a11'],
+    'a2': [],
+    'a11': ['f4'],
+}
+
+
+def metadata(file_id):
+    """Return the metadata of a file in TREE."""
+    parents = [p for p, children in TREE.items() if file_id in children]
+    mimetype = FOLDER if file_id in TREE else 'text/plain'
+    return dict(id=file_id, name=file_id, mimeType=mimetype, parents=parents)
+
+
+class TestWalk(unittest.TestCase):
+    """Test case for Files.walk."""
+
+    def test_walk(self):
+        """Test walk from the root folder."""
+        files, files_mock = self._get_files()
+        entries = list(files.walk(group_size=2))
+        self.assertEqual(
+            [(e.path, e.id) for e in entries][:1], [([], 'root-id')])
+        self.assertEqual(
+            sorted((tuple(e.path), e.id) for e in entries),
+            sorted([((), 'root-id'), (('a',), 'a'), (('b',), 'b'),
+                    (('a', 'a1'), 'a1'), (('a', 'a2'), 'a2'),
+                    (('a', 'a1', 'a11'), 'a11')]))
+        by_id = {e.id: e for e in entries}
+        self.assertEqual([f['id'] for f in by_id['a'].folders], ['a1', 'a2'])
+        self.assertEqual([f['id'] for f in by_id['a'].files], ['f2'])
+        # root, a+b, a1+a2, a11
+        self.assertEqual(files_mock.list.call_count, 4)
+        queries = [c.kwargs['q'] for c in files_mock.list.call_args_list]
+        self.assertIn(
+            "('a' in parents or 'b' in parents) and trashed = false", queries)
+        self.assertEqual(
+            files_mock.list.call_args.kwargs['fields'],
+            'nextPageToken,files(id,name,mimeType,parents)')
+
+    def test_walk_depth(self):
+        """Test walk with max_depth and a folder ID."""
+        files, files_mock = self._get_files()
+        entries = list(files.walk('a', max_depth=1, fields='size'))
+        self.assertEqual(sorted(e.id for e in entries), ['a', 'a1', 'a2'])
+        files_mock.get.assert_not_called()
+        self.assertIn('size', files_mock.list.call_args.kwargs['fields'])
+
+    # Utility methods
+    @patch('googledrive._service.build')
+    def _get_files(self, build_mock):
+        service_mock = MagicMock()
+        build_mock.return_value = service_mock
+        files_mock = service_mock.files.return_value
+        files_mock.get.return_value.execute.return_value = dict(id='root-id')
+
+        def list_request(q, **_):
+            parent_ids = re.findall(r"'([^']*)' in parents", q)
+            children = [metadata(child) for parent_id in parent_ids
+                        for child in TREE[parent_id]]
+            return MagicMock(**{'execute.side_effect':
+                                lambda **_: dict(files=children)})
+        files_mock.list.side_effect = list_request
+        patcher = patch('googledrive._service.authorized_http')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return Service('credential').files(), files_mock
+
+
+if __name__ == '__main__':
+    unittest.main()
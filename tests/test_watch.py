@@ -0,0 +1,146 @@
+"""Unittest for the push notifications of the changes feed."""
+
+import time
+import unittest
+from threading import Event, current_thread
+from unittest.mock import MagicMock
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from googleapiclient.http import build_http
+
+from googledrive import ChangeWatcher, Files, IdCache
+from benchmarks.fakedrive import FakeDrive, ROOT_ID
+
+
+def _wait(predicate, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestChangeWatcher(unittest.TestCase):
+    """Test case for ChangeWatcher against FakeDrive."""
+
+    def setUp(self):
+        """Start a fake server."""
+        self.drive = FakeDrive().start()
+        self.addCleanup(self.drive.stop)
+        self.folder_id = self.drive.add_folder(ROOT_ID, 'folder')
+
+    def test_invalidate(self):
+        """Test the cache invalidation by notifications."""
+        drive = self.drive
+        file_id = drive.add_file(self.folder_id, 'a', b'content')
+        with drive.files(id_cache=IdCache()) as files:
+            self.assertEqual(files.get_id(self.folder_id, 'a'), file_id)
+            received = []
+            event = Event()
+            with files.watch() as watcher:
+                self.assertIsInstance(watcher, ChangeWatcher)
+                self.assertEqual(list(drive.channels), [watcher.channel['id']])
+                watcher.add_callback(lambda c: (received.extend(c),
+                                                event.set()))
+                with drive._lock:
+                    drive.metadata[file_id]['name'] = 'b'
+                    drive._record(file_id)
+                self.assertTrue(event.wait(5))
+                self.assertEqual(received[0]['fileId'], file_id)
+                self.assertIsNone(files.get_id(self.folder_id, 'a'))
+                self.assertEqual(files.get_id(self.folder_id, 'b'), file_id)
+                self.assertIsNone(watcher.last_error)
+            self.assertEqual(drive.channels, {})
+
+    def test_token(self):
+        """Test notifications with a wrong channel or token."""
+        with self.drive.files() as files, files.watch() as watcher:
+            channel = watcher.channel
+            for channel_id, token in ((channel['id'], 'wrong'),
+                                      ('unknown', watcher.token)):
+                request = Request(watcher.url, b'', {
+                    'X-Goog-Channel-ID': channel_id,
+                    'X-Goog-Channel-Token': token,
+                    'X-Goog-Resource-State': 'change'})
+                with self.assertRaises(HTTPError) as cm:
+                    urlopen(request, timeout=5)
+                self.assertEqual(cm.exception.code, 403)
+            self.drive.notify(channel['id'])
+            self.assertTrue(_wait(lambda: watcher.notifications == 1))
+
+    def test_coalesce(self):
+        """Test a poll applying the changes of several notifications."""
+        with self.drive.files() as files, files.watch() as watcher:
+            batches = []
+            watcher.add_callback(batches.append)
+            with self.drive._lock:
+                for i in range(5):
+                    self.drive.add_file(self.folder_id, f'f{i}', b'')
+            self.assertTrue(_wait(lambda: sum(map(len, batches)) == 5))
+            self.assertEqual(watcher.poll(), 0)
+
+    def test_poll_retry(self):
+        """Test a failed poll retried without another notification."""
+        with self.drive.files() as files, files.watch() as watcher:
+            watcher.POLL_RETRY_INTERVAL = 0.1
+            batches = []
+            watcher.add_callback(batches.append)
+            each_changes = files.each_changes
+            calls = []
+
+            def flaky(page_token):
+                calls.append(page_token)
+                if len(calls) == 1:
+                    raise ValueError('poll')
+                return each_changes(page_token)
+            files.each_changes = flaky
+            self.drive.add_file(self.folder_id, 'a', b'')
+            self.assertTrue(_wait(lambda: batches))
+            self.assertIsInstance(watcher.last_error, ValueError)
+            self.assertEqual(watcher.notifications, 1)
+            self.assertEqual(len(calls), 2)
+
+    def test_transport(self):
+        """Test the background thread using an Http of its own."""
+        created = []
+        requests = []
+
+        def http_factory():
+            http = build_http()
+            request = http.request
+
+            def recorded(uri, *args, **kwargs):
+                requests.append((current_thread().name, uri))
+                return request(uri, *args, **kwargs)
+            http.request = recorded
+            http.close = MagicMock(wraps=http.close)
+            created.append(http)
+            return http
+
+        with self.drive.files(http_factory=http_factory) as files, \
+                files.watch() as watcher:
+            self.drive.add_file(self.folder_id, 'a', b'')
+            self.assertTrue(_wait(lambda: any(
+                '/changes?' in uri for _, uri in requests)))
+            self.assertEqual(len(created), 1)
+            self.assertEqual({name for name, _ in requests},
+                             {watcher._thread.name})
+        created[0].close.assert_called_once_with()
+
+        with self.assertRaises(ValueError):
+            ChangeWatcher(Files(self.drive.build())).start()
+
+    def test_renew(self):
+        """Test the renewal before the expiration."""
+        with self.drive.files() as files, \
+                files.watch(ttl=1.5, renew_before=1.2) as watcher:
+            first = watcher.channel['id']
+            self.assertTrue(_wait(lambda: watcher.channel['id'] != first))
+            self.assertTrue(_wait(lambda: first not in self.drive.channels))
+            self.assertIn(watcher.channel['id'], self.drive.channels)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Unittest for googledrive.WriteQueue."""
+
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from googledrive import Service, Files
+
+
+class TestWriteQueue(unittest.TestCase):
+    """Test case for googledrive.WriteQueue."""
+
+    def test_coalesce(self):
+        """Test coalescing writes and flush."""
+        files = self._get_files()
+        queue = files.write_behind(delay=60)
+        self.assertIsNone(files.write(['a'], 'f', 'v1', 'text/plain'))
+        files.write(['a'], 'f', b'v2', 'text/plain')
+        files.write('parent', 'g', bytearray(b'g'), 'text/plain')
+        files.write(('a',), 'f', 'v3', 'text/plain')
+        files._write.assert_not_called()
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(files.read(['a'], 'f'), b'v3')
+        self.assertEqual(files.read('parent', 'g'), b'g')
+        files.flush()
+        self.assertEqual(files._write.call_count, 2)
+        calls = {c.args[1]: c.args[:3] for c in files._write.call_args_list}
+        self.assertEqual(calls, {'f': (('a',), 'f', 'v3'),
+                                 'g': ('parent', 'g', b'g')})
+        self.assertEqual(len(queue), 0)
+
+    def test_close(self):
+        """Test uploading on exit."""
+        with self._get_files() as files:
+            files.write_behind(delay=60)
+            files.write('parent', 'f', 'content', 'text/plain',
+                        compression='gzip')
+        files._write.assert_called_once_with(
+            'parent', 'f', 'content', 'text/plain', None, 'gzip')
+        with self.assertRaises(ValueError):
+            files.write('parent', 'f', 'content', 'text/plain')
+
+    def test_background(self):
+        """Test uploading in the background."""
+        files = self._get_files()
+        files.write_behind(delay=0.01)
+        files.write('parent', 'f', 'content', 'text/plain')
+        deadline = time.monotonic() + 5
+        while not files._write.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        files._write.assert_called_once()
+        files.close()
+
+    def test_error(self):
+        """Test a failed upload staying staged."""
+        files = self._get_files()
+        files._write.side_effect = [TimeoutError(), 'file-id']
+        queue = files.write_behind(delay=60)
+        files.write('parent', 'f', 'content', 'text/plain')
+        with self.assertRaises(TimeoutError):
+            files.flush()
+        self.assertEqual(len(queue), 1)
+        files.flush()
+        self.assertEqual(len(queue), 0)
+
+    def test_not_concurrent(self):
+        """Test requiring a transport for the background uploads."""
+        files = Files(MagicMock())
+        with self.assertRaises(ValueError):
+            files.write_behind()
+        self.assertIsNone(files.write_queue)
+
+    def test_spill(self):
+        """Test staging on the disk and recovering the contents."""
+        with tempfile.TemporaryDirectory() as spill_dir:
+            files = self._get_files()
+            files.write_behind(delay=60, spill_dir=spill_dir)
+            files.write(['a'], 'f', 'old', 'text/plain')
+            files.write(['a'], 'f', 'new', 'text/plain')
+            self.assertEqual(files.read(['a'], 'f'), b'new')
+
+            recovered = self._get_files()
+            queue = recovered.write_behind(delay=60, spill_dir=spill_dir)
+            self.assertEqual(len(queue), 1)
+            recovered._write.side_effect = \
+                lambda path, name, content, *_: content.read_bytes()
+            recovered.flush()
+            self.assertEqual(recovered._write.call_args.args[:2],
+                             (['a'], 'f'))
+            self.assertEqual(len(queue), 0)
+
+    # Utility methods
+    @patch('googledrive._service.build')
+    def _get_files(self, build_mock: MagicMock):
+        patcher = patch('googledrive._service.authorized_http')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        files = Service('credential').files()
+        files._write = MagicMock(return_value='file-id')
+        return files
+
+
+if __name__ == '__main__':
+    unittest.main()